@@ -0,0 +1,26 @@
+"""
+Unnest a JSON array column and nest it again. NEST_BENCHMARK_ROWS=10000000 reproduces the 10M rows case
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from optimus import Optimus
+
+op = Optimus("pandas")
+
+if __name__ == "__main__":
+    rows = int(os.environ.get("NEST_BENCHMARK_ROWS", 1000000))
+    data = pd.DataFrame({"values": list(np.arange(rows * 3).reshape(rows, 3).tolist())})
+    bench_df = op.create.dataframe(data)
+
+    start = time.perf_counter()
+    bench_df.cols.unnest("values", splits=3, mode="array")
+    print(f"unnest array: {rows} rows {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    bench_df = bench_df.cols.unnest("values", splits=3, mode="array").cols.nest(
+        ["values_0", "values_1", "values_2"], separator=",", output_col="joined")
+    print(f"unnest + nest string: {rows} rows {time.perf_counter() - start:.2f}s")
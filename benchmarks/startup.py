@@ -0,0 +1,39 @@
+"""
+Wall time of `import optimus; Optimus("pandas")` in a new interpreter. Exits with an error if the best of the runs is
+over OPTIMUS_STARTUP_BUDGET seconds
+"""
+import os
+import subprocess
+import sys
+
+# Wall time budget in seconds for `import optimus; Optimus("pandas")`
+STARTUP_BUDGET = float(os.environ.get("OPTIMUS_STARTUP_BUDGET", 3))
+
+STARTUP_SCRIPT = """
+import time
+
+start = time.perf_counter()
+from optimus import Optimus
+op = Optimus("pandas")
+print(time.perf_counter() - start)
+"""
+
+
+def startup_time():
+    """
+    Start Optimus in a new interpreter so nothing is already imported
+    :return: wall time in seconds
+    """
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    times = []
+    for i in range(5):
+        times.append(startup_time())
+        print("import optimus; Optimus('pandas'): %.2fs" % times[-1])
+
+    if min(times) >= STARTUP_BUDGET:
+        sys.exit("Startup over the %.1fs budget" % STARTUP_BUDGET)
@@ -0,0 +1,72 @@
+"""
+Cluster a column with 10M messy city names and a column with 200k distinct company names
+"""
+import random
+import string
+import time
+
+from optimus import Optimus
+
+op = Optimus("pandas")
+
+CITIES = ["New York", "Los Angeles", "Bogotá", "São Paulo", "Mexico City", "Chicago", "Caracas", "Buenos Aires"]
+
+
+def messy(value, rand):
+    """
+    Add the kind of noise that the key collision methods must ignore: case, accents, punctuation, extra spaces and
+    word order
+    """
+    words = value.split()
+    if rand.random() < 0.2:
+        words = words[::-1]
+    value = " ".join(words)
+    if rand.random() < 0.3:
+        value = value.upper()
+    elif rand.random() < 0.3:
+        value = value.lower()
+    if rand.random() < 0.2:
+        value = value.replace("á", "a").replace("ã", "a")
+    if rand.random() < 0.2:
+        value = value + "."
+    if rand.random() < 0.2:
+        value = "  " + value + " "
+    return value
+
+
+def company_names(n, seed=1):
+    rand = random.Random(seed)
+    words = ["".join(rand.choice(string.ascii_lowercase) for _ in range(rand.randint(3, 9))) for _ in range(20000)]
+    names = set()
+    while len(names) < n:
+        name = " ".join(rand.choice(words) for _ in range(rand.randint(1, 3)))
+        name = name + " " + rand.choice(["inc", "llc", "corp", "ltd", "sa", "gmbh", "co", "group"])
+        if rand.random() < 0.3:
+            # Typo
+            i = rand.randrange(len(name))
+            name = name[:i] + rand.choice(string.ascii_lowercase) + name[i + 1:]
+        names.add(name)
+    return sorted(names)
+
+
+def messy_names(n, seed=1):
+    rand = random.Random(seed)
+    # Most of the rows repeat the same messy values, like in a real column
+    values = [messy(rand.choice(CITIES), rand) for _ in range(1000)]
+    return [rand.choice(values) for _ in range(n)]
+
+
+if __name__ == "__main__":
+    # Benchmark on a column with 10M messy city names
+    df = op.create.dataframe({"city": messy_names(10 ** 7)})
+    for algorithm in ["fingerprint", "n_gram_fingerprint", "phonetic_fingerprint"]:
+        start = time.perf_counter()
+        df.string_clustering("city", algorithm)
+        print("%s: %.2fs" % (algorithm, time.perf_counter() - start))
+
+    # Benchmark on 200k distinct company names
+    df = op.create.dataframe({"company": company_names(200000)})
+    for threshold in [1, 2]:
+        start = time.perf_counter()
+        df.string_clustering("company", "levenshtein", threshold)
+        print("levenshtein %s: %.2fs" % (threshold, time.perf_counter() - start))
@@ -1,19 +1,24 @@
+import itertools
 import operator
+import time
 from abc import abstractmethod, ABC
+from collections import OrderedDict
 
+import dask
 import humanize
-import imgkit
 import jinja2
 import simplejson as json
-from dask import dataframe as dd
 from glom import assign
 from tabulate import tabulate
 
-from optimus.engines.base.stringclustering import fingerprint_cluster, n_gram_fingerprint_cluster
+from optimus.engines.base.commons.aggregations import finalize, groupby_plan, intermediate_aggregations, \
+    native_grouped_aggregation, plan
+from optimus.engines.base.stringclustering import base_clustering_function
 from optimus.helpers.check import is_notebook
 from optimus.helpers.core import val_to_list
 from optimus.helpers.columns import parse_columns
-from optimus.helpers.constants import BUFFER_SIZE, Actions, ProfilerDataTypes
+from optimus.helpers.constants import BUFFER_SIZE, DATAFRAME_CACHE_SIZE, PARTITION_SIZE, RELATIVE_ERROR, Actions, \
+    ProfilerDataTypes
 from optimus.helpers.functions import absolute_path, reduce_mem_usage, update_dict
 from optimus.helpers.json import json_converter, dump_json
 from optimus.helpers.output import print_html
@@ -27,6 +32,10 @@ from ...plots.plots import Plot
 from .profile import BaseProfile
 
 
+# Versions of the data of the dataframes. See BaseDataFrame._cached()
+_versions = itertools.count()
+
+
 class BaseDataFrame(ABC):
     """
     Optimus DataFrame
@@ -38,6 +47,18 @@ class BaseDataFrame(ABC):
         self.updated = None
         self.root = root
         self.meta = {}
+        # Parsed columns like datetimes or url components, quantile sketches and previews. See _cached()
+        self._cache = OrderedDict()
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        # Every new data gets a new version, so the values cached for the previous one are not used
+        self._data = data
+        self._version = next(_versions)
 
     def _repr_html_(self):
         df = self
@@ -63,6 +84,8 @@ class BaseDataFrame(ABC):
         self.updated = df.updated
         self.root = df.root
         self.meta = df.meta
+        self._cache = df._cache
+        self._version = df._version
 
     def new(self, df, meta=None):
         new_df = self.__class__(df)
@@ -70,6 +93,38 @@ class BaseDataFrame(ABC):
             new_df.meta = meta
         return new_df
 
+    def _cached(self, key, func=None):
+        """
+        Return the result of func cached in the dataframe by key. The cache is only valid for the same data and only
+        the DATAFRAME_CACHE_SIZE values used last are kept
+        :param key:
+        :param func: Function without arguments. If None, only a value already cached is returned
+        :return:
+        """
+        version, value = self._cache.get(key, (None, None))
+
+        if version == self._version:
+            self._cache.move_to_end(key)
+        else:
+            if func is None:
+                return None
+            value = func()
+            self._cache_value(key, value)
+
+        return value
+
+    def _cache_value(self, key, value):
+        """
+        Save a value in the cache of the dataframe for the current data
+        :param key:
+        :param value:
+        :return:
+        """
+        self._cache[key] = (self._version, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > DATAFRAME_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
     @staticmethod
     def __operator__(df, dtype, multiple_columns=False):
         if isinstance(df, (BaseDataFrame,)):
@@ -274,6 +329,61 @@ class BaseDataFrame(ABC):
         dfd = self.root.data
         return dfd.assign(**kw_columns)
 
+    @staticmethod
+    def _join(dfd_left, dfd_right, how, left_on, right_on, suffixes, broadcast=None):
+        """
+        Merge the data of two dataframes
+        :param broadcast: Only used by distributed engines
+        """
+        return dfd_left.merge(dfd_right, how=how, left_on=left_on, right_on=right_on, suffixes=suffixes)
+
+    def _fits_broadcast(self):
+        """
+        Check if the data is small enough to be merged whole with every partition of another dataframe in a join
+        :return: Only distributed engines return True or False
+        """
+        return None
+
+    def _groupby_agg(self, by, aggregations, split_out=None):
+        """
+        Group the data and run named aggregations. All the rows are in memory, so every aggregation runs exactly with
+        the groupby methods of the dataframe library, including the median, the percentiles and the count of uniques
+        :param by: Columns to group by
+        :param aggregations: {output_name: (col_name, aggregation)}, where aggregation is a name or a
+        GroupedAggregation
+        :param split_out: Only used by distributed engines
+        :return:
+        """
+        grouped = self.data.groupby(by)
+        named = {}
+        quantiles = {}
+        for output_name, (col_name, aggregation) in aggregations.items():
+            name, q = native_grouped_aggregation(aggregation)
+            if q is None:
+                named[output_name] = (col_name, name)
+            else:
+                quantiles[output_name] = (col_name, q)
+
+        # Named aggregations can not pass the quantile, so every percentile is calculated apart
+        results = [grouped.agg(**named)] if named else []
+        results += [grouped[col_name].quantile(q).rename(output_name).to_frame()
+                    for output_name, (col_name, q) in quantiles.items()]
+
+        dfd = results[0]
+        for result in results[1:]:
+            dfd = dfd.join(result)
+        return dfd[list(aggregations)]
+
+    def _duplicated(self, subset, keep="first", approx=False):
+        """
+        Mask of the rows with values in subset found in a previous row
+        :param subset:
+        :param keep: 'first', 'last' or False
+        :param approx: Only used by distributed engines
+        :return:
+        """
+        return self.data.duplicated(subset=subset, keep=keep)
+
     def to_json(self, columns="*"):
         """
         Return a json from a Dataframe
@@ -323,9 +433,36 @@ class BaseDataFrame(ABC):
         # df_.index = df_.index.droplevel(0)
         return df
 
+    def _compute_partition_lengths(self):
+        """
+        Rows in every partition of the data
+        :return:
+        """
+        return [self.rows._count()]
+
+    def _partition_lengths(self):
+        """
+        Rows in every partition. They are computed once and kept in the meta data until an action changes the rows
+        :return: list
+        """
+        lengths = Meta.get(self.meta, "rows.partition_lengths")
+        if lengths is None or len(lengths) != getattr(self.data, "npartitions", 1):
+            lengths = [int(length) for length in self._compute_partition_lengths()]
+            self.meta = Meta.set(self.meta, "rows", {"count": sum(lengths), "partition_lengths": lengths})
+        return lengths
+
     def get_buffer(self):
         return self.buffer
 
+    def _create_buffer(self, input_cols, n):
+        """
+        Create the object that serves windows of rows for the columns in input_cols
+        :param input_cols:
+        :param n: Max number of rows kept in memory
+        :return:
+        """
+        return None
+
     @abstractmethod
     def _buffer_window(self, input_cols, lower_bound, upper_bound):
         pass
@@ -337,26 +474,54 @@ class BaseDataFrame(ABC):
         self._reset_buffer()
         self.meta = Meta.reset(self.meta, "buffer_time")
 
-    def buffer_window(self, columns="*", lower_bound=None, upper_bound=None, n=BUFFER_SIZE):
+    def set_buffer(self, columns="*", n=BUFFER_SIZE):
+        """
+        Create the buffer used by buffer_window. Rows are only materialized when a window needs them
+        :param columns:
+        :param n: Max number of rows kept in memory
+        :return:
+        """
+        input_cols = parse_columns(self, columns)
+        self._reset_buffer()
+        self.buffer = self._create_buffer(input_cols, n)
+        self.meta = Meta.set(self.meta, "buffer_time", time.time())
 
-        df = self
+    def _buffer_expired(self, input_cols):
+        """
+        The buffer must be created again if the data or the columns changed or an action ran after it was created
+        :param input_cols:
+        :return:
+        """
+        buffer = self.buffer
+        if buffer is None or buffer.data is not self.data or not set(input_cols).issubset(buffer.columns):
+            return True
 
-        meta = df.meta
-        buffer_time = Meta.get(meta, "buffer_time")
-        last_action_time = Meta.get(meta, "last_action_time")
+        buffer_time = Meta.get(self.meta, "buffer_time")
+        last_action_time = Meta.get(self.meta, "last_action_time")
+        return buffer_time is None or (last_action_time is not None and last_action_time >= buffer_time)
 
-        if buffer_time and last_action_time:
-            if buffer_time > last_action_time:
-                self.set_buffer(columns, n)
+    def buffer_window(self, columns="*", lower_bound=None, upper_bound=None, n=BUFFER_SIZE):
+        """
+        Rows in [lower_bound, upper_bound) as a pandas dataframe. Used to paginate the dataframe in a UI
+        :param columns:
+        :param lower_bound:
+        :param upper_bound:
+        :param n: Max number of rows kept in memory by the buffer
+        :return:
+        """
+        df = self
 
         if lower_bound is None or lower_bound < 0:
             lower_bound = 0
 
         input_columns = parse_columns(df, columns)
-        return self._buffer_window(input_columns, lower_bound, upper_bound)
+        if df._buffer_expired(input_columns):
+            df.set_buffer(input_columns, n)
 
-    def buffer_json(self, columns):
-        df = self.buffer
+        return df._buffer_window(input_columns, lower_bound, upper_bound)
+
+    def buffer_json(self, columns, n=BUFFER_SIZE):
+        df = self.buffer_window(columns, 0, n)
         columns = parse_columns(df, columns)
 
         return {"columns": [{"title": col_name} for col_name in df.cols.select(columns).cols.names()],
@@ -478,6 +643,18 @@ class BaseDataFrame(ABC):
         df = self.data
         return self.root.new(df, meta=self.root.meta)
 
+    def _auto_repartition(self, partition_size=PARTITION_SIZE, coalesce_only=False, estimate=False,
+                          filtered_rows=None):
+        """
+        Fit the partitions to partition_size bytes in memory. Only distributed engines have partitions to fit
+        :param partition_size: Target size of a partition in bytes
+        :param coalesce_only: Only join partitions. Used after filters
+        :param estimate: Only read the first partition. Used after loading a file
+        :param filtered_rows: Rows before a filter. Used after filters
+        :return:
+        """
+        return self
+
     def table_image(self, path, limit=10):
         """
         Output table as image
@@ -485,12 +662,40 @@ class BaseDataFrame(ABC):
         :param path:
         :return:
         """
+        import imgkit
 
         css = absolute_path("/css/styles.css")
-
         imgkit.from_string(self.table_html(limit=limit, full=True), path, css=css)
         print_html("<img src='" + path + "'>")
 
+    def _head(self, columns, n):
+        """
+        Read the first n rows of some columns
+        :param columns:
+        :param n:
+        :return: pandas dataframe, number of rows of the dataframe, True if the number of rows is exact
+        """
+        df = self.cols.select(columns)
+        return self.new(df.data.head(n)).to_pandas(), self.rows.count(), True
+
+    def _preview(self, limit, columns):
+        """
+        Rows shown by table_html() and ascii(). Only the first rows are read, and if the rows count is not cached it is
+        estimated from the rows read
+        :param limit:
+        :param columns:
+        :return: pandas dataframe, rows count, True if the rows count is exact
+        """
+        pdf, total_rows, exact = self._head(columns, limit)
+
+        count = Meta.get(self.meta, "rows.count")
+        if count is not None:
+            total_rows, exact = count, True
+        elif exact:
+            self.meta = Meta.set(self.meta, "rows.count", total_rows)
+
+        return pdf, total_rows, exact
+
     def table_html(self, limit=10, columns=None, title=None, full=False, truncate=True, count=True):
         """
         Return a HTML table with the spark cols, data types and values
@@ -510,41 +715,42 @@ class BaseDataFrame(ABC):
 
         df = self
 
-        total_rows = df.rows.approx_count()
+        def _table_html():
+            if limit == "all":
+                data = df.cols.select(columns).to_dict()
+                _limit = total_rows = len(data)
+                exact = True
+            else:
+                pdf, total_rows, exact = df._preview(limit, columns)
+                data = pdf.to_dict("records")
+                _limit = len(data)
 
-        if limit == "all":
-            limit = total_rows
-            data = df.cols.select(columns).to_dict()
-        else:
-            limit = min(limit, total_rows)
-            data = df.cols.select(columns).rows.limit(limit+1).to_dict()
-        # Load the Jinja template
-        template_loader = jinja2.FileSystemLoader(searchpath=absolute_path("/templates/out"))
-        template_env = jinja2.Environment(loader=template_loader, autoescape=True)
-        template = template_env.get_template("table.html")
-
-        # Filter only the columns and data type info need it
-        dtypes = [(k, v) for k, v in df.cols.dtypes().items()]
-
-        # Remove not selected columns
-        final_columns = []
-        for i in dtypes:
-            for j in columns:
-                if i[0] == j:
-                    final_columns.append(i)
-
-        total_rows = humanize.intword(total_rows)
-        total_cols = df.cols.count()
-        total_partitions = df.partitions()
-
-        df_type = type(df)
-        output = template.render(df_type=df_type, cols=final_columns, data=data, limit=limit, total_rows=total_rows,
-                                 total_cols=total_cols,
-                                 partitions=total_partitions, title=title, truncate=truncate)
-
-        if full is True:
-            output = HEADER + output + FOOTER
-        return output
+            # Load the Jinja template
+            template_loader = jinja2.FileSystemLoader(searchpath=absolute_path("/templates/out"))
+            template_env = jinja2.Environment(loader=template_loader, autoescape=True)
+            template = template_env.get_template("table.html")
+
+            # Filter only the columns and data type info need it
+            dtypes = df.cols.dtypes(columns)
+            final_columns = [(col_name, dtypes[col_name]) for col_name in columns]
+
+            total_rows = humanize.intword(total_rows)
+            if not exact:
+                total_rows = "~" + total_rows
+            total_cols = df.cols.count()
+            total_partitions = df.partitions()
+
+            df_type = type(df)
+            output = template.render(df_type=df_type, cols=final_columns, data=data, limit=_limit,
+                                     total_rows=total_rows, total_cols=total_cols, partitions=total_partitions,
+                                     title=title, truncate=truncate)
+
+            if full is True:
+                output = HEADER + output + FOOTER
+            return output
+
+        # The preview is rendered once per version of the data
+        return df._cached(("table_html", limit, tuple(columns), title, full, truncate), _table_html)
 
     def display(self, limit=10, columns=None, title=None, truncate=True, plain_text=False):
         # TODO: limit, columns, title, truncate
@@ -574,12 +780,17 @@ class BaseDataFrame(ABC):
     def ascii(self, limit=10, columns=None):
         df = self
         if not columns:
-            columns="*"
-        limit = min(limit, df.rows.approx_count())
-        return tabulate(df.rows.limit(limit+1).cols.select(columns).to_pandas(),
-                        headers=[f"""{i}\n({j})""" for i, j in df.cols.dtypes().items()],
-                        tablefmt="simple",
-                        showindex="never")
+            columns = "*"
+        if limit is None:
+            limit = 10
+        columns = parse_columns(df, columns)
+
+        def _ascii():
+            pdf, _, _ = df._preview(limit, columns)
+            return tabulate(pdf, headers=[f"""{i}\n({j})""" for i, j in df.cols.dtypes(columns).items()],
+                            tablefmt="simple", showindex="never")
+
+        return df._cached(("ascii", limit, tuple(columns)), _ascii)
 
     def export(self):
         """
@@ -659,7 +870,7 @@ class BaseDataFrame(ABC):
                 cols_dtypes = {col: cols_dtypes[col] for col in cols_to_profile}
 
             compute = True
-            mismatch = df.cols.count_mismatch(cols_dtypes)
+            mismatch = df.cols.count_mismatch(cols_dtypes, compute=False)
 
             # Get with columns are numerical and does not have mismatch so we can calculate the histogram
             cols = cols_dtypes.items()
@@ -667,7 +878,8 @@ class BaseDataFrame(ABC):
                 if properties.get("categorical") is True \
                         or properties.get("dtype") == ProfilerDataTypes.EMAIL.value \
                         or properties.get("dtype") == ProfilerDataTypes.URL.value \
-                        or properties.get("dtype") == ProfilerDataTypes.OBJECT.value:
+                        or properties.get("dtype") == ProfilerDataTypes.OBJECT.value \
+                        or properties.get("dtype") == ProfilerDataTypes.DATETIME.value:
                     string_cols.append(col_name)
                 else:
                     numeric_cols.append(col_name)
@@ -709,7 +921,7 @@ class BaseDataFrame(ABC):
             dtypes = df.cols.dtypes("*")
 
             if compute is True:
-                hist, freq, mismatch = dd.compute(hist, freq, mismatch)
+                hist, freq, mismatch = dask.compute(hist, freq, mismatch)
 
             updated_columns = merge(cols_to_profile, hist, freq, mismatch, dtypes, count_uniques)
             profiler_data = update_dict(profiler_data, updated_columns)
@@ -717,8 +929,11 @@ class BaseDataFrame(ABC):
             assign(profiler_data, "name", Meta.get(df.meta, "name"), dict)
             assign(profiler_data, "file_name", Meta.get(df.meta, "file_name"), dict)
 
+            rows_count = df.rows.count()
+            # Keep the rows count in the meta data of the profiled dataframe
+            meta = Meta.set(meta, "rows", Meta.get(df.meta, "rows"))
             data_set_info = {'cols_count': df.cols.count(),
-                             'rows_count': df.rows.count(),
+                             'rows_count': rows_count,
                              }
             if size is True:
                 data_set_info.update({'size': df.size(format="human")})
@@ -728,7 +943,7 @@ class BaseDataFrame(ABC):
             assign(profiler_data, "summary.dtypes_list", dtypes_list, dict)
             assign(profiler_data, "summary.total_count_dtypes", len(set([i for i in dtypes.values()])), dict)
             assign(profiler_data, "summary.missing_count", total_count_na, dict)
-            assign(profiler_data, "summary.p_missing", round(total_count_na / df.rows.count() * 100, 2))
+            assign(profiler_data, "summary.p_missing", round(total_count_na / rows_count * 100, 2))
 
         all_columns_names = df.cols.names()
 
@@ -766,44 +981,69 @@ class BaseDataFrame(ABC):
         col1 = self.cols.names(0)[0]
         return self.data[col1]
 
-    def string_clustering(self, columns="*", algorithm="fingerprint"):
-        if algorithm == "fingerprint":
-            clusters = fingerprint_cluster(self, columns)
-        elif algorithm == "n_gram_fingerprint":
-            clusters = n_gram_fingerprint_cluster(self, columns)
-
-        return clusters
+    def string_clustering(self, columns="*", algorithm="fingerprint", *args, output="dict"):
+        """
+        Cluster the values of a column that get the same key or that are near
+        :param columns: Columns to be processed
+        :param algorithm: 'fingerprint', 'n_gram_fingerprint', 'phonetic_fingerprint' or 'levenshtein'
+        :param args: Arguments passed to the keyer, like the n-gram size for 'n_gram_fingerprint' or the max edit
+        distance for 'levenshtein'
+        :param output: 'dict' to return a Clusters object, 'dataframe' to return a pandas dataframe for every column
+        :return:
+        """
+        return base_clustering_function(self, columns, output, algorithm=algorithm, args=list(args))
 
-    def agg(self, aggregations: dict, groupby=None, output="dict"):
+    def agg(self, aggregations: dict, groupby=None, output="dict", split_out=None, relative_error=RELATIVE_ERROR):
+        """
+        Run several aggregations over several columns at once. The aggregations are planned together, so every column
+        is read once and aggregations that share an intermediate, like the mean and the std, calculate it once
+        :param aggregations: {col_name: aggregation or list of aggregations}. 'sum', 'mean', 'min', 'max', 'count',
+        'std', 'var', 'nunique_approx', 'median' and 'percentile_<n>' are planned. Any other column function, like
+        'mode', is run on its own
+        :param groupby: Columns to group by
+        :param output: 'dict' or 'dataframe'
+        :param split_out: Number of partitions of a grouped result. Use it with many groups. Only used by distributed
+        engines
+        :param relative_error: Max rank error of the median and the percentiles
+        :return: Values by '<col_name>_<aggregation>'
+        """
 
         df = self.root
         dfd = df.data
 
+        aggregations = {col_name: val_to_list(_aggregations) for col_name, _aggregations in aggregations.items()}
+
         if groupby:
             groupby = parse_columns(df, groupby)
 
-            for column, aggregations_set in aggregations.items():
-                aggregations[column] = val_to_list(aggregations_set)
-
-            dfd = dfd.groupby(groupby).agg(aggregations)
-
-            dfd.columns = ['_'.join(col).strip() for col in dfd.columns.values]
+            dfd = df._groupby_agg(groupby, groupby_plan(aggregations, relative_error), split_out)
 
             if output == "dict":
-                result = dfd.to_dict()
+                result = df.new(dfd).to_pandas().to_dict()
 
             elif output == "dataframe":
                 result = self.root.new(dfd.reset_index())
-                
+
         else:
+            needed, outputs, others = plan(aggregations)
+
+            partials = df.functions.aggregate(intermediate_aggregations(dfd, needed, relative_error))
+            exprs = {"planned": df.functions.delayed(finalize)(partials, outputs)}
+
+            for col_name, aggregation in others:
+                exprs[f"{col_name}_{aggregation}"] = getattr(df.cols, aggregation)(col_name, tidy=True,
+                                                                                    compute=False)
+
+            # Everything is computed at once
+            exprs = df.cols.exec_agg(exprs, True)
+            exprs.update(exprs.pop("planned"))
+
             result = {}
+            for col_name, _aggregations in aggregations.items():
+                for aggregation in _aggregations:
+                    result[f"{col_name}_{aggregation}"] = exprs[f"{col_name}_{aggregation}"]
 
-            for column, aggregations_set in aggregations.items():
-                aggregations_set = val_to_list(aggregations_set)
-                for aggregation in aggregations_set:
-                    result[column+"_"+aggregation] = getattr(df.cols, aggregation)(column, tidy=True)
-            
             if output == "dataframe":
                 result = self.root.new(result)
-        
-        return result
\ No newline at end of file
+
+        return result
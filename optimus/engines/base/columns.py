@@ -4,18 +4,19 @@ import time
 from abc import abstractmethod, ABC
 from functools import reduce
 
+import dask
 import numpy as np
 import pandas as pd
-import pydateinfer
-import wordninja
-from dask import dataframe as dd
 from glom import glom
 from multipledispatch import dispatch
-from nltk.corpus import stopwords
 
 # from optimus.engines.dask.functions import DaskFunctions as F
+from optimus.engines.base.commons.aggregations import Aggregation, grouped_aggregation
+from optimus.engines.base.commons.functions import DATE_FORMATS_TIE_SAMPLE, break_date_formats_tie, \
+    infer_date_formats, rank_date_formats
+from optimus.engines.base.commons.join import key_dtype, key_kind
+from optimus.engines.base.commons.url import URL_PARTS
 from optimus.engines.base.meta import Meta
-from optimus.helpers.check import is_dask_dataframe
 from optimus.helpers.columns import parse_columns, check_column_numbers, prepare_columns, get_output_cols, \
     validate_columns_names, name_col
 from optimus.helpers.constants import RELATIVE_ERROR, ProfilerDataTypes, Actions, PROFILER_CATEGORICAL_DTYPES
@@ -30,6 +31,9 @@ TOTAL_PREVIEW_ROWS = 30
 CATEGORICAL_THRESHOLD = 0.10
 ZIPCODE_THRESHOLD = 0.80
 INFER_PROFILER_ROWS = 200
+# Ratio of the values in a sample that must be parsed with the same format to infer a column as datetime
+DATETIME_THRESHOLD = 0.9
+DATE_PARTS = ["year", "month", "day", "hour", "minute", "second", "weekday"]
 
 
 class BaseColumns(ABC):
@@ -319,7 +323,7 @@ class BaseColumns(ABC):
 
     @dispatch(object)
     def rename(self, func=None):
-        return self.rename(None, func)
+        return self.rename([(col_name, func(col_name)) for col_name in self.root.cols.names()])
 
     @dispatch(str, str, object)
     def rename(self, old_column, new_column, func=None):
@@ -446,7 +450,7 @@ class BaseColumns(ABC):
             elif arg == "int":
                 df = df.cols.to_integer(input_col, output_col)
             elif arg == "datetime":
-                df = df.cols.to_datetime(input_col, output_col)
+                df = df.cols.to_datetime(input_col, output_cols=output_col)
             elif arg == "bool":
                 df = df.cols.to_boolean(input_col, output_col)
             elif arg == "str":
@@ -629,26 +633,24 @@ class BaseColumns(ABC):
 
         return result
 
-    def groupby(self, by, agg):
+    def groupby(self, by, agg, split_out=None, relative_error=RELATIVE_ERROR):
         """
         This helper function aims to help managing columns name in the aggregation output.
-        Also how to handle ordering columns because dask can order columns
+        The aggregations are run as named aggregations, so the output keeps the order of agg whatever the engine
         :param by: Column names
-        :param agg:
+        :param agg: {output_col: {col_name: aggregation}}. See BaseDataFrame.agg() for the aggregations
+        :param split_out: Number of partitions of the result. Only used by distributed engines
+        :param relative_error: Max rank error of the median and the percentiles
         :return:
         """
-        df = self.root.data
-        compact = {}
-        for col_agg in list(agg.values()):
-            for col_name, _agg in col_agg.items():
-                compact.setdefault(col_name, []).append(_agg)
+        df = self.root
+        aggregations = {output_col: (col_name, grouped_aggregation(_agg, relative_error))
+                        for output_col, col_agg in agg.items() for col_name, _agg in col_agg.items()}
 
-        df = df.groupby(by=by).agg(compact).reset_index()
-        df.columns = (val_to_list(by) + val_to_list(list(agg.keys())))
-        df = self.root.new(df)
-        return df
+        dfd = df._groupby_agg(val_to_list(by), aggregations, split_out).reset_index()
+        return self.root.new(dfd)
 
-    def join(self, df_right, how="left", on=None, left_on=None, right_on=None, key_middle=False):
+    def join(self, df_right, how="left", on=None, left_on=None, right_on=None, key_middle=False, broadcast=None):
         """
         Join 2 dataframes SQL style
         :param df_right:
@@ -657,6 +659,8 @@ class BaseColumns(ABC):
         :param left_on:
         :param right_on:
         :param key_middle: Order the columns putting the left df columns before the key column and the right df columns
+        :param broadcast: Merge the smaller dataframe with every partition of the other one instead of shuffling both.
+        None decides using its estimated size. Only used by distributed engines
 
         :return:
         """
@@ -669,20 +673,19 @@ class BaseColumns(ABC):
             left_on = on
             right_on = on
 
-        if df_left.cols.dtypes(left_on) == "category":
-            df_left[left_on] = df_left[left_on].cat.as_ordered()
-
-        if df_right.cols.dtypes(right_on) == "category":
-            df_right[right_on] = df_right[right_on].cat.as_ordered()
+        dfd_left = df_left.data
+        dfd_right = df_right.data
 
-        # Join do not work with different data types.
-        # Use set_index to return a index in the dataframe
+        # Keys are joined with their own data types. Only keys that can not be compared, like numbers and strings,
+        # are cast to string
+        if key_kind(key_dtype(dfd_left, left_on)) != key_kind(key_dtype(dfd_right, right_on)):
+            dfd_left = dfd_left.assign(**{left_on: dfd_left[left_on].astype(str)})
+            dfd_right = dfd_right.assign(**{right_on: dfd_right[right_on].astype(str)})
 
-        df_left[left_on] = df_left[left_on].cols.cast("*", "str")
-        df_left.data.set_index(left_on)
-
-        df_right[right_on] = df_right[right_on].cols.cast("*", "str")
-        df_right.data.set_index(right_on)
+        if broadcast is None:
+            # Only the right dataframe in a left join and the left dataframe in a right join can be broadcast
+            df_small = {"left": df_right, "right": df_left, "inner": df_right}.get(how)
+            broadcast = df_small._fits_broadcast() if df_small is not None else None
 
         left_names = df_left.cols.names()
         right_names = df_right.cols.names()
@@ -690,8 +693,8 @@ class BaseColumns(ABC):
         last_column_name = left_names[-1]
         # Use to reorder de output
 
-        df = self.root.new(df_left.data.merge(df_right.data, how=how, left_on=left_on, right_on=right_on,
-                                              suffixes=(suffix_left, suffix_right)))
+        df = self.root.new(df_left._join(dfd_left, dfd_right, how, left_on, right_on, (suffix_left, suffix_right),
+                                         broadcast))
 
         # Remove duplicated index if the name is the same. If the index name are not the same
         if key_middle is True:
@@ -821,13 +824,14 @@ class BaseColumns(ABC):
                 result[col_name] = np.dtype(dfd[col_name]).type
         return format_dict(result)
 
-    def agg_exprs(self, columns, funcs, *args, compute=True, tidy=True, parallel=False):
+    def agg_exprs(self, columns, funcs, *args, compute=True, tidy=True):
         """
-        Create and run aggregation
+        Create and run aggregation. The Aggregation objects returned by the functions are reduced together, so every
+        partition is read once for all the columns and functions, and everything is computed in a single call
         :param columns:
         :param funcs:
         :param args:
-        :param compute:
+        :param compute: If False, return a delayed result that can be computed with other aggregations
         :param tidy:
         :return:
         """
@@ -840,44 +844,91 @@ class BaseColumns(ABC):
             args = (args,)
 
         funcs = val_to_list(funcs)
-        if parallel:
-
-            all_funcs = [getattr(df[columns].data, func.__name__)() for func in funcs]
-            agg_result = {func.__name__: self.exec_agg(all_funcs, compute)[0].to_dict() for func in funcs}
 
-            return agg_result
-        else:
-
-            all_funcs = [{func.__name__: {col_name: func(df.data[col_name], *args)}} for col_name in columns for
-                         func in funcs]
-            agg_result = self.exec_agg(all_funcs, compute)
-
-            result = {}
+        aggregations = {}
+        exprs = {}
+        for col_name in columns:
+            series = df.data[col_name]
+            for func in funcs:
+                expr = func(series, *args)
+                if isinstance(expr, Aggregation):
+                    aggregations[(func.__name__, col_name)] = expr
+                else:
+                    exprs[(func.__name__, col_name)] = expr
 
+        def _format(_exprs):
+            _result = {}
             # Reformat aggregation
-            for agg in agg_result:
-                for x, y in agg.items():
-                    result.setdefault(x, {}).update(y)
+            for func in funcs:
+                for _col_name in columns:
+                    key = (func.__name__, _col_name)
+                    value = _exprs["aggregations"][key] if key in aggregations else _exprs["exprs"][key]
+                    _result.setdefault(func.__name__, {})[_col_name] = value
+            return format_dict(_result, tidy)
+
+        exprs = {"aggregations": self.F.aggregate(aggregations), "exprs": exprs}
 
-        return format_dict(result, tidy)
+        if compute:
+            return _format(self.exec_agg(exprs, True))
+        return self.F.delayed(_format)(self.exec_agg(exprs, False))
 
     @staticmethod
     @abstractmethod
     def exec_agg(exprs, compute):
         pass
 
+    def quantile_sketch(self, columns="*", relative_error=RELATIVE_ERROR):
+        """
+        Return a mergeable quantile sketch of every column. The sketches are built in one pass over all the columns
+        and are cached in the dataframe, so percentile, median, iqr, mad, boxplot and outliers reuse them while the
+        data does not change
+        :param columns:
+        :param relative_error: Max rank error of the quantiles. See sketch_size()
+        :return: {col_name: QuantileSketch}
+        """
+        df = self.root
+        columns = parse_columns(df, columns)
+        sketches = {}
+        missing = []
+
+        for col_name in columns:
+            sketch = df._cached((("quantile_sketch", relative_error), col_name))
+            if sketch is not None:
+                sketches[col_name] = sketch
+            else:
+                missing.append(col_name)
+
+        if missing:
+            computed = df.cols.agg_exprs(missing, self.F.quantile_sketch, relative_error, tidy=False)
+            for col_name, sketch in computed["quantile_sketch"].items():
+                df._cache_value((("quantile_sketch", relative_error), col_name), sketch)
+                sketches[col_name] = sketch
+
+        return {col_name: sketches[col_name] for col_name in columns}
+
     def mad(self, columns="*", relative_error=RELATIVE_ERROR, more=False, tidy=True, compute=True):
         df = self.root
-        return df.cols.agg_exprs(columns, self.F.mad, relative_error, more, compute=compute, tidy=tidy)
+
+        # Cached sketches can not be used without computing the missing ones
+        if compute is False:
+            return df.cols.agg_exprs(columns, self.F.mad, relative_error, more, tidy=tidy, compute=False)
+
+        result = {}
+
+        for col_name, sketch in df.cols.quantile_sketch(columns, relative_error).items():
+            mad_value, median_value = sketch.mad()
+            result[col_name] = {"mad": mad_value, "median": median_value} if more else {"mad": mad_value}
+
+        return format_dict({"mad": result}, tidy)
 
     def min(self, columns="*", tidy=True, compute=True):
 
         df = self.root
-        return df.cols.agg_exprs(columns, self.F.min, compute=compute, tidy=tidy, parallel=True)
+        return df.cols.agg_exprs(columns, self.F.min, compute=compute, tidy=tidy)
 
     def max(self, columns="*", tidy=True, compute=True):
         df = self.root
-        return df.cols.agg_exprs(columns, self.F.max, compute=compute, tidy=tidy, parallel=True)
+        return df.cols.agg_exprs(columns, self.F.max, compute=compute, tidy=tidy)
 
     def mode(self, columns="*", tidy=True, compute=True):
         df = self.root
@@ -892,11 +943,24 @@ class BaseColumns(ABC):
 
         if values is None:
             values = [0.25, 0.5, 0.75]
-        return df.cols.agg_exprs(columns, self.F.percentile, values, relative_error, tidy=tidy, compute=True)
+        values = val_to_list(values)
+
+        if compute is False:
+            return df.cols.agg_exprs(columns, self.F.percentile, values, relative_error, tidy=tidy, compute=False)
+
+        result = {col_name: sketch.quantile(values)
+                  for col_name, sketch in df.cols.quantile_sketch(columns, relative_error).items()}
+        return format_dict({"percentile": result}, tidy)
 
     def median(self, columns="*", relative_error=RELATIVE_ERROR, tidy=True, compute=True):
         df = self.root
-        return df.cols.agg_exprs(columns, self.F.percentile, [0.5], relative_error, tidy=tidy, compute=True)
+
+        if compute is False:
+            return df.cols.agg_exprs(columns, self.F.percentile, [0.5], relative_error, tidy=tidy, compute=False)
+
+        result = {col_name: sketch.quantile([0.5])
+                  for col_name, sketch in df.cols.quantile_sketch(columns, relative_error).items()}
+        return format_dict({"percentile": result}, tidy)
 
     # TODO: implement double MAD http://eurekastatistics.com/using-the-median-absolute-deviation-to-find-outliers/
     def kurtosis(self, columns="*", tidy=True, compute=False):
@@ -1364,18 +1428,23 @@ class BaseColumns(ABC):
 
     def date_format(self, input_cols, current_format=None, output_format=None, output_cols=None):
 
-        return self.apply(input_cols, self.F.date_format, args=(current_format, output_format), func_return_type=str,
-                          output_cols=output_cols, meta_action=Actions.DATE_FORMAT.value, mode="partitioned",
-                          set_index=False)
+        def _format_datetime(series):
+            return self.F.format_datetime(series, output_format)
+
+        columns = [(input_col, output_col, _format_datetime)
+                   for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
+
+        return self._apply_datetime(columns, current_format, meta_action=Actions.DATE_FORMAT.value)
 
     def word_tokenize(self, input_cols="*", output_cols=None):
 
         return self.apply(input_cols, self.F.word_tokenize, func_return_type=str, output_cols=output_cols,
-                          meta_action=Actions.WORD_TOKENIZE.value, mode="map")
+                          meta_action=Actions.WORD_TOKENIZE.value, mode="vectorized")
 
     def word_count(self, input_cols="*", output_cols=None):
 
-        return self.word_tokenize(input_cols, output_cols).cols.len(output_cols)
+        return self.apply(input_cols, self.F.word_count, func_return_type=int, output_cols=output_cols,
+                          meta_action=Actions.LENGTH.value, mode="vectorized")
 
     def len(self, input_cols="*", output_cols=None):
         return self.apply(input_cols, self.F.len, func_return_type=str, output_cols=output_cols,
@@ -1429,16 +1498,14 @@ class BaseColumns(ABC):
 
     def remove_stopwords(self, input_cols="*", language="english", output_cols=None):
         """
-        Remove extra whitespace between words and trim whitespace from the beginning and the end of each string.
+        Lower case the text and remove the stopwords and the extra whitespace in a single pass over every value.
         :param input_cols:
         :param language: specify the stopwords language
         :param output_cols:
         :return:
         """
-
-        stop = stopwords.words(language)
-        df = self.root
-        return df.cols.lower(input_cols).cols.replace("*", stop, "", "words").cols.normalize_spaces()
+        return self.apply(input_cols, self.F.remove_stopwords, args=(language,), func_return_type=str,
+                          output_cols=output_cols, mode="vectorized")
 
     def remove_urls(self, input_cols="*", output_cols=None):
         return self.apply(input_cols, self.F.remove_urls, func_return_type=str,
@@ -1466,16 +1533,168 @@ class BaseColumns(ABC):
         return self.apply(input_cols, self.F.remove_special_chars, func_return_type=str,
                           output_cols=output_cols, mode="vectorized")
 
-    def to_datetime(self, input_cols, format, output_cols=None):
+    def to_datetime(self, input_cols, format=None, output_cols=None):
         """
 
         :param input_cols:
-        :param format:
+        :param format: If None, the format set with set_dtype() or inferred by the profiler is used
         :param output_cols:
         :return:
         """
-        return self.apply(input_cols, self.F.to_datetime, func_return_type=str,
-                          output_cols=output_cols, args=format, mode="partitioned")
+        columns = [(input_col, output_col, lambda series: series)
+                   for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
+
+        return self._apply_datetime(columns, format)
+
+    def datetime_format(self, col_name):
+        """
+        Return the date format set with set_dtype() or inferred by the profiler for a column
+        :param col_name:
+        :return:
+        """
+        meta = self.root.meta
+        props = Meta.get(meta, f"columns_dtypes.{col_name}") \
+            or Meta.get(meta, f"profile.columns.{col_name}.stats.profiler_dtype")
+
+        return props.get("format") if is_dict(props) else None
+
+    def infer_date_format(self, col_name, values):
+        """
+        Infer the date format of a column. The most common formats in a sample are validated against the sample.
+        If several formats parse the same values, like day first and month first when all the days are lower than 13,
+        they are compared on a bigger random sample, only on the values where they disagree. They are validated
+        against the whole column only if they are still tied.
+        :param col_name:
+        :param values: pandas series with a sample of the column
+        :return: (format, ratio of the not null values in the sample that were parsed)
+        """
+        ranked = rank_date_formats(values, infer_date_formats(values))
+
+        if not ranked:
+            return None, 0
+
+        date_format, ratio = ranked[0]
+        tied = [_format for _format, _ratio in ranked if _ratio == ratio]
+
+        if ratio > 0 and len(tied) > 1:
+            df = self.root
+            sample = df.cols.select(col_name).sample(DATE_FORMATS_TIE_SAMPLE).to_optimus_pandas().data[col_name]
+            tied = break_date_formats_tie(sample, tied)
+            date_format = tied[0]
+
+        if ratio > 0 and len(tied) > 1:
+            series = self.root.data[col_name]
+            counts = dask.compute(*[self.F.to_datetime(series, _format).notnull().sum() for _format in tied])
+            date_format = tied[counts.index(max(counts))]
+
+        return date_format, ratio
+
+    def _parsed(self, key, col_name, func):
+        """
+        Return a column parsed by func. The result is cached in the dataframe keyed by key and the column name, so
+        extracting several parts from the same column only parses it once. See BaseDataFrame._cached().
+        :param key:
+        :param col_name:
+        :param func: Function that receives the column series
+        :return:
+        """
+        df = self.root
+        return df._cached((key, col_name), lambda: func(df.data[col_name]))
+
+    def _to_datetime(self, col_name, format=None):
+        """
+        Return a column parsed as datetime
+        :param col_name:
+        :param format: If None, the format set with set_dtype() or inferred by the profiler is used
+        :return:
+        """
+        if format is None:
+            format = self.datetime_format(col_name)
+
+        return self._parsed(("datetime", format), col_name, lambda series: self.F.to_datetime(series, format))
+
+    def _url_part(self, col_name, part):
+        """
+        Return a component of the urls in a column. The urls are split only once for all the components, and the hosts
+        only once for the subdomain, domain and top domain
+        :param col_name:
+        :param part: One of URL_PARTS
+        :return:
+        """
+        if part in ["subdomain", "domain", "top_domain"]:
+            hosts = self._url_part(col_name, "host")
+            return self._parsed("host", col_name, lambda _: self.F.split_hosts(hosts))[part]
+
+        return self._parsed("url", col_name, self.F.split_url)[part]
+
+    def _apply_parsed(self, columns, parse, meta_action=Actions.APPLY_COLS.value):
+        """
+        Apply functions to parsed columns
+        :param columns: list of (input column, output column, function). The function receives the parsed column
+        :param parse: Function that receives a column name and return it parsed
+        :param meta_action:
+        :return:
+        """
+        df = self.root
+        meta = df.meta
+        kw_columns = {}
+        output_ordered_columns = self.names()
+        positions = {}
+
+        for input_col, output_col, func in columns:
+            kw_columns[output_col] = func(parse(input_col))
+
+            # Preserve column order
+            if output_col not in output_ordered_columns:
+                col_index = positions.get(input_col, output_ordered_columns.index(input_col) + 1)
+                output_ordered_columns[col_index:col_index] = [output_col]
+                positions[input_col] = col_index + 1
+
+            meta = Meta.action(meta, meta_action, output_col)
+
+        df = self.root.new(df.data, meta=meta)
+        df = df.cols.assign(kw_columns)
+        return df.cols.select(output_ordered_columns)
+
+    def _apply_datetime(self, columns, format, meta_action=Actions.APPLY_COLS.value):
+        """
+        Apply functions to columns parsed as datetime
+        :param columns: list of (input column, output column, function). The function receives the datetime series
+        :param format: format of the dates in the input columns
+        :param meta_action:
+        :return:
+        """
+        return self._apply_parsed(columns, lambda col_name: self._to_datetime(col_name, format), meta_action)
+
+    def date_parts(self, input_cols, parts=None, format=None, output_cols=None):
+        """
+        Extract several parts from the dates in one pass. Every column is parsed only once.
+        :param input_cols:
+        :param parts: 'year', 'month', 'day', 'hour', 'minute', 'second' or 'weekday' or a list of them.
+        All the parts by default
+        :param format: format of the dates in the input columns
+        :param output_cols: Only used if one part is extracted. If several parts are extracted the output columns
+        are named <input_col>_<part>
+        :return:
+        """
+        parts = DATE_PARTS if parts is None else val_to_list(parts)
+
+        for part in parts:
+            if part not in DATE_PARTS:
+                RaiseIt.value_error(part, DATE_PARTS)
+
+        def _date_part(_part):
+            return lambda series: self.F.date_part(series, _part)
+
+        if len(parts) == 1:
+            columns = [(input_col, output_col, _date_part(parts[0]))
+                       for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
+        else:
+            columns = [(input_col, name_col(input_col, part), _date_part(part))
+                       for input_col in parse_columns(self.root, input_cols) for part in parts]
+
+        meta_action = Actions.YEAR.value if parts == ["year"] else Actions.APPLY_COLS.value
+        return self._apply_datetime(columns, format, meta_action=meta_action)
 
     def year(self, input_cols, format=None, output_cols=None):
         """
@@ -1485,10 +1704,7 @@ class BaseColumns(ABC):
         :param output_cols:
         :return:
         """
-
-        return self.apply(input_cols, self.F.year, args=format, output_cols=output_cols,
-                          meta_action=Actions.YEAR.value,
-                          mode="vectorized", set_index=True)
+        return self.date_parts(input_cols, "year", format, output_cols)
 
     def month(self, input_cols, format=None, output_cols=None):
         """
@@ -1498,51 +1714,28 @@ class BaseColumns(ABC):
         :param output_cols:
         :return:
         """
-
-        return self.apply(input_cols, self.F.month(), args=format, output_cols=output_cols, mode="vectorized",
-                          set_index=True)
+        return self.date_parts(input_cols, "month", format, output_cols)
 
     def day(self, input_cols, format=None, output_cols=None):
-
-        return self.apply(input_cols, self.F.day, args=format, output_cols=output_cols, mode="vectorized",
-                          set_index=True)
+        return self.date_parts(input_cols, "day", format, output_cols)
 
     def hour(self, input_cols, format=None, output_cols=None):
-
-        def _hour(value, _format):
-            return self.F.hour(value, _format)
-
-        return self.apply(input_cols, _hour, args=format, output_cols=output_cols, mode="vectorized", set_index=True)
+        return self.date_parts(input_cols, "hour", format, output_cols)
 
     def minute(self, input_cols, format=None, output_cols=None):
-
-        def _minute(value, _format):
-            return self.F.minute(value, _format)
-
-        return self.apply(input_cols, _minute, args=format, output_cols=output_cols, mode="vectorized", set_index=True)
+        return self.date_parts(input_cols, "minute", format, output_cols)
 
     def second(self, input_cols, format=None, output_cols=None):
-
-        def _second(value, _format):
-            return self.F.second(value, _format)
-
-        return self.apply(input_cols, _second, args=format, output_cols=output_cols, mode="vectorized", set_index=True)
+        return self.date_parts(input_cols, "second", format, output_cols)
 
     def weekday(self, input_cols, format=None, output_cols=None):
-
-        def _second(value, _format):
-            return self.F.weekday(value, _format)
-
-        return self.apply(input_cols, _second, args=format, output_cols=output_cols, mode="vectorized", set_index=True)
+        return self.date_parts(input_cols, "weekday", format, output_cols)
 
     def years_between(self, input_cols, date_format=None, output_cols=None):
+        columns = [(input_col, output_col, self.F.years_until)
+                   for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
 
-        def _years_between(value, args):
-            return self.F.years_between(value, *args)
-
-        return self.apply(input_cols, _years_between, args=[date_format], func_return_type=str,
-                          output_cols=output_cols,
-                          meta_action=Actions.YEARS_BETWEEN.value, mode="partitioned", set_index=True)
+        return self._apply_datetime(columns, date_format, meta_action=Actions.YEARS_BETWEEN.value)
 
     def replace(self, input_cols="*", search=None, replace_by=None, search_by="chars", ignore_case=False,
                 output_cols=None):
@@ -1654,7 +1847,16 @@ class BaseColumns(ABC):
         df = self.root
         return df.cols.agg_exprs(columns, self.F.unique, values, estimate, tidy=tidy, compute=compute)
 
-    def count_uniques(self, columns="*", values=None, estimate=True, tidy=True, compute=True):
+    def count_uniques(self, columns="*", values=None, estimate=False, tidy=True, compute=True):
+        """
+        Number of unique values in every column
+        :param columns:
+        :param values:
+        :param estimate: Estimate the count with a HyperLogLog, merged between partitions without collecting the values
+        :param tidy:
+        :param compute:
+        :return:
+        """
         df = self.root
         return df.cols.agg_exprs(columns, self.F.count_uniques, values, estimate, tidy=tidy, compute=compute)
 
@@ -1766,10 +1968,45 @@ class BaseColumns(ABC):
 
         return format_dict(iqr_result)
 
-    @staticmethod
-    @abstractmethod
-    def nest(input_cols, separator="", output_col=None, drop=False, shape="string"):
-        pass
+    def nest(self, input_cols, separator="", output_col=None, drop=False, shape="string"):
+        """
+        Merge multiple columns with the format specified
+        :param input_cols: columns to be nested
+        :param separator: char to be used as separator at the concat time
+        :param output_col:
+        :param drop: Drop the input columns
+        :param shape: final data type, 'array', 'string' or 'vector'
+        :return:
+        """
+        df = self.root
+        input_cols = parse_columns(df, input_cols)
+
+        if output_col is None:
+            output_col = name_col(input_cols)
+
+        dfd = df.data
+
+        if shape == "string":
+            value = self.F.nest_string([dfd[input_col] for input_col in input_cols], separator)
+        elif shape in ("array", "vector"):
+            value = self.F.nest_array(dfd[input_cols])
+        else:
+            RaiseIt.value_error(shape, ["string", "array", "vector"])
+
+        output_ordered_columns = df.cols.names()
+        if output_col not in output_ordered_columns:
+            col_index = output_ordered_columns.index(input_cols[-1]) + 1
+            output_ordered_columns[col_index:col_index] = [output_col]
+
+        if drop is True:
+            for input_col in input_cols:
+                if input_col in output_ordered_columns and input_col != output_col:
+                    output_ordered_columns.remove(input_col)
+
+        df = df.cols.assign({output_col: value})
+        df.meta = Meta.action(df.meta, Actions.NEST.value, [output_col])
+
+        return df.cols.select(output_ordered_columns)
 
     def unnest(self, input_cols, separator=None, splits=2, index=None, output_cols=None, drop=False, mode="string"):
 
@@ -1780,9 +2017,9 @@ class BaseColumns(ABC):
         (output_col_2_1, output_col_2]
         :param separator: char or regex
         :param splits: Number of columns splits.
-        :param index: Return a specific index per columns. [1,2]
+        :param index: Return only the splits in these positions. [0, 2] or a tuple per input column [(0, 2), (1,)]
         :param drop:
-        :param mode:
+        :param mode: 'string' or 'array'
         """
         df = self.root
 
@@ -1796,6 +2033,8 @@ class BaseColumns(ABC):
 
         dfd = df.data
 
+        # Every split is assigned in the same operation instead of appending and moving a dataframe per input column
+        kw_columns = {}
         for idx, input_col in enumerate(input_cols):
 
             if is_list_of_tuples(index):
@@ -1813,38 +2052,33 @@ class BaseColumns(ABC):
                 final_columns = [output_cols + "_" + str(i) for i in range(splits)]
 
             if mode == "string":
-                dfd_new = dfd[input_col].astype(str).str.split(separator, expand=True, n=splits - 1)
-
+                dfd_new = self.F.split(self.F.to_string(dfd[input_col]), separator, splits)
             elif mode == "array":
-                if is_dask_dataframe(dfd):
-                    def func(value):
-                        pdf = value.apply(pd.Series)
-                        pdf.columns = final_columns
-                        return pdf
-
-                    dfd_new = dfd[input_col].map_partitions(func, meta={c: object for c in final_columns})
-                else:
-                    dfd_new = dfd[input_col].apply(pd.Series)
+                dfd_new = self.F.unnest_array(dfd[input_col], splits)
+            else:
+                RaiseIt.value_error(mode, ["string", "array"])
 
-            # If columns split is shorter than the number of splits
-            dfd_new.columns = final_columns[:len(dfd_new.columns)]
-            df_new = df.new(dfd_new)
-            if final_index:
-                df_new = df_new.cols.select(final_index[idx])
-            df = df.cols.append([df_new])
+            positions = range(splits) if final_index is None else val_to_list(final_index)
+            new_columns = []
+            for i in positions:
+                kw_columns[final_columns[i]] = dfd_new[i]
+                new_columns.append(final_columns[i])
 
-        df.meta = Meta.action(df.meta, Actions.UNNEST.value, final_columns)
+            col_index = output_ordered_columns.index(input_col) + 1
+            new_columns = [col for col in new_columns if col not in output_ordered_columns]
+            output_ordered_columns[col_index:col_index] = new_columns
 
-        df = df.cols.move(df_new.cols.names(), "after", input_cols)
+        df = df.cols.assign(kw_columns)
+        df.meta = Meta.action(df.meta, Actions.UNNEST.value, list(kw_columns.keys()))
 
         if drop is True:
             if output_cols is not None:
                 columns = [col for col in input_cols if col not in output_cols]
             else:
                 columns = input_cols
-            df = df.cols.drop(columns)
+            output_ordered_columns = [col for col in output_ordered_columns if col not in columns]
 
-        return df
+        return df.cols.select(output_ordered_columns)
 
     @staticmethod
     @abstractmethod
@@ -1912,7 +2146,7 @@ class BaseColumns(ABC):
         """
         df = self.root
 
-        result = {}
+        exprs = {}
         profiler_to_mask_func = {
             "decimal": "float"
         }
@@ -1921,24 +2155,36 @@ class BaseColumns(ABC):
             # Match the profiler dtype with the function. The only function that need to be remapped are decimal and int
             dtype = profiler_to_mask_func.get(props["dtype"], props["dtype"])
 
-            matches_mismatches = getattr(df.mask, dtype)(col_name).cols.frequency()
-            values = {list(j.values())[0]: list(j.values())[1] for j in
-                      matches_mismatches["frequency"][col_name]["values"]}
-            missing = df.mask.nulls(col_name).cols.sum()
+            if dtype == ProfilerDataTypes.DATETIME.value:
+                mask = df.mask.datetime(col_name, props.get("format"))
+            else:
+                mask = getattr(df.mask, dtype)(col_name)
+            exprs[col_name] = {"frequency": mask.cols.frequency(compute=False),
+                               "missing": df.mask.nulls(col_name).cols.sum(compute=False)}
 
-            matches = values.get(True)
-            mismatches = values.get(False, missing) - missing
+        def _count(_exprs):
+            result = {}
+            for _col_name, _expr in _exprs.items():
+                values = {list(j.values())[0]: list(j.values())[1] for j in
+                          _expr["frequency"]["frequency"][_col_name]["values"]}
+                missing = _expr["missing"]
 
-            # Ensure that value are not None
-            matches = 0 if matches is None else int(matches)
-            mismatches = 0 if mismatches is None else int(mismatches)
-            missing = 0 if missing is None else int(missing)
+                matches = values.get(True)
+                mismatches = values.get(False, missing) - missing
 
-            result[col_name] = {"match": matches, "missing": missing, "mismatch": mismatches}
+                # Ensure that value are not None
+                matches = 0 if matches is None else int(matches)
+                mismatches = 0 if mismatches is None else int(mismatches)
+                missing = 0 if missing is None else int(missing)
 
-        for col_name in columns_type.keys():
-            result[col_name].update({"profiler_dtype": columns_type[col_name]})
-        return result
+                result[_col_name] = {"match": matches, "missing": missing, "mismatch": mismatches,
+                                     "profiler_dtype": columns_type[_col_name]}
+            return result
+
+        # The counts of all the columns are computed at once
+        if compute:
+            return _count(self.exec_agg(exprs, True))
+        return self.F.delayed(_count)(self.exec_agg(exprs, False))
 
     @staticmethod
     @abstractmethod
@@ -1965,15 +2211,18 @@ class BaseColumns(ABC):
         :param columns: Columns in which you want to infer the datatype.
         :return:Return a dict with the column and the inferred data type
         """
+        # wordninja loads its language model when it is imported
+        import wordninja
+
         df = self.root
 
         columns = parse_columns(df, columns)
 
         # Infer the data type from every element in a Series.
-        sample = df.cols.select(columns).rows.limit(INFER_PROFILER_ROWS)
+        sample = df.cols.select(columns).rows.limit(INFER_PROFILER_ROWS).to_optimus_pandas()
         rows_count = sample.rows.count()
-        sample_dtypes = sample.to_optimus_pandas().cols.infer_dtypes().cols.frequency()
-        _unique_counts = df.cols.count_uniques()
+        sample_dtypes = sample.cols.infer_dtypes().cols.frequency()
+        unique_counts = df.cols.count_uniques(columns, tidy=False)["count_uniques"]
         cols_and_inferred_dtype = {}
         for col_name in columns:
             infer_value_counts = sample_dtypes["frequency"][col_name]["values"]
@@ -1994,7 +2243,16 @@ class BaseColumns(ABC):
             else:
                 _dtype = ProfilerDataTypes.OBJECT.value
 
-            _unique_counts = df[col_name].cols.count_uniques()
+            # Validate the most common date formats in the sample against all the values in the sample
+            date_format = None
+            if _dtype in [ProfilerDataTypes.STRING.value, ProfilerDataTypes.DATETIME.value]:
+                date_format, ratio = self.infer_date_format(col_name, sample.data[col_name])
+                if ratio >= DATETIME_THRESHOLD:
+                    _dtype = ProfilerDataTypes.DATETIME.value
+                else:
+                    date_format = None
+
+            _unique_counts = unique_counts[col_name]
 
             if not (any(x in [word.lower() for word in wordninja.split(col_name)] for x in ["zip", "zc"])) \
                     and _dtype == ProfilerDataTypes.ZIP_CODE.value \
@@ -2013,10 +2271,8 @@ class BaseColumns(ABC):
                 is_categorical = True
 
             cols_and_inferred_dtype[col_name] = {"dtype": _dtype, "categorical": is_categorical}
-            if dtype == ProfilerDataTypes.DATETIME.value:
-                # pydatainfer do not accepts None value so we must filter them
-                filtered_dates = [i for i in sample[col_name].to_list() if i]
-                cols_and_inferred_dtype[col_name].update({"format": pydateinfer.infer_dtypes(filtered_dates)})
+            if date_format is not None:
+                cols_and_inferred_dtype[col_name].update({"format": date_format})
 
         return cols_and_inferred_dtype
 
@@ -2073,7 +2329,7 @@ class BaseColumns(ABC):
             c = freq_percentage(c, df.delayed(len)(df))
 
         if compute is True:
-            result = dd.compute(c)[0]
+            result = dask.compute(c)[0]
         else:
             result = c
 
@@ -2150,17 +2406,46 @@ class BaseColumns(ABC):
     def index_to_string(input_cols=None, output_cols=None, columns=None):
         pass
 
+    def url_parts(self, input_cols="*", parts=None, output_cols=None, meta_action=Actions.APPLY_COLS.value):
+        """
+        Extract several components from the urls in one pass. Every column is parsed only once.
+        From http://search.somedb.com:8080/history?era=darkages it returns
+        scheme: http, host: search.somedb.com, port: 8080, path: /history, query: era=darkages, fragment: None,
+        subdomain: search, domain: somedb.com, top_domain: com
+        :param input_cols:
+        :param parts: One or a list of 'scheme', 'host', 'port', 'path', 'query', 'fragment', 'subdomain', 'domain'
+        or 'top_domain'. All the parts by default
+        :param output_cols: Only used if one part is extracted. If several parts are extracted the output columns
+        are named <input_col>_<part>
+        :param meta_action:
+        :return:
+        """
+        parts = URL_PARTS if parts is None else val_to_list(parts)
+
+        for part in parts:
+            if part not in URL_PARTS:
+                RaiseIt.value_error(part, URL_PARTS)
+
+        def _url_part(_part):
+            return lambda col_name: self._url_part(col_name, _part)
+
+        if len(parts) == 1:
+            columns = [(input_col, output_col, _url_part(parts[0]))
+                       for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
+        else:
+            columns = [(input_col, name_col(input_col, part), _url_part(part))
+                       for input_col in parse_columns(self.root, input_cols) for part in parts]
+
+        return self._apply_parsed(columns, lambda col_name: col_name, meta_action)
+
     def top_domain(self, input_cols="*", output_cols=None):
         """
-        From https://www.hi-bumblebee.com it returns hi-bumblebee.com
+        From https://www.hi-bumblebee.co.uk it returns co.uk
         :param input_cols:
         :param output_cols:
         :return:
         """
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.top_domain, output_cols=output_cols, meta_action=Actions.DOMAIN.value,
-                             mode="vectorized")
+        return self.url_parts(input_cols, "top_domain", output_cols, meta_action=Actions.DOMAIN.value)
 
     # URL methods
     def domain(self, input_cols="*", output_cols=None):
@@ -2170,64 +2455,48 @@ class BaseColumns(ABC):
         :param output_cols:
         :return:
         """
+        return self.url_parts(input_cols, "domain", output_cols, meta_action=Actions.DOMAIN.value)
 
-        df = self.root
-        return df.cols.apply(input_cols, self.F.domain, output_cols=output_cols, meta_action=Actions.DOMAIN.value,
-                             mode="vectorized")
+    def host(self, input_cols="*", output_cols=None):
+        # From https://www.hi-bumblebee.com:8080 it returns www.hi-bumblebee.com
+        return self.url_parts(input_cols, "host", output_cols, meta_action=Actions.HOST.value)
 
     def url_scheme(self, input_cols="*", output_cols=None):
         # From https://www.hi-bumblebee.com it returns https
-        df = self.root
-        return df.cols.apply(input_cols, self.F.url_scheme, output_cols=output_cols,
-                             meta_action=Actions.DOMAIN_SCHEME.value,
-                             mode="map")
+        return self.url_parts(input_cols, "scheme", output_cols, meta_action=Actions.DOMAIN_SCHEME.value)
 
     def url_params(self, input_cols="*", output_cols=None):
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.url_params, output_cols=output_cols,
-                             meta_action=Actions.DOMAIN_PARAMS.value,
-                             mode="map")
+        # Same as url_query()
+        return self.url_query(input_cols, output_cols)
 
     def url_path(self, input_cols="*", output_cols=None):
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.url_path, output_cols=output_cols,
-                             meta_action=Actions.DOMAIN_PATH.value,
-                             mode="map")
+        # From https://www.hi-bumblebee.com/search?era=darkages it returns /search
+        return self.url_parts(input_cols, "path", output_cols, meta_action=Actions.DOMAIN_PATH.value)
 
     def port(self, input_cols="*", output_cols=None):
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.port, output_cols=output_cols, meta_action=Actions.PORT.value,
-                             mode="map")
+        # From https://www.hi-bumblebee.com:8080 it returns 8080
+        return self.url_parts(input_cols, "port", output_cols, meta_action=Actions.PORT.value)
 
     def url_query(self, input_cols="*", output_cols=None):
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.url_query, output_cols=output_cols, meta_action=Actions.PORT.value,
-                             mode="map")
+        # From https://www.hi-bumblebee.com/search?era=darkages it returns era=darkages
+        return self.url_parts(input_cols, "query", output_cols, meta_action=Actions.DOMAIN_QUERY.value)
 
     def subdomain(self, input_cols="*", output_cols=None):
         # From https://www.hi-bumblebee.com:8080 it returns www
-
-        df = self.root
-        return df.cols.apply(input_cols, self.F.subdomain, output_cols=output_cols, meta_action=Actions.SUBDOMAIN.value,
-                             mode="vectorized")
+        return self.url_parts(input_cols, "subdomain", output_cols, meta_action=Actions.SUBDOMAIN.value)
 
     # Email functions
-    def email_username(self, input_cols="*", output_cols=None):
+    def _email_part(self, input_cols, part, output_cols, meta_action):
+        columns = [(input_col, output_col, lambda col_name: self._parsed("email", col_name, self.F.split_email)[part])
+                   for input_col, output_col in prepare_columns(self.root, input_cols, output_cols)]
 
-        df = self.root
-        return df.cols.apply(input_cols, self.F.email_username, output_cols=output_cols,
-                             meta_action=Actions.EMAIL_USER.value,
-                             mode="vectorized")
+        return self._apply_parsed(columns, lambda col_name: col_name, meta_action)
+
+    def email_username(self, input_cols="*", output_cols=None):
+        return self._email_part(input_cols, "username", output_cols, Actions.EMAIL_USER.value)
 
     def email_domain(self, input_cols="*", output_cols=None):
-        df = self.root
-        return df.cols.apply(input_cols, self.F.email_domain, output_cols=output_cols,
-                             meta_action=Actions.EMAIL_DOMAIN.value,
-                             mode="vectorized")
+        return self._email_part(input_cols, "domain", output_cols, Actions.EMAIL_DOMAIN.value)
 
     # Mask functions
     def missing(self, input_cols, output_cols=None):
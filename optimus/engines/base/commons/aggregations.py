@@ -0,0 +1,423 @@
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+from optimus.engines.base.commons.sketch import QuantileSketch, SPLIT_EVERY
+
+# Registers of a HyperLogLog are 2 ** HLL_PRECISION. The standard error of the count is about 1.04 / sqrt(registers)
+HLL_PRECISION = 12
+
+# Aggregations that every dataframe library can run by name in a groupby, with its own tree reduction
+NATIVE_AGGREGATIONS = ["sum", "mean", "min", "max", "count", "std", "var"]
+
+
+def _to_pandas(series):
+    return series.to_pandas() if hasattr(series, "to_pandas") else series
+
+
+def _is_cudf(series):
+    return hasattr(series, "to_pandas")
+
+
+def _to_float(series):
+    """
+    Values of a series as floats, without the values that can not be converted. The series is converted by its own
+    library, so cuDF data stays in the GPU
+    :param series:
+    :return:
+    """
+    if _is_cudf(series):
+        import cudf
+        values = cudf.to_numeric(series, errors="coerce").astype(float)
+    else:
+        values = pd.to_numeric(pd.Series(series), errors="coerce").astype(float)
+    return values[values.notna()]
+
+
+def _hashes(series):
+    """
+    64 bits hash of every value of a series, as a numpy array or a cupy array for cuDF
+    :param series:
+    :return:
+    """
+    if _is_cudf(series):
+        return series.hash_values(method="xxhash64").values
+    return hash_pandas_object(series, index=False).to_numpy()
+
+
+class Moments:
+    """
+    Count, sum and sum of squared deviations from the mean of the numeric values of a column. The mean, the variance
+    and the standard deviation of several partitions come from merging their moments, so they are calculated together
+    in one pass
+    """
+
+    def __init__(self, count, total, m2):
+        self.count = count
+        self.total = total
+        self.m2 = m2
+
+    @classmethod
+    def from_series(cls, series):
+        values = _to_float(series)
+        if len(values) == 0:
+            return cls(0, 0.0, 0.0)
+        return cls(len(values), float(values.sum()), float(((values - values.mean()) ** 2).sum()))
+
+    @classmethod
+    def merge(cls, moments):
+        """
+        Merge the moments of several partitions. The sums of squared deviations are combined with the difference of
+        the means, which is stable even when the variance is small compared to the mean
+        :param moments:
+        :return:
+        """
+        count, total, m2 = 0, 0.0, 0.0
+        for _moments in moments:
+            if _moments.count == 0:
+                continue
+            if count > 0:
+                delta = _moments.total / _moments.count - total / count
+                m2 += delta ** 2 * count * _moments.count / (count + _moments.count)
+            count += _moments.count
+            total += _moments.total
+            m2 += _moments.m2
+        return cls(count, total, m2)
+
+    def mean(self):
+        return self.total / self.count if self.count else np.nan
+
+    def var(self, ddof=1):
+        return self.m2 / (self.count - ddof) if self.count > ddof else np.nan
+
+    def std(self, ddof=1):
+        return float(np.sqrt(self.var(ddof)))
+
+
+class HyperLogLog:
+    """
+    Mergeable estimate of the number of distinct values of a column. Every value is hashed and only the longest run
+    of leading zeros found in each of 2 ** precision buckets is kept, so the sketch of a partition takes a few KB
+    whatever the number of values
+    """
+
+    def __init__(self, registers):
+        self.registers = registers
+
+    @classmethod
+    def from_series(cls, series, precision=HLL_PRECISION):
+        series = (series if _is_cudf(series) else pd.Series(series)).dropna().reset_index(drop=True)
+        registers = np.zeros(1 << precision, dtype=np.uint8)
+        if len(series) == 0:
+            return cls(registers)
+
+        # The ranks are calculated by the library of the series, so only the registers are copied from the GPU
+        if _is_cudf(series):
+            import cupy as xp
+        else:
+            xp = np
+        hashes = _hashes(series)
+        buckets = (hashes >> xp.uint64(64 - precision)).astype(xp.int64)
+        # Only the first 52 bits after the bucket are used, so they can be converted to float exactly to find their
+        # length
+        width = min(64 - precision, 52)
+        rest = (hashes & xp.uint64((1 << (64 - precision)) - 1)) >> xp.uint64(64 - precision - width)
+        ranks = width + 1 - xp.frexp(rest.astype(float))[1]
+
+        ranks = _to_pandas(type(series)(ranks).groupby(type(series)(buckets)).max())
+        registers[ranks.index.to_numpy()] = ranks.to_numpy()
+        return cls(registers)
+
+    @classmethod
+    def merge(cls, sketches):
+        return cls(np.maximum.reduce([sketch.registers for sketch in sketches]))
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m ** 2 / np.sum(np.exp2(-self.registers.astype(float)))
+        zeros = np.count_nonzero(self.registers == 0)
+        # Small cardinalities are estimated from the empty registers
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+
+def _min(series):
+    series = series.dropna()
+    return series.min() if len(series) > 0 else np.nan
+
+
+def _max(series):
+    series = series.dropna()
+    return series.max() if len(series) > 0 else np.nan
+
+
+def _not_null(values):
+    return [value for value in values if not pd.isnull(value)]
+
+
+def _min_merge(values):
+    values = _not_null(values)
+    return min(values) if values else np.nan
+
+
+def _max_merge(values):
+    values = _not_null(values)
+    return max(values) if values else np.nan
+
+
+def _range(series):
+    values = _to_float(series)
+    return (float(values.min()), float(values.max())) if len(values) > 0 else (np.nan, np.nan)
+
+
+def _range_merge(ranges):
+    return np.nanmin([value[0] for value in ranges]), np.nanmax([value[1] for value in ranges])
+
+
+def _value_counts(series):
+    # Only the counts are copied from the GPU
+    return _to_pandas(_to_float(series).value_counts())
+
+
+def _value_counts_merge(value_counts):
+    return pd.concat(value_counts).groupby(level=0).sum()
+
+
+def modes(value_counts):
+    if len(value_counts) == 0:
+        return {}
+    return dict(enumerate(sorted(value_counts.index[value_counts == value_counts.max()])))
+
+
+class Aggregation:
+    """
+    Lazy aggregation of a series. chunk runs on every partition, combine merges the partials of several partitions
+    and finalize turns the merged partial into the result. Partials are mergeable, so any mix of aggregations over
+    any columns is reduced together by compute_aggregations()
+    """
+
+    def __init__(self, series, chunk, combine, finalize=None):
+        """
+        :param series: Series to be aggregated
+        :param chunk: Function that returns the partial of a partition
+        :param combine: Function that merges a list of partials
+        :param finalize: Function that returns the result from the merged partial. None returns the partial
+        """
+        self.series = series
+        self.chunk = chunk
+        self.combine = combine
+        self.finalize = finalize
+
+
+def _chunk(aggregations, sources, partitions):
+    return {key: aggregation.chunk(partitions[sources[key]]) for key, aggregation in aggregations.items()}
+
+
+def _combine(aggregations, partials):
+    return {key: aggregation.combine([partial[key] for partial in partials])
+            for key, aggregation in aggregations.items()}
+
+
+def _finalize(aggregations, partial):
+    return {key: partial[key] if aggregation.finalize is None else aggregation.finalize(partial[key])
+            for key, aggregation in aggregations.items()}
+
+
+def compute_aggregations(aggregations, delayed, to_delayed):
+    """
+    Reduce several aggregations in a single tree. One task runs the chunks of all the aggregations in every
+    partition and the partials are merged so no task merges more than SPLIT_EVERY of them
+    :param aggregations: {key: Aggregation}. The series must be partitioned the same way
+    :param delayed: Function used to build the tasks
+    :param to_delayed: Function that splits a series in partitions
+    :return: {key: value}, delayed if the partitions are
+    """
+    if not aggregations:
+        return {}
+
+    series = []
+    partitions = []
+    sources = {}
+    for key, aggregation in aggregations.items():
+        for i, _series in enumerate(series):
+            if _series is aggregation.series:
+                break
+        else:
+            i = len(series)
+            series.append(aggregation.series)
+            partitions.append(to_delayed(aggregation.series))
+        sources[key] = i
+
+    # The tasks only get the functions, so the series are not added to the graph
+    functions = {key: Aggregation(None, aggregation.chunk, aggregation.combine, aggregation.finalize)
+                 for key, aggregation in aggregations.items()}
+
+    partials = [delayed(_chunk)(functions, sources, list(_partitions)) for _partitions in zip(*partitions)]
+    while len(partials) > 1:
+        partials = [delayed(_combine)(functions, partials[i:i + SPLIT_EVERY])
+                    for i in range(0, len(partials), SPLIT_EVERY)]
+    return delayed(_finalize)(functions, partials[0])
+
+
+def intermediates(relative_error=None):
+    """
+    Partial results calculated in every partition and how the partials of several partitions are merged
+    :param relative_error: Max rank error of the quantile sketches
+    :return: {name: (chunk, combine)}
+    """
+    return {"count": (lambda series: int(series.count()), sum),
+            "count_na": (lambda series: int(series.isna().sum()), sum),
+            "moments": (Moments.from_series, Moments.merge),
+            "min": (_min, _min_merge),
+            "max": (_max, _max_merge),
+            "range": (_range, _range_merge),
+            "value_counts": (_value_counts, _value_counts_merge),
+            "nunique": (HyperLogLog.from_series, HyperLogLog.merge),
+            "sketch": (lambda series: QuantileSketch.from_series(series, relative_error),
+                       lambda sketches: QuantileSketch.merge(sketches, relative_error))}
+
+
+def aggregation_plan(aggregation):
+    """
+    Intermediate needed by an aggregation and the function that calculates the aggregation from it
+    :param aggregation: 'sum', 'mean', 'min', 'max', 'count', 'std', 'var', 'nunique_approx', 'median' or
+    'percentile_<n>', with n between 0 and 100
+    :return: (intermediate, finalize) or None if the aggregation can not be planned
+    """
+    plans = {"count": ("count", lambda count: count),
+             "sum": ("moments", lambda moments: moments.total),
+             "mean": ("moments", Moments.mean),
+             "var": ("moments", Moments.var),
+             "std": ("moments", Moments.std),
+             "min": ("min", lambda value: value),
+             "max": ("max", lambda value: value),
+             "nunique_approx": ("nunique", HyperLogLog.count),
+             "median": ("sketch", lambda sketch: sketch.quantile(0.5))}
+
+    if aggregation in plans:
+        return plans[aggregation]
+
+    match = re.fullmatch(r"percentile_(\d+(?:\.\d+)?)", str(aggregation))
+    if match:
+        q = float(match.group(1)) / 100
+        return "sketch", lambda sketch: sketch.quantile(q)
+
+
+def plan(aggregations):
+    """
+    Collect the aggregations of every column and the intermediates they need. Aggregations that share an
+    intermediate, like the mean and the std, read it once
+    :param aggregations: {col_name: [aggregation]}
+    :return: ({col_name: [intermediate]}, {output_name: (col_name, intermediate, finalize)}, [(col_name, aggregation)])
+    The last value are the aggregations that could not be planned
+    """
+    needed = {}
+    outputs = {}
+    others = []
+    for col_name, _aggregations in aggregations.items():
+        for aggregation in _aggregations:
+            _plan = aggregation_plan(aggregation)
+            if _plan is None:
+                others.append((col_name, aggregation))
+                continue
+            intermediate, finalize = _plan
+            if intermediate not in needed.setdefault(col_name, []):
+                needed[col_name].append(intermediate)
+            outputs[f"{col_name}_{aggregation}"] = (col_name, intermediate, finalize)
+
+    return needed, outputs, others
+
+
+def intermediate_aggregations(dfd, needed, relative_error):
+    """
+    Aggregations that calculate the intermediates of every column
+    :param dfd: Dataframe
+    :param needed: Intermediates by column returned by plan()
+    :param relative_error:
+    :return: {(col_name, intermediate): Aggregation}
+    """
+    functions = intermediates(relative_error)
+    result = {}
+    for col_name, _intermediates in needed.items():
+        series = dfd[col_name]
+        for intermediate in _intermediates:
+            result[(col_name, intermediate)] = Aggregation(series, *functions[intermediate])
+    return result
+
+
+def finalize(partials, outputs):
+    """
+    Calculate the aggregations from the merged intermediates
+    :return: {output_name: value}
+    """
+    return {output_name: function(partials[(col_name, intermediate)])
+            for output_name, (col_name, intermediate, function) in outputs.items()}
+
+
+class GroupedAggregation:
+    """
+    Aggregation with no native groupby implementation. Every engine turns it into its own custom aggregation
+    """
+
+    def __init__(self, name, intermediate, finalize, relative_error):
+        self.name = name
+        self.chunk, self._combine = intermediates(relative_error)[intermediate]
+        self._finalize = finalize
+        self._type = type(self.chunk(pd.Series([], dtype=float)))
+
+    def combine(self, partials):
+        # Dask infers the output of the aggregation passing fake values, so only partials of the right type are merged
+        partials = [partial for partial in partials if isinstance(partial, self._type)]
+        return self._combine(partials) if partials else None
+
+    def finalize(self, partial):
+        return self._finalize(partial) if isinstance(partial, self._type) else np.nan
+
+    def __call__(self, series):
+        return self.finalize(self.chunk(series))
+
+
+def grouped_aggregation(aggregation, relative_error):
+    """
+    Aggregation passed to a groupby. Aggregations the dataframe libraries have are passed by name
+    :param aggregation:
+    :param relative_error:
+    :return: The name or a GroupedAggregation
+    """
+    if aggregation in NATIVE_AGGREGATIONS:
+        return aggregation
+
+    _plan = aggregation_plan(aggregation)
+    return aggregation if _plan is None else GroupedAggregation(aggregation, *_plan, relative_error)
+
+
+def native_grouped_aggregation(aggregation):
+    """
+    groupby method that runs an aggregation exactly in a single dataframe. The median, the percentiles and the count
+    of uniques do not need a sketch when all the rows of a group are in memory
+    :param aggregation: Name or GroupedAggregation
+    :return: (name, q). q is the quantile of the 'quantile' method, or None
+    """
+    name = aggregation.name if isinstance(aggregation, GroupedAggregation) else aggregation
+
+    if name == "nunique_approx":
+        return "nunique", None
+
+    match = re.fullmatch(r"percentile_(\d+(?:\.\d+)?)", str(name))
+    if match:
+        return "quantile", float(match.group(1)) / 100
+    return name, None
+
+
+def groupby_plan(aggregations, relative_error):
+    """
+    Named aggregations of a groupby
+    :param aggregations: {col_name: [aggregation]}
+    :param relative_error:
+    :return: {output_name: (col_name, aggregation)}. See grouped_aggregation()
+    """
+    return {f"{col_name}_{aggregation}": (col_name, grouped_aggregation(aggregation, relative_error))
+            for col_name, _aggregations in aggregations.items() for aggregation in _aggregations}
@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pandas as pd
+from pandas.util import hash_pandas_object
+
+# Row ids are the partition number in the high bits and the position of the row in the partition in the low bits
+POSITION_BITS = 40
+POSITION_MASK = (1 << POSITION_BITS) - 1
+
+# Key of the second hash, 16 characters long. The default key of pandas is used for the first one
+HASH_KEY = "optimusduplicate"
+
+BLOOM_ERROR_RATE = 0.01
+
+
+def row_hashes(pdf, subset, partition=0):
+    """
+    Two 64 bits hashes of the values in subset for every row and the row id. The second hash uses another key and the
+    columns in reverse order, so two different rows getting the same pair of hashes is negligible
+    :param pdf:
+    :param subset:
+    :param partition: Number of the partition of pdf
+    :return: pandas dataframe with the columns _h1, _h2 and _id
+    """
+    return pd.DataFrame({"_h1": hash_pandas_object(pdf[subset], index=False).to_numpy(),
+                         "_h2": hash_pandas_object(pdf[subset[::-1]], index=False, hash_key=HASH_KEY).to_numpy(),
+                         "_id": (np.uint64(partition) << np.uint64(POSITION_BITS)) + np.arange(len(pdf),
+                                                                                             dtype=np.uint64)})
+
+
+def duplicated_ids(hashes, keep="first"):
+    """
+    Ids of the duplicated rows. Rows are ordered by id, so 'first' and 'last' follow the order of the partitions
+    :param hashes: Dataframe returned by row_hashes()
+    :param keep: 'first', 'last' or False
+    :return: pandas series
+    """
+    hashes = hashes.sort_values("_id")
+    return hashes.loc[hashes.duplicated(["_h1", "_h2"], keep=keep), "_id"]
+
+
+def ids_to_mask(ids, length):
+    """
+    Boolean mask of a partition with the rows in ids set to True
+    :param ids: Ids of rows in the partition
+    :param length: Number of rows in the partition
+    :return: numpy array
+    """
+    mask = np.zeros(length, dtype=bool)
+    mask[(np.asarray(ids, dtype=np.uint64) & np.uint64(POSITION_MASK)).astype(np.int64)] = True
+    return mask
+
+
+def bloom_size(n, error_rate=BLOOM_ERROR_RATE):
+    """
+    Bits and number of hashes of a Bloom filter for n values
+    :param n:
+    :param error_rate: Probability of a new value being found in the filter
+    :return: (bits, hashes)
+    """
+    n = max(n, 1)
+    bits = int(math.ceil(-n * math.log(error_rate) / math.log(2) ** 2))
+    return bits, max(int(round(bits / n * math.log(2))), 1)
+
+
+def bloom_duplicated(hashes, bits, k):
+    """
+    Find the rows already added to a Bloom filter or repeated in the same partition, and add the rows to a copy of
+    the filter. Rows not seen before can be found in the filter with a probability equal to its error rate
+    :param hashes: Dataframe returned by row_hashes()
+    :param bits: Filter as a numpy array of uint8
+    :param k: Number of hashes
+    :return: (boolean numpy array, new filter)
+    """
+    m = np.uint64(len(bits) * 8)
+    h1 = hashes["_h1"].to_numpy()
+    h2 = hashes["_h2"].to_numpy()
+
+    # Double hashing. Every row sets k bits
+    positions = (h1[:, None] + np.arange(k, dtype=np.uint64)[None, :] * h2[:, None]) % m
+    index = (positions >> np.uint64(3)).astype(np.int64)
+    offset = (positions & np.uint64(7)).astype(np.uint8)
+
+    found = ((bits[index] >> offset) & 1).all(axis=1)
+    duplicated = hashes.duplicated(["_h1", "_h2"]).to_numpy() | found
+
+    # Repeated indexes set the same bit, so every bit can be set with a single assignment
+    bits = bits.copy()
+    index, offset = index.ravel(), offset.ravel()
+    for bit in range(8):
+        bits[index[offset == bit]] |= np.uint8(1 << bit)
+    return duplicated, bits
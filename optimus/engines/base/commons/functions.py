@@ -1,10 +1,11 @@
 import re
+from collections import Counter
 
 import fastnumbers
 import numpy as np
 import pandas as pd
-from dask_ml.impute import SimpleImputer
 from fastnumbers import isintlike, isfloat, isreal, fast_float, fast_int
+from pandas._libs.tslibs.parsing import guess_datetime_format
 
 # From a top point of view we organize Optimus separating the functions in dataframes and dask engines.
 # Some functions are commons to pandas and dask.
@@ -14,6 +15,12 @@ from optimus.helpers.constants import Actions
 from optimus.helpers.core import val_to_list
 from optimus.infer import is_str
 
+# Number of formats validated against a column when inferring the date format
+DATE_FORMATS_CANDIDATES = 3
+
+# Rows of the sample used to break a tie between date formats before parsing the whole column
+DATE_FORMATS_TIE_SAMPLE = 10000
+
 
 def is_string(series):
     def _is_string(value):
@@ -38,9 +45,37 @@ def is_numeric(series):
     return pd.Series(np.vectorize(isreal)(series).flatten())
 
 
-def word_tokenize(series):
-    import nltk
-    return nltk.word_tokenize(series)
+def split(series, separator, splits):
+    """
+    Split the strings in a pandas series in columns
+    :param series:
+    :param separator: char or regex
+    :param splits: Number of columns. Missing splits are None so every partition has the same columns
+    :return: dataframe with the columns 0 to splits - 1
+    """
+    return series.str.split(separator, expand=True, n=splits - 1).reindex(columns=range(splits))
+
+
+def unnest_array(series, splits):
+    """
+    Split the lists in a pandas series in columns. The lists are converted to a 2D frame at once instead of creating a
+    series for every row
+    :param series:
+    :param splits: Number of columns. Lists with more elements are truncated and missing elements are None
+    :return: dataframe with the columns 0 to splits - 1
+    """
+    values = [value if isinstance(value, (list, tuple, np.ndarray)) else () for value in series]
+    pdf = pd.DataFrame(values, index=series.index)
+    return pdf.reindex(columns=range(splits))
+
+
+def nest_array(pdf):
+    """
+    Merge the columns of a pandas dataframe in a column of lists
+    :param pdf:
+    :return: series of lists
+    """
+    return pd.Series(pdf.to_numpy(dtype=object).tolist(), index=pdf.index, dtype=object)
 
 
 def is_integer_cudf(series):
@@ -129,6 +164,59 @@ def to_datetime(value, format):
     return pd.to_datetime(value, format=format, errors="coerce")
 
 
+def infer_date_formats(values, n=DATE_FORMATS_CANDIDATES):
+    """
+    Guess the format of every value in a sample and return the most common ones
+    :param values: Sample of values
+    :param n: Max number of formats to be returned
+    :return: list of formats in strftime notation
+    """
+    formats = Counter()
+
+    for value in values:
+        if not is_str(value):
+            continue
+        for dayfirst in [False, True]:
+            _format = guess_datetime_format(value, dayfirst=dayfirst)
+            if _format is not None:
+                formats[_format] += 1
+
+    return [_format for _format, _ in formats.most_common(n)]
+
+
+def rank_date_formats(series, formats):
+    """
+    Parse a series with every format and sort the formats by the ratio of values parsed
+    :param series: pandas series
+    :param formats: Candidate formats
+    :return: list of (format, ratio of the not null values that were parsed)
+    """
+    total = series.notnull().sum()
+
+    if total == 0:
+        return []
+
+    ranked = [(_format, to_datetime(series, _format).notnull().sum() / total) for _format in formats]
+    return sorted(ranked, key=lambda x: x[1], reverse=True)
+
+
+def break_date_formats_tie(series, formats):
+    """
+    Keep the formats that parse the most values among the values where the formats disagree, like the dates with a
+    day greater than 12 when the day first and the month first formats are tied
+    :param series: pandas series
+    :param formats: Tied formats
+    :return: list of the formats still tied
+    """
+    parsed = [to_datetime(series, _format) for _format in formats]
+    disagree = pd.Series(False, index=series.index)
+    for _parsed in parsed[1:]:
+        disagree |= ~((_parsed == parsed[0]) | (_parsed.isna() & parsed[0].isna()))
+
+    counts = [_parsed[disagree].notnull().sum() for _parsed in parsed]
+    return [_format for _format, count in zip(formats, counts) if count == max(counts)]
+
+
 def hist(series, bins):
     return np.histogram(series.to_float(), bins=bins)
 
@@ -156,6 +244,7 @@ def impute(df, input_cols, data_type="continuous", strategy="mean", fill_value=N
     :param output_cols:
     :return:
     """
+    from dask_ml.impute import SimpleImputer
 
     imputer = SimpleImputer(strategy=strategy, fill_value=fill_value)
 
@@ -0,0 +1,30 @@
+import pandas as pd
+
+
+def key_dtype(dfd, key):
+    """
+    Data type of a join key. The key can be a column or the name of the index
+    :param dfd:
+    :param key:
+    :return:
+    """
+    return dfd[key].dtype if key in dfd.columns else dfd.index.dtype
+
+
+def key_kind(dtype):
+    """
+    Kind of data of a join key. Keys of the same kind can be joined with their own data types
+    :param dtype:
+    :return: 'bool', 'numeric', 'datetime' or 'string'
+    """
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        return "bool"
+    elif pd.api.types.is_numeric_dtype(dtype):
+        return "numeric"
+    elif pd.api.types.is_datetime64_any_dtype(dtype):
+        return "datetime"
+    return "string"
+
@@ -0,0 +1,68 @@
+import functools
+import re
+import string
+
+from optimus.engines.base.stringclustering import by_distinct
+from optimus.helpers.functions import nltk_resource
+
+# Words, including the ones with inner apostrophes or hyphens like "don't" or "e-mail", and punctuation signs.
+# Compiled once and used by str.findall() so a column is tokenized without calling a Python function per value
+TOKEN_REGEX = re.compile(r"\w+(?:['\-]\w+)*|[^\w\s]")
+
+
+@functools.lru_cache(maxsize=None)
+def stopwords(language="english"):
+    """
+    Set of the NLTK stopwords of a language. The corpus is only loaded once per language
+    :param language:
+    :return: frozenset
+    """
+    from nltk.corpus import stopwords as nltk_stopwords
+
+    nltk_resource("corpora/stopwords")
+    return frozenset(nltk_stopwords.words(language))
+
+
+@by_distinct
+def word_tokenize(series):
+    """
+    Split every distinct value of a pandas series in words and punctuation signs
+    :param series:
+    :return: series of lists
+    """
+    return series.str.findall(TOKEN_REGEX)
+
+
+@by_distinct
+def remove_stopwords(series, stop_words, lower=True):
+    """
+    Lower case the text, split it in words, filter the stopwords and join the remaining words in a single pass over
+    every distinct value. Words are compared without their surrounding punctuation, and joining them with one space
+    also removes the extra whitespace
+    :param series: pandas series
+    :param stop_words: set of words to be removed
+    :param lower: Lower case the text before filtering the words
+    :return:
+    """
+    punctuation = string.punctuation
+
+    def _remove_stopwords(value):
+        if lower:
+            value = value.lower()
+        return " ".join([word for word in value.split() if word.strip(punctuation) not in stop_words])
+
+    return series.map(_remove_stopwords)
+
+
+def remove_stopwords_cudf(series, stop_words, lower=True):
+    """
+    Remove the stopwords from a cuDF series in the GPU. Unlike remove_stopwords(), words are compared with their
+    surrounding punctuation
+    :param series: cuDF series
+    :param stop_words: set of words to be removed
+    :param lower: Lower case the text before filtering the words
+    :return:
+    """
+    if lower:
+        series = series.str.lower()
+    return series.str.replace_tokens(sorted(stop_words), "").str.normalize_spaces()
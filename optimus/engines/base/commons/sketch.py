@@ -0,0 +1,150 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Number of sketches merged at a time when the sketches of all the partitions are combined
+SPLIT_EVERY = 8
+
+
+def sketch_size(relative_error):
+    """
+    Number of points kept by a sketch. relative_error can be the max rank error as a fraction of the number of
+    values (0.001) or, like the Spark percentile_approx accuracy, its inverse (1000). None or 0 keeps every value
+    so the quantiles are exact
+    :param relative_error:
+    :return:
+    """
+    if not relative_error:
+        return None
+    error = 1 / relative_error if relative_error >= 1 else relative_error
+    # Every compaction adds at most total weight / size rank error, and a value goes through two of them, one in its
+    # partition and one when the partitions are merged
+    return max(int(math.ceil(2 / error)), 2)
+
+
+def _compact(values, weights, size):
+    """
+    Reduce sorted weighted values to size points of equal weight placed at evenly spaced ranks
+    :return: values, weights
+    """
+    if size is None or len(values) <= size:
+        return values, weights
+
+    cum_weights = np.cumsum(weights)
+    total = cum_weights[-1]
+    targets = (np.arange(size) + 0.5) * total / size
+    return values[np.searchsorted(cum_weights, targets)], np.full(size, total / size)
+
+
+def _weighted_quantile(values, weights, q):
+    """
+    Quantiles of sorted weighted values. With unit weights it is the same linear interpolation used by
+    pandas.Series.quantile()
+    :return:
+    """
+    cum_weights = np.cumsum(weights)
+    centers = cum_weights - weights / 2
+    return np.interp(np.asarray(q) * (cum_weights[-1] - 1) + 0.5, centers, values)
+
+
+class QuantileSketch:
+    """
+    Mergeable summary of the distribution of a numeric column. It keeps a sorted sample of weighted values so any set
+    of quantiles, the median or the MAD can be answered without reading the data again. The sketches of every
+    partition are built independently and merged, and the rank error of the quantiles is bounded by relative_error.
+    The min and the max are always exact
+    """
+
+    def __init__(self, values, weights, count, min_value, max_value, relative_error):
+        """
+        :param values: Sorted values
+        :param weights: Number of values represented by every value
+        :param count: Number of non null values summarized
+        :param min_value:
+        :param max_value:
+        :param relative_error:
+        """
+        self.values = values
+        self.weights = weights
+        self.count = count
+        self.min = min_value
+        self.max = max_value
+        self.relative_error = relative_error
+
+    @classmethod
+    def from_series(cls, series, relative_error):
+        """
+        Summarize the values of a series. Values that can not be converted to float are ignored
+        :param series:
+        :param relative_error:
+        :return:
+        """
+        if hasattr(series, "to_pandas"):
+            series = series.to_pandas()
+        values = pd.to_numeric(pd.Series(series), errors="coerce").to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        count = len(values)
+        size = sketch_size(relative_error)
+
+        if count == 0:
+            return cls(values, values, 0, np.nan, np.nan, relative_error)
+
+        # np.partition() with thousands of ranks is much slower than sorting the values
+        values = np.sort(values)
+        if size is None or count <= size:
+            return cls(values, np.ones(count), count, values[0], values[-1], relative_error)
+
+        # Same points that _compact() selects from the sorted values
+        ranks = np.ceil((np.arange(size) + 0.5) * count / size).astype(int) - 1
+        return cls(values[ranks], np.full(size, count / size), count, values[0], values[-1], relative_error)
+
+    @classmethod
+    def merge(cls, sketches, relative_error):
+        """
+        Merge the sketches of several partitions
+        :param sketches:
+        :param relative_error:
+        :return:
+        """
+        sketches = [sketch for sketch in sketches if sketch.count > 0]
+        if not sketches:
+            return cls(np.array([]), np.array([]), 0, np.nan, np.nan, relative_error)
+
+        values = np.concatenate([sketch.values for sketch in sketches])
+        weights = np.concatenate([sketch.weights for sketch in sketches])
+        order = np.argsort(values, kind="mergesort")
+        values, weights = _compact(values[order], weights[order], sketch_size(relative_error))
+
+        return cls(values, weights, sum(sketch.count for sketch in sketches),
+                   min(sketch.min for sketch in sketches), max(sketch.max for sketch in sketches), relative_error)
+
+    def quantile(self, q):
+        """
+        :param q: quantile or list of quantiles between 0 and 1
+        :return: value or a dict {quantile: value}. nan if the sketch is empty
+        """
+        if self.count == 0:
+            return np.nan
+
+        quantiles = np.clip(np.asarray(q, dtype=float), 0, 1)
+        result = np.clip(_weighted_quantile(self.values, self.weights, quantiles), self.min, self.max)
+        result = np.where(quantiles == 0, self.min, np.where(quantiles == 1, self.max, result))
+
+        if np.ndim(q) == 0:
+            return float(result)
+        return {_q: float(value) for _q, value in zip(q, result)}
+
+    def mad(self):
+        """
+        Median absolute deviation. It is calculated from the sketch so the data is not read a second time
+        :return: mad, median
+        """
+        if self.count == 0:
+            return np.nan, np.nan
+
+        median = self.quantile(0.5)
+        deviations = np.abs(self.values - median)
+        order = np.argsort(deviations, kind="mergesort")
+        return float(_weighted_quantile(deviations[order], self.weights[order], 0.5)), median
+
@@ -0,0 +1,156 @@
+import functools
+import ipaddress
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Compiled once. Every component is a named group so a column can be split with a single str.extract()
+URL_REGEX = re.compile(r"^(?:(?P<scheme>[a-zA-Z][a-zA-Z0-9+.-]*)://)?"
+                       r"(?:[^@/?#\s]*@)?"
+                       r"(?P<host>\[[^\]/?#\s]*\]|[^:/?#\s]*)"
+                       r"(?::(?P<port>\d+))?"
+                       r"(?P<path>/[^?#]*)?"
+                       r"(?:\?(?P<query>[^#]*))?"
+                       r"(?:#(?P<fragment>.*))?$")
+
+EMAIL_REGEX = re.compile(r"^(?P<username>[^@\s]+)@(?P<domain>[^@\s]+)$")
+
+URL_PARTS = ["scheme", "host", "port", "path", "query", "fragment", "subdomain", "domain", "top_domain"]
+
+
+def _to_str(series):
+    # Keep the missing values instead of casting them to 'None' or 'nan'
+    return series.astype(str).where(series.notnull())
+
+
+def is_ip(host):
+    """
+    Check if a host is an IPv4 or IPv6 address. IPv6 addresses can be enclosed in brackets like in urls
+    :param host:
+    :return:
+    """
+    try:
+        ipaddress.ip_address(host[1:-1] if host.startswith("[") and host.endswith("]") else host)
+        return True
+    except ValueError:
+        return False
+
+
+def split_url(series):
+    """
+    Split a series of urls in its components parsing every value only once
+    :param series:
+    :return: dataframe with the columns scheme, host, port, path, query and fragment
+    """
+    return _to_str(series).str.extract(URL_REGEX, expand=True)
+
+
+def split_email(series):
+    """
+    Split a series of emails in username and domain
+    :param series:
+    :return: dataframe with the columns username and domain
+    """
+    return _to_str(series).str.extract(EMAIL_REGEX, expand=True)
+
+
+class PublicSuffixTrie:
+    """
+    Trie with the rules of the public suffix list (https://publicsuffix.org). The labels of every rule are saved in
+    reverse order so the public suffix of a host is found walking its labels from the right.
+    """
+
+    _END = ""
+
+    def __init__(self, rules):
+        self.root = {}
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            node = self.root
+            for label in reversed(rule.split(".")):
+                node = node.setdefault(label, {})
+            node[self._END] = True
+
+    def suffix_length(self, labels):
+        """
+        Number of labels of the public suffix of a host
+        :param labels: labels of the host
+        :return:
+        """
+        node = self.root
+        length = 0
+        for i, label in enumerate(reversed(labels)):
+            if "!" + label in node:
+                # Exception rules. The label is not part of the suffix
+                return i
+            if label in node:
+                node = node[label]
+            elif "*" in node:
+                node = node["*"]
+            else:
+                break
+            if self._END in node:
+                length = i + 1
+
+        # Rule "*". Any unknown top level domain is a public suffix
+        return max(length, 1)
+
+    def split(self, host):
+        """
+        Split a host in subdomain, registered domain and public suffix
+        From www.bbc.co.uk it returns ("www", "bbc.co.uk", "co.uk"). IP addresses are returned as the domain
+        :param host:
+        :return: (subdomain, domain, top domain)
+        """
+        if not isinstance(host, str) or not host:
+            return None, None, None
+
+        if is_ip(host):
+            return None, host, None
+
+        labels = host.lower().strip(".").split(".")
+        length = self.suffix_length(labels)
+
+        if length >= len(labels):
+            return None, None, ".".join(labels)
+
+        top_domain = ".".join(labels[-length:])
+        domain = ".".join(labels[-length - 1:])
+        subdomain = ".".join(labels[:-length - 1]) or None
+        return subdomain, domain, top_domain
+
+
+@functools.lru_cache(maxsize=1)
+def public_suffix_trie():
+    """
+    Load the public suffix list only once
+    :return:
+    """
+    try:
+        from url_parser.public_suffix_list import PublicSuffixList
+        rules = PublicSuffixList.get_list()
+    except ImportError:
+        warnings.warn("url_parser is not installed. Only the last label of a host is used as its top domain, so "
+                      "domains like bbc.co.uk are not split right")
+        rules = []
+    return PublicSuffixTrie(rules)
+
+
+def split_hosts(series):
+    """
+    Split a pandas series of hosts in subdomain, domain and top domain. Every distinct host is looked up only once
+    :param series:
+    :return: dataframe with the columns subdomain, domain and top_domain
+    """
+    trie = public_suffix_trie()
+    codes, uniques = pd.factorize(series)
+    parts = pd.DataFrame([trie.split(host) for host in uniques], columns=["subdomain", "domain", "top_domain"],
+                         dtype=object)
+    # Missing values have code -1. They are NaN like the missing components returned by split_url()
+    parts = parts.reindex(codes).fillna(np.nan)
+    parts.index = series.index
+    return parts
@@ -1,4 +1,5 @@
 LIMIT = 1000
 LIMIT_TABLE = 10
+BATCH_SIZE = 10000
 NUM_PARTITIONS = 10
 SAMPLE_NUMBER = 10000
\ No newline at end of file
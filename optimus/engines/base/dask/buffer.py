@@ -0,0 +1,99 @@
+from collections import OrderedDict
+
+import dask
+import numpy as np
+import pandas as pd
+
+
+def _to_pandas(pdf):
+    return pdf.to_pandas() if hasattr(pdf, "to_pandas") else pdf
+
+
+class Buffer:
+    """
+    Rows of a Dask dataframe materialized by partitions as windows are requested. The offset of every partition is
+    taken from the partition lengths, so a window only computes the partitions it overlaps
+    """
+
+    def __init__(self, dfd, columns, lengths, n, prefetch=1):
+        """
+        :param dfd: Dask dataframe
+        :param columns: Columns kept in the buffer
+        :param lengths: Rows in every partition of dfd
+        :param n: Max number of rows kept in memory. The partitions of the last window are always kept
+        :param prefetch: Number of pages before and after the window computed with it
+        """
+        self.data = dfd
+        self.columns = columns
+        self.offsets = np.concatenate([[0], np.cumsum(np.asarray(lengths, dtype=np.int64))])
+        self.n = n
+        self.prefetch = prefetch
+        self.blocks = OrderedDict()
+
+    def __len__(self):
+        return int(self.offsets[-1])
+
+    def _partitions(self, lower_bound, upper_bound):
+        """
+        Partitions with rows in [lower_bound, upper_bound). Empty partitions are skipped
+        """
+        return np.flatnonzero((self.offsets[:-1] < upper_bound) & (self.offsets[1:] > lower_bound)).tolist()
+
+    def _rows(self, partitions):
+        return int(sum(self.offsets[i + 1] - self.offsets[i] for i in partitions))
+
+    def _load(self, partitions):
+        """
+        Compute the partitions not materialized yet in a single call
+        """
+        missing = [i for i in partitions if i not in self.blocks]
+
+        if missing:
+            dfd = self.data[self.columns]
+            pdfs = dask.compute(*[dfd.get_partition(i) for i in missing])
+            for i, pdf in zip(missing, pdfs):
+                self.blocks[i] = _to_pandas(pdf)
+
+        for i in partitions:
+            self.blocks.move_to_end(i)
+
+    def _evict(self, keep):
+        """
+        Drop the least recently used partitions until the buffer fits in n rows
+        """
+        rows = sum(len(pdf) for pdf in self.blocks.values())
+        for i in list(self.blocks):
+            if rows <= self.n:
+                break
+            if i not in keep:
+                rows -= len(self.blocks.pop(i))
+
+    def window(self, lower_bound, upper_bound):
+        """
+        Rows in [lower_bound, upper_bound)
+        :param lower_bound:
+        :param upper_bound: If None, the rows until the end of the dataframe
+        :return: pandas dataframe
+        """
+        upper_bound = len(self) if upper_bound is None else min(upper_bound, len(self))
+        lower_bound = min(lower_bound, upper_bound)
+
+        partitions = self._partitions(lower_bound, upper_bound)
+        # Neighbour pages are computed with the window, as long as they fit in the buffer
+        page = max(upper_bound - lower_bound, 1) * self.prefetch
+        keep = list(partitions)
+        for i in self._partitions(lower_bound - page, upper_bound + page):
+            if i not in keep and self._rows(keep + [i]) <= self.n:
+                keep.append(i)
+
+        self._load(keep)
+        self._evict(keep)
+
+        if not partitions:
+            return _to_pandas(self.data[self.columns]._meta)
+
+        pdfs = []
+        for i in partitions:
+            offset = int(self.offsets[i])
+            pdfs.append(self.blocks[i].iloc[max(lower_bound - offset, 0): upper_bound - offset])
+        return pd.concat(pdfs) if len(pdfs) > 1 else pdfs[0]
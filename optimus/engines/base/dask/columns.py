@@ -6,7 +6,7 @@ from sklearn.preprocessing import MinMaxScaler
 
 from optimus.engines.base.columns import BaseColumns
 from optimus.engines.base.meta import Meta
-from optimus.helpers.columns import parse_columns, get_output_cols, name_col
+from optimus.helpers.columns import parse_columns, get_output_cols
 from optimus.helpers.constants import Actions
 from optimus.infer import is_dict, is_list_value
 from optimus.profiler.functions import fill_missing_var_types
@@ -160,60 +160,3 @@ class DaskBaseColumns(BaseColumns):
             result = self.parse_profiler_dtypes(result)
 
         return result
-
-    def nest(self, input_cols, separator="", output_col=None, drop=False, shape="string"):
-        """
-        Merge multiple columns with the format specified
-        :param input_cols: columns to be nested
-        :param separator: char to be used as separator at the concat time
-        :param shape: final data type, 'array', 'string' or 'vector'
-        :param output_col:
-        :return: Dask DataFrame
-        """
-
-        df = self.root
-        input_cols = parse_columns(df, input_cols)
-        # output_col = val_to_list(output_col)
-        # check_column_numbers(input_cols, 2)
-        if output_col is None:
-            output_col = name_col(input_cols)
-            # RaiseIt.type_error(output_col, ["str"])
-
-        # output_col = parse_columns(df, output_col, accepts_missing_cols=True)
-
-        output_ordered_columns = df.cols.names()
-
-        def _nest_string(row):
-            v = row[input_cols[0]].astype(str)
-            for i in range(1, len(input_cols)):
-                v = v + separator + row[input_cols[i]].astype(str)
-            return v
-
-        def _nest_array(row):
-            # https://stackoverflow.com/questions/43898035/pandas-combine-column-values-into-a-list-in-a-new-column/43898233
-            # t['combined'] = t.values.tolist()
-
-            v = row[input_cols[0]].astype(str)
-            for i in range(1, len(input_cols)):
-                v += ", " + row[input_cols[i]].astype(str)
-            return "[" + v + "]"
-
-        if shape == "string":
-            kw_columns = {output_col: _nest_string}
-        else:
-            kw_columns = {output_col: _nest_array}
-
-        dfd = df.cols.assign(kw_columns).data
-
-        if output_col not in output_ordered_columns:
-            col_index = output_ordered_columns.index(input_cols[-1]) + 1
-            output_ordered_columns[col_index:col_index] = [output_col]
-
-        meta = Meta.action(df.meta, Actions.NEST.value, list(kw_columns.values()))
-
-        if drop is True:
-            for input_col in input_cols:
-                if input_col in output_ordered_columns and input_col != output_col:
-                    output_ordered_columns.remove(input_col)
-
-        return self.root.new(dfd, meta).cols.select(output_ordered_columns)
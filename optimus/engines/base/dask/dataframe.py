@@ -1,15 +1,27 @@
 from abc import abstractmethod
 
 import dask
+import dask.dataframe as dd
 import humanize
-from dask.distributed import Variable
+import numpy as np
+import pandas as pd
+from dask.dataframe.methods import concat
+from dask.dataframe.shuffle import rearrange_by_column
 from dask.utils import parse_bytes
 
 from optimus.engines.base.basedataframe import BaseDataFrame
+from optimus.engines.base.dask.buffer import Buffer
+from optimus.engines.base.dask.partitions import PARTITION_SAMPLES, coalesce_groups, partition_stats, \
+    partitions_count, row_bytes
+from optimus.engines.base.meta import Meta
+from optimus.engines.base.commons.aggregations import GroupedAggregation
+from optimus.engines.base.commons.duplicates import POSITION_BITS, bloom_duplicated, bloom_size, duplicated_ids, \
+    ids_to_mask, row_hashes
 from optimus.engines.pandas.dataframe import PandasDataFrame
+from optimus.helpers.constants import BROADCAST_JOIN_SIZE, PARTITION_SIZE
 from optimus.helpers.functions import random_int
 from optimus.helpers.raiseit import RaiseIt
-from optimus.infer import is_one_element
+from optimus.infer import is_one_element, is_str
 
 
 class DaskBaseDataFrame(BaseDataFrame):
@@ -34,6 +46,163 @@ class DaskBaseDataFrame(BaseDataFrame):
                         kw_columns[key] = _dfd[0]
         return dfd.assign(**kw_columns)
 
+    @staticmethod
+    def _join(dfd_left, dfd_right, how, left_on, right_on, suffixes, broadcast=None):
+        """
+        Merge two Dask dataframes. If both are indexed by the key with known divisions the partitions are merged
+        side by side. With broadcast, the smaller dataframe is merged whole with every partition of the other one.
+        If not, both are shuffled
+        :param broadcast: True to broadcast, False to shuffle. None only broadcasts a dataframe with a single partition
+        """
+        if dfd_left.index.name == left_on and dfd_right.index.name == right_on and \
+                dfd_left.known_divisions and dfd_right.known_divisions:
+            return dfd_left.merge(dfd_right, how=how, left_index=True, right_index=True, suffixes=suffixes)
+
+        # A single partition dataframe is merged with every partition of the other one without a shuffle. It can only
+        # be the right dataframe in a left join and the left dataframe in a right join
+        small = {"left": "right", "right": "left", "inner": "right"}.get(how)
+        if small is not None and broadcast is not False:
+            dfd_small = dfd_right if small == "right" else dfd_left
+            if broadcast is True and dfd_small.npartitions > 1:
+                dfd_small = dfd_small.repartition(npartitions=1)
+            if dfd_small.npartitions == 1:
+                if small == "right":
+                    dfd_right = dfd_small
+                else:
+                    dfd_left = dfd_small
+
+        return dfd_left.merge(dfd_right, how=how, left_on=left_on, right_on=right_on, suffixes=suffixes)
+
+    def _fits_broadcast(self):
+        """
+        The size is estimated from the rows count and the memory of the leading rows of a few partitions, so only the
+        sampled partitions are computed. The rows count in the meta data is used if it is known
+        """
+        if self.data.npartitions == 1:
+            return True
+
+        return self.rows.approx_count() * row_bytes(self._sampled_stats()) <= BROADCAST_JOIN_SIZE
+
+    def _sampled_stats(self, n=PARTITION_SAMPLES):
+        """
+        partition_stats() of up to n partitions spread over the dataframe. They are cached until the data changes
+        :param n: Number of partitions sampled
+        :return: List of tuples returned by partition_stats()
+        """
+
+        def _compute():
+            partitions = self.data.to_delayed()
+            indices = sorted({int(i) for i in np.linspace(0, len(partitions) - 1, min(n, len(partitions)))})
+            return list(dask.compute(*[dask.delayed(partition_stats)(partitions[i]) for i in indices]))
+
+        return self._cached("sampled_stats", _compute)
+
+    def _groupby_agg(self, by, aggregations, split_out=None):
+        """
+        Dask reduces every partition and merges the results in a tree. Aggregations with no native implementation
+        are turned into custom Dask aggregations that merge their partials the same way. With split_out the groups
+        are spread over several partitions, so a result with many groups does not end in a single task
+        """
+
+        def _aggregation(aggregation):
+            if not isinstance(aggregation, GroupedAggregation):
+                return aggregation
+
+            return dd.Aggregation(aggregation.name,
+                                  chunk=lambda grouped: grouped.apply(aggregation.chunk),
+                                  agg=lambda grouped: grouped.apply(aggregation.combine),
+                                  finalize=lambda partials: partials.map(aggregation.finalize))
+
+        aggregations = {output_name: (col_name, _aggregation(aggregation))
+                        for output_name, (col_name, aggregation) in aggregations.items()}
+        return self.data.groupby(by).agg(split_out=split_out or 1, **aggregations)
+
+    def _duplicated(self, subset, keep="first", approx=False):
+        """
+        Hash the subset columns in every partition and shuffle only the hashes and row ids, so the rows are not moved.
+        The ids of the duplicated rows are computed and sent back to their partitions to build the mask. With approx, a Bloom
+        filter is passed through the partitions in order instead, so nothing is shuffled but only keep='first' is
+        supported and a few unique rows can be marked as duplicated
+        """
+        dfd = self.data
+        npartitions = dfd.npartitions
+        partitions = dfd.to_delayed()
+        hashes = [dask.delayed(row_hashes)(partition, subset, i) for i, partition in enumerate(partitions)]
+
+        if approx:
+            if keep != "first":
+                RaiseIt.value_error(keep, ["first"])
+
+            bits, k = bloom_size(sum(self._partition_lengths()))
+            bloom = dask.delayed(np.zeros)((bits + 7) // 8, dtype=np.uint8)
+            masks = []
+            for _hashes in hashes:
+                mask, bloom = dask.delayed(bloom_duplicated, nout=2)(_hashes, bloom, k)
+                masks.append(mask)
+        else:
+            def _assign_partition(pdf, column, shift=0):
+                return pdf.assign(_partitions=((pdf[column].to_numpy() >> np.uint64(shift)) % np.uint64(
+                    npartitions)).astype(np.int64))
+
+            def _duplicated_ids(pdf):
+                return _assign_partition(duplicated_ids(pdf, keep).to_frame(), "_id", POSITION_BITS)
+
+            meta = row_hashes(dfd._meta, subset)
+            dfd_hashes = dd.from_delayed(hashes, meta=meta).map_partitions(_assign_partition, "_h1",
+                                                                           meta=meta.assign(_partitions=0))
+            dfd_hashes = rearrange_by_column(dfd_hashes, "_partitions", npartitions=npartitions, shuffle="tasks")
+
+            # Only the ids of the duplicated rows go back to the partition of the row
+            dfd_ids = dfd_hashes.map_partitions(_duplicated_ids, meta=meta[["_id"]].assign(_partitions=0))
+            dfd_ids = rearrange_by_column(dfd_ids, "_partitions", npartitions=npartitions, shuffle="tasks")
+            masks = [dask.delayed(ids_to_mask)(ids["_id"], dask.delayed(len)(partition))
+                     for ids, partition in zip(dfd_ids.to_delayed(), partitions)]
+
+        def _to_series(pdf, mask):
+            return pd.Series(mask, index=pdf.index)
+
+        return dd.from_delayed([dask.delayed(_to_series)(partition, mask) for partition, mask in zip(partitions, masks)],
+                               meta=pd.Series(dtype=bool), divisions=dfd.divisions)
+
+    def _head(self, columns, n):
+        """
+        Compute the partitions one by one until there are n rows, so a preview only runs the graph of the first
+        partitions. The rows count is estimated from the length of the partitions read unless all were read. If the
+        partition lengths are known, the partitions needed are computed in a single call
+        """
+        dfd = self.cols.select(columns).data
+
+        lengths = Meta.get(self.meta, "rows.partition_lengths")
+        if lengths is not None and len(lengths) == dfd.npartitions:
+            # The partitions needed are known, so they are computed together
+            needed = int(np.searchsorted(np.cumsum(lengths), n)) + 1 if n > 0 else 0
+            pdfs = dask.compute(*[dfd.get_partition(i) for i in range(min(needed, dfd.npartitions))]) or [dfd._meta]
+            pdf = pd.concat([pdf.to_pandas() if hasattr(pdf, "to_pandas") else pdf for pdf in pdfs]).head(n)
+            return pdf, sum(lengths), True
+
+        pdfs = []
+        rows = 0
+        lengths = []
+
+        for i in range(dfd.npartitions):
+            partition = dfd.get_partition(i)
+            pdf, partition_length = dask.compute(partition.head(n - rows, npartitions=1, compute=False),
+                                                 partition.map_partitions(len))
+            if hasattr(pdf, "to_pandas"):
+                pdf = pdf.to_pandas()
+            pdfs.append(pdf)
+            rows += len(pdf)
+            lengths.append(int(partition_length.sum()))
+            if rows >= n:
+                break
+
+        pdf = pd.concat(pdfs) if len(pdfs) > 1 else pdfs[0]
+
+        if len(lengths) == dfd.npartitions:
+            self.meta = Meta.set(self.meta, "rows", {"count": sum(lengths), "partition_lengths": lengths})
+            return pdf, sum(lengths), True
+        return pdf, int(round(sum(lengths) / len(lengths) * dfd.npartitions)), False
+
     @staticmethod
     @abstractmethod
     def _base_to_dfd(df, n_partitions):
@@ -67,19 +236,14 @@ class DaskBaseDataFrame(BaseDataFrame):
 
         return f"{df_schema}, {df_data}"
 
-    def _reset_buffer(self):
-        if self.buffer:
-            Variable(self.buffer).delete()
-            self.buffer = None
+    def _compute_partition_lengths(self):
+        return self.data.map_partitions(len).compute()
 
-    def get_buffer(self):
-        return Variable(self.buffer).get() if self.buffer else None
+    def _create_buffer(self, input_cols, n):
+        return Buffer(self.data, input_cols, self._partition_lengths(), n)
 
     def _buffer_window(self, input_cols, lower_bound, upper_bound):
-        def func(value):
-            return value[lower_bound:upper_bound]
-
-        return PandasDataFrame(self.data[input_cols].partitions[0].map_partitions(func).compute())
+        return PandasDataFrame(self.get_buffer().window(lower_bound, upper_bound)[input_cols])
 
     def sample(self, n=10, random=False):
         """
@@ -182,25 +346,73 @@ class DaskBaseDataFrame(BaseDataFrame):
         print("Dask not support custom partitioner")
         raise NotImplementedError
 
-    def repartition(self, n=None, *args, **kwargs):
-        dfd = self.data
-        df = self
+    def repartition(self, n=None, partition_size=PARTITION_SIZE, *args, **kwargs):
+        """
+        Change the number of partitions
+        :param n: Number of partitions. 'auto' fits every partition to partition_size bytes in memory
+        :param partition_size: Target size of a partition in bytes or as a string like '128MB'. Only used with 'auto'
+        :return:
+        """
         if n == "auto":
-            # Follow a heuristic for partitioning a mentioned
-            # https://docs.dask.org/en/latest/best-practices.html#avoid-very-large-partitions
-            client = dask.distributed.get_client()
-            worker_memory = parse_bytes(client.cluster.worker_spec[0]["options"]["memory_limit"])
-            nthreads = client.cluster.worker_spec[0]["options"]["nthreads"]
+            return self._auto_repartition(partition_size)
 
-            part_recommended_size = worker_memory / nthreads / 10
-            n = int(df.size() / part_recommended_size)
+        dfd = self.data.repartition(npartitions=n, *args, **kwargs)
+        return self.new(dfd, meta=Meta.reset(self.meta, "rows.partition_lengths"))
 
-            # Partition can not be lower than 1
-            n = n if n < 0 else 1
-            # TODO .repartition(partition_size="100MB"). https://stackoverflow.com/questions/44657631/strategy-for-partitioning-dask-dataframes-efficiently
-        dfd = dfd.repartition(npartitions=n, *args, **kwargs)
+    def _auto_repartition(self, partition_size=PARTITION_SIZE, coalesce_only=False, estimate=False,
+                          filtered_rows=None):
+        """
+        Fit the partitions to partition_size bytes in memory. The memory of a row is measured on the leading rows of
+        every partition, including the memory held by strings, so it does not depend on a distributed client
+        :param partition_size: Target size of a partition in bytes or as a string like '128MB'
+        :param coalesce_only: Only join partitions, and only if they use less than half of partition_size. Used after
+        filters
+        :param estimate: Only read the first partition and expect the others to be alike. Used after loading a file
+        :param filtered_rows: Rows before a filter. The filtered data is persisted, so it is not computed again, and
+        the partitions are only joined if the filter removed at least half of the rows
+        :return:
+        """
+        partition_size = parse_bytes(partition_size) if is_str(partition_size) else partition_size
+        df = self
+        if filtered_rows is not None:
+            df = self.new(self.data.persist(), meta=self.meta)
+        dfd = df.data
+        npartitions = dfd.npartitions
+        partitions = dfd.to_delayed()
+
+        if estimate:
+            stats = dask.compute(dask.delayed(partition_stats)(partitions[0]))
+            lengths = [stats[0][0]] * npartitions
+        else:
+            stats = dask.compute(*[dask.delayed(partition_stats)(partition) for partition in partitions])
+            lengths = [length for length, _, _ in stats]
+            df.meta = Meta.set(df.meta, "rows", {"count": sum(lengths), "partition_lengths": lengths})
+
+        if filtered_rows is not None and sum(lengths) * 2 > filtered_rows:
+            return df
+
+        n = partitions_count(sum(lengths), row_bytes(stats), partition_size)
+
+        if n * 2 <= npartitions or (n < npartitions and not coalesce_only):
+            if estimate:
+                dfd = dfd.repartition(npartitions=n)
+                return df.new(dfd, meta=Meta.reset(df.meta, "rows.partition_lengths"))
+
+            # The rows in every partition are known, so adjacent partitions are joined without moving any row
+            groups = coalesce_groups(lengths, n)
+            divisions = None
+            if dfd.known_divisions:
+                divisions = [dfd.divisions[start] for start, _ in groups] + [dfd.divisions[-1]]
+            dfd = dd.from_delayed([dask.delayed(concat)(partitions[start:stop]) for start, stop in groups],
+                                  meta=dfd._meta, divisions=divisions)
+            lengths = [sum(lengths[start:stop]) for start, stop in groups]
+            return df.new(dfd, meta=Meta.set(df.meta, "rows", {"count": sum(lengths), "partition_lengths": lengths}))
+
+        elif n > npartitions and not coalesce_only:
+            dfd = dfd.repartition(npartitions=n)
+            return df.new(dfd, meta=Meta.reset(df.meta, "rows.partition_lengths"))
 
-        return self.new(dfd, meta=self.meta)
+        return df
 
     @staticmethod
     def debug():
@@ -1,3 +1,8 @@
+import csv
+import io
+import time
+
+import dask
 import numpy as np
 import pandas as pd
 import sqlalchemy as sa
@@ -10,10 +15,11 @@ from sqlalchemy.sql import elements
 # Optimus plays defensive with the number of rows to be retrieved from the server so if a limit is not specified it will
 # only will retrieve the LIMIT value
 from optimus.engines.dask.dataframe import DaskDataFrame
-from optimus.engines.base.contants import NUM_PARTITIONS, LIMIT_TABLE
+from optimus.engines.base.contants import NUM_PARTITIONS, LIMIT_TABLE, BATCH_SIZE
 from optimus.engines.base.io.driver_context import DriverContext
 from optimus.engines.base.io.factory import DriverFactory
 from optimus.engines.spark.io.properties import DriverProperties
+from optimus.helpers.check import is_dask_dataframe
 from optimus.helpers.core import val_to_list
 from optimus.helpers.logger import logger
 from optimus.helpers.raiseit import RaiseIt
@@ -99,7 +105,7 @@ class DaskBaseJDBC:
         # return df.display(limit)
 
         engine = create_engine(self.uri)
-        return engine.table_names()
+        return sa.inspect(engine).get_table_names()
 
     @property
     def table(self):
@@ -164,6 +170,9 @@ class DaskBaseJDBC:
         # else:
         #     query = "(" + query + ") AS t"
 
+        if limit is not None and limit != "all":
+            query = f"SELECT * FROM ({query}) AS query LIMIT {int(limit)}"
+
         # df = dd.read_sql_table(table='test_data', uri=self.url, index_col='id')
         # "SELECT table_name, table_rows FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = 'optimus'"
         df = DaskBaseJDBC.read_sql_table(table_name=table_name, uri=self.uri, index_col=partition_column,
@@ -218,7 +227,7 @@ class DaskBaseJDBC:
 
         # print("table", table)
         if isinstance(table_name, str):
-            table_name = sa.Table(table_name, m, autoload=True, autoload_with=engine, schema=schema)
+            table_name = sa.Table(table_name, m, autoload_with=engine, schema=schema)
 
             columns = (
                 [(table_name.columns[c] if isinstance(c, str) else c) for c in columns]
@@ -391,31 +400,153 @@ class DaskBaseJDBC:
             # df.reset_index()
             return df.astype(meta.dtypes.to_dict(), copy=False)
 
-    def df_to_table(self, df, table, mode="overwrite"):
+    def df_to_table(self, df, table, mode="overwrite", batch_size=BATCH_SIZE, key_columns=None):
         """
-        Send a spark to the database
-        :param df:
-        :param table:
-        :param mode
-        :return:
+        Send a dataframe to the database. Every partition is written in parallel using the fastest path supported by
+        the driver: COPY FROM STDIN for PostgreSQL and batched executemany inside a transaction for the rest.
+        :param df: Optimus dataframe
+        :param table: Table name
+        :param mode: 'append', 'overwrite' or 'upsert'
+        :param batch_size: Number of rows sent to the database in every batch
+        :param key_columns: Columns used to match the rows to be updated in 'upsert' mode. They must be a primary key
+        or a unique index in the table
+        :return: dict with the rows written, the elapsed seconds and the rows per second
         """
+        modes = ["append", "overwrite", "upsert"]
+        if mode not in modes:
+            RaiseIt.value_error(mode, modes)
+
+        if mode == "upsert":
+            if key_columns is None:
+                RaiseIt.value_error(key_columns, ["str", "list"], "key_columns must be specified in 'upsert' mode")
+            key_columns = val_to_list(key_columns)
+
         # Parse array and vector to string. JDBC can not handle this data types
         columns = df.cols.names("*", by_dtypes=["array", "vector"])
-        df = df.cols.cast(columns, "str")
-
-        conf = df.write \
-            .format(
-            "jdbc" if not self.db_driver == DriverProperties.CASSANDRA.value["name"] else
-            DriverProperties.CASSANDRA.value["java_class"]) \
-            .mode(mode) \
-            .option("url", self.uri) \
-            .option("dbtable", table) \
-            .option("user", self.user) \
-            .option("password", self.password)
-
-        if self.db_driver == DriverProperties.ORACLE.value["name"]:
-            conf.option("driver", self.driver_option)
-        conf.save()
+        if columns:
+            df = df.cols.cast(columns, "str")
+
+        start_time = time.time()
+
+        dfd = df.data
+        if is_dask_dataframe(dfd):
+            meta = dfd._meta
+            partitions = dfd.to_delayed()
+        else:
+            meta = dfd.iloc[:0]
+            partitions = [dfd]
+
+        # Create the table in the driver so every partition only need to append to it
+        engine = sa.create_engine(self.uri)
+        if mode == "overwrite" or not sa.inspect(engine).has_table(table):
+            meta.to_sql(table, engine, index=False, if_exists="replace")
+
+            if mode == "upsert":
+                db_table = sa.Table(table, sa.MetaData(), autoload_with=engine)
+                sa.Index(f"{table}_{'_'.join(key_columns)}_key", *[db_table.columns[c] for c in key_columns],
+                         unique=True).create(engine)
+        engine.dispose()
+
+        write = delayed(DaskBaseJDBC._write_partition)
+        parts = [write(part, self.uri, table, self.db_driver, mode, batch_size, key_columns) for part in partitions]
+
+        # SQLite only support one writer at a time
+        scheduler = "single-threaded" if self.db_driver == DriverProperties.SQLITE.value["name"] else None
+        rows = sum(dask.compute(*parts, scheduler=scheduler))
+
+        elapsed = time.time() - start_time
+        result = {"rows": rows, "seconds": round(elapsed, 2),
+                  "rows_per_second": round(rows / elapsed, 2) if elapsed > 0 else rows}
+        logger.print(f"{rows} rows written to {table} in {result['seconds']} seconds "
+                     f"({result['rows_per_second']} rows/s)")
+
+        return result
+
+    @staticmethod
+    def _write_partition(pdf, uri, table, driver, mode, batch_size, key_columns=None, engine_kwargs=None):
+        """
+        Write a pandas dataframe to a table inside a single transaction
+        :return: the number of rows written
+        """
+        if pdf.empty:
+            return 0
+
+        if mode == "upsert":
+            method = DaskBaseJDBC._upsert_method(driver, key_columns)
+        elif driver == DriverProperties.POSTGRESQL.value["name"]:
+            method = DaskBaseJDBC._copy_from_stdin
+        else:
+            # Use executemany in batches of batch_size rows
+            method = None
+
+        engine_kwargs = engine_kwargs or {}
+        engine = sa.create_engine(uri, **engine_kwargs)
+        try:
+            with engine.begin() as conn:
+                pdf.to_sql(table, conn, index=False, if_exists="append", chunksize=batch_size, method=method)
+        finally:
+            engine.dispose()
+
+        return len(pdf)
+
+    @staticmethod
+    def _copy_from_stdin(pd_table, conn, keys, data_iter):
+        """
+        Insert method for pandas to_sql that use PostgreSQL COPY FROM STDIN
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(data_iter)
+        buffer.seek(0)
+
+        preparer = conn.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(k) for k in keys)
+        table_name = preparer.format_table(pd_table.table)
+
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH CSV", buffer)
+
+    @staticmethod
+    def _upsert_method(driver, key_columns):
+        """
+        Return an insert method for pandas to_sql that update the rows that match the key columns
+        :param driver: Driver name
+        :param key_columns: Columns used to match the rows
+        :return:
+        """
+
+        def _upsert(pd_table, conn, keys, data_iter):
+            db_table = pd_table.table
+            rows = [dict(zip(keys, row)) for row in data_iter]
+            update_columns = [k for k in keys if k not in key_columns]
+
+            if driver in [DriverProperties.POSTGRESQL.value["name"], DriverProperties.SQLITE.value["name"]]:
+                if driver == DriverProperties.POSTGRESQL.value["name"]:
+                    from sqlalchemy.dialects.postgresql import insert
+                else:
+                    from sqlalchemy.dialects.sqlite import insert
+
+                stmt = insert(db_table)
+                if update_columns:
+                    stmt = stmt.on_conflict_do_update(index_elements=key_columns,
+                                                      set_={k: stmt.excluded[k] for k in update_columns})
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=key_columns)
+                conn.execute(stmt, rows)
+
+            elif driver == DriverProperties.MYSQL.value["name"]:
+                from sqlalchemy.dialects.mysql import insert
+
+                stmt = insert(db_table)
+                stmt = stmt.on_duplicate_key_update({k: stmt.inserted[k] for k in (update_columns or key_columns)})
+                conn.execute(stmt, rows)
+
+            else:
+                # Generic path. Delete the matching rows and insert them again in the same transaction
+                where = sql.and_(*[db_table.columns[k] == sql.bindparam(f"_{k}") for k in key_columns])
+                conn.execute(db_table.delete().where(where), [{f"_{k}": row[k] for k in key_columns} for row in rows])
+                conn.execute(db_table.insert(), rows)
+
+        return _upsert
 
     @staticmethod
     def _limit(df, limit=None):
@@ -0,0 +1,60 @@
+import math
+
+# Rows of every partition used to measure the memory of a row
+PARTITION_SAMPLE_ROWS = 1000
+
+# Partitions sampled to estimate the size of a dataframe
+PARTITION_SAMPLES = 3
+
+
+def partition_stats(pdf, sample_rows=PARTITION_SAMPLE_ROWS):
+    """
+    Rows in a partition and memory used by its leading rows
+    :param pdf: Partition
+    :param sample_rows: Number of leading rows measured
+    :return: (rows, sampled rows, bytes of the sampled rows)
+    """
+    sample = pdf.head(sample_rows)
+    return len(pdf), len(sample), int(sample.memory_usage(index=True, deep=True).sum())
+
+
+def row_bytes(stats):
+    """
+    Mean memory in bytes of a row, including the memory held by strings and other objects
+    :param stats: List of tuples returned by partition_stats()
+    :return:
+    """
+    rows = sum(sampled for _, sampled, _ in stats)
+    return sum(size for _, _, size in stats) / rows if rows else 0
+
+
+def partitions_count(rows, row_size, partition_size):
+    """
+    Number of partitions needed to keep every partition under partition_size bytes in memory
+    :param rows: Number of rows in the dataframe
+    :param row_size: Mean bytes of a row
+    :param partition_size: Target size in bytes of a partition
+    :return:
+    """
+    return max(1, int(math.ceil(rows * row_size / partition_size)))
+
+
+def coalesce_groups(lengths, n):
+    """
+    Group consecutive partitions in up to n groups with about the same number of rows. Partitions are never split
+    :param lengths: Rows in every partition
+    :param n: Number of groups wanted
+    :return: List of (start, stop) ranges of partitions
+    """
+    total = sum(lengths)
+    groups = []
+    rows = 0
+    for i, length in enumerate(lengths):
+        # Every partition goes to the group where the middle of its rows falls
+        group = min(n - 1, int((rows + length / 2) * n / total)) if total else 0
+        if group == len(groups) - 1:
+            groups[-1] = (groups[-1][0], i + 1)
+        else:
+            groups.append((i, i + 1))
+        rows += length
+    return groups
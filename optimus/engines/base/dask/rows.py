@@ -1,8 +1,10 @@
 import functools
 import operator
 
-import dask.array as da
 import dask.dataframe as dd
+import numpy as np
+import pandas as pd
+from dask.dataframe.shuffle import rearrange_by_column
 from dask.delayed import delayed
 from multipledispatch import dispatch
 
@@ -14,6 +16,9 @@ from optimus.helpers.core import val_to_list, one_list_to_val
 from optimus.helpers.raiseit import RaiseIt
 from optimus.infer import is_list_of_str_or_int, is_list_value
 
+# Values of the first sort column sampled from every partition to find the partitions boundaries
+SORT_SAMPLE_SIZE = 1000
+
 
 class DaskBaseRows(BaseRows):
     """Base class for all Rows implementations"""
@@ -33,18 +38,71 @@ class DaskBaseRows(BaseRows):
         return dd.from_delayed(ds)
 
     def _sort(self, dfd, col_name, ascending):
-        dfd = dfd.set_index(col_name)
-        if not ascending:
-            dfd = self._reverse(dfd)
-        return dfd.reset_index()[self.root.cols.names()]
+        """
+        Range partition the rows by the first column, using boundaries taken from a sample, move every row to its
+        partition in a single shuffle and sort every partition by all the columns
+        """
+        col_name = val_to_list(col_name)
+        if not is_list_value(ascending):
+            ascending = [ascending] * len(col_name)
+
+        def _sort_partition(pdf):
+            return pdf.sort_values(col_name, ascending=ascending)
+
+        npartitions = dfd.npartitions
+        if npartitions == 1:
+            return dfd.map_partitions(_sort_partition, meta=dfd._meta)
+
+        key = col_name[0]
+
+        @delayed
+        def _sample(series):
+            series = series.dropna()
+            return series.sample(min(len(series), SORT_SAMPLE_SIZE), random_state=0)
+
+        @delayed
+        def _boundaries(samples):
+            values = pd.concat(samples).sort_values().to_numpy()
+            if len(values) == 0:
+                return values
+            return values[np.linspace(0, len(values) - 1, npartitions + 1)[1:-1].round().astype(int)]
+
+        boundaries = _boundaries([_sample(part) for part in dfd[key].to_delayed()]).compute()
+
+        def _assign_partition(pdf):
+            values = pdf[key]
+            nulls = values.isna().to_numpy()
+            # Nulls are sorted last in ascending and descending order
+            partitions = np.full(len(pdf), npartitions - 1)
+            positions = np.searchsorted(boundaries, values[~nulls].to_numpy(), side="right")
+            partitions[~nulls] = positions if ascending[0] else len(boundaries) - positions
+            return pdf.assign(_partitions=partitions)
+
+        dfd = dfd.map_partitions(_assign_partition, meta=dfd._meta.assign(_partitions=0))
+        # The task based shuffle sends every row to the partition in _partitions with any scheduler
+        dfd = rearrange_by_column(dfd, "_partitions", npartitions=npartitions, shuffle="tasks")
+
+        return dfd.map_partitions(lambda pdf: _sort_partition(pdf.drop(columns="_partitions")), meta=dfd._meta.drop(
+            columns="_partitions"))
 
     def create_id(self, column="id"):
-        # Reference https://github.com/dask/dask/issues/1426
-        dfd = self.root.data
-        # print(dfd)
-        a = da.arange(dfd.divisions[-1] + 1, chunks=dfd.divisions[1:])
-        dfd[column] = dd.from_dask_array(a)
-        return dfd
+        """
+        Create a column with the position of every row. The first position of every partition is taken from the
+        partition lengths, so the index does not need to be sorted
+        :param column:
+        :return:
+        """
+        df = self.root
+        dfd = df.data
+        offsets = np.cumsum([0] + df._partition_lengths()[:-1])
+
+        def _create_id(pdf, offset):
+            return pdf.assign(**{column: np.arange(offset, offset + len(pdf))})
+
+        partitions = [delayed(_create_id)(part, offset) for part, offset in zip(dfd.to_delayed(), offsets)]
+        dfd = dd.from_delayed(partitions, meta=dfd._meta.assign(**{column: np.int64(0)}), divisions=dfd.divisions)
+        meta = Meta.action(df.meta, Actions.SET.value, column)
+        return self.root.new(dfd, meta=meta)
 
     def append(self, dfs, names_map=None):
         """
@@ -105,14 +163,20 @@ class DaskBaseRows(BaseRows):
         :return:
         """
         df = self.root
-        # Reference https://stackoverflow.com/questions/49139371/slicing-out-a-few-rows-from-a-dask-dataframe
 
         if count is None:
             return df
 
-        partitions = df.partitions()
+        # Only the leading partitions with the first count rows are computed
+        pdf, total_rows, _ = df._head("*", count)
+        rows_per_partition = max(total_rows / df.partitions(), 1)
+        partitions = max(int(np.ceil(len(pdf) / rows_per_partition)), 1)
 
-        return self.root.new(self.root._base_to_dfd(df.cols.select("*").data.head(count), partitions))
+        # The rows position is used as index so the divisions are known
+        dfd = df._base_to_dfd(pdf.reset_index(drop=True), partitions)
+        meta = Meta.action(df.meta, Actions.LIMIT_ROW.value, df.cols.names())
+        meta = Meta.set(meta, "rows.count", len(pdf))
+        return self.root.new(dfd, meta=meta)
 
     def between_index(self, columns, lower_bound=None, upper_bound=None):
         """
@@ -184,38 +248,19 @@ class DaskBaseRows(BaseRows):
         df = self.root
         return df
 
-    def drop_duplicates(self, keep="first", subset=None):
-        """
-        Drop duplicates values in a dataframe
-        :param subset: List of columns to make the comparison, this only  will consider this subset of columns,
-        :param keep: Row to keep when find a duplicate
-        :return: Return a new DataFrame with duplicate rows removed
-        :return:
-        """
-        dfd = self.root.data
-        subset = parse_columns(dfd, subset)
-        subset = val_to_list(subset)
-        dfd = dfd.drop_duplicates(keep=keep, subset=subset)
-
-        return self.root.new(dfd)
-
-        # df = self.parent.data
-        # columns = prepare_columns(self.parent, input_cols, output_cols, accepts_missing_cols=True)
-        # kw_columns ={}
-        # for input_col, output_col in columns:
-        #     kw_columns[output_col]= df[input_col].isin(values)
-        #
-        # df = df.assign(**kw_columns)
-        # return self.parent.new(df)
-
     def unnest(self, input_cols):
         df = self.root
         return df
 
     def approx_count(self):
         """
-        Aprox rows count
+        Aprox rows count. If the count is not cached it is estimated from the mean length of a few partitions spread
+        over the dataframe
         :return:
         """
         df = self.root
-        return df.rows.count()
+        count = Meta.get(df.meta, "rows.count")
+        if count is None:
+            stats = df._sampled_stats()
+            count = int(round(sum(length for length, _, _ in stats) / len(stats) * df.data.npartitions))
+        return count
@@ -1,9 +1,6 @@
-from functools import reduce
-
 from sklearn.preprocessing import MinMaxScaler, MaxAbsScaler, StandardScaler
 
 from optimus.engines.base.columns import BaseColumns
-from optimus.helpers.columns import parse_columns, name_col
 from optimus.helpers.constants import Actions
 from optimus.helpers.raiseit import RaiseIt
 
@@ -100,38 +97,3 @@ class DataFrameBaseColumns(BaseColumns):
     @staticmethod
     def to_timestamp(input_cols, date_format=None, output_cols=None):
         pass
-
-    def nest(self, input_cols, separator="", output_col=None, shape="string", drop=False):
-        df = self.root
-
-        dfd = df.data
-
-        if output_col is None:
-            output_col = name_col(input_cols)
-
-        input_cols = parse_columns(df, input_cols)
-
-        output_ordered_columns = df.cols.names()
-
-        # cudfd do nor support apply or agg join for this operation
-        if shape == "vector" or shape == "array":
-            raise NotImplementedError("Not implemented yet")
-            # https://stackoverflow.com/questions/43898035/pandas-combine-column-values-into-a-list-in-a-new-column/43898233
-            # t['combined'] = t.values.tolist()
-
-            # dfds = [dfd[input_col] for input_col in input_cols]
-            # dfd[output_col] = dfd[input_cols].values.tolist()
-        elif shape == "string":
-            dfds = [dfd[input_col].astype(str) for input_col in input_cols]
-            dfd = dfd.assign(**{output_col:reduce((lambda x, y: x + separator + y), dfds)})
-
-        if output_col not in output_ordered_columns:
-            col_index = output_ordered_columns.index(input_cols[-1]) + 1
-            output_ordered_columns[col_index:col_index] = [output_col]
-
-        if drop is True:
-            for input_col in input_cols:
-                if input_col in output_ordered_columns and input_col != output_col:
-                    output_ordered_columns.remove(input_col)
-
-        return self.root.new(dfd).cols.select(output_ordered_columns)
@@ -1,12 +1,18 @@
 import re
 from abc import abstractmethod, ABC
+from datetime import datetime, timedelta
 
+import dask
 import numpy as np
 import pandas as pd
-from jsonschema._format import is_email
-from url_parser import UrlObject
 
-from optimus.helpers.constants import ProfilerDataTypes
+from optimus.engines.base.commons.aggregations import Aggregation, HyperLogLog, Moments, compute_aggregations, \
+    intermediates, modes
+from optimus.engines.base.commons.functions import to_datetime, split, unnest_array, nest_array
+from optimus.engines.base.commons.nlp import stopwords, remove_stopwords, word_tokenize
+from optimus.engines.base.commons.url import split_url, split_hosts, split_email
+from optimus.engines.base.stringclustering import fingerprint_keys, n_gram_keys, phonetic_keys
+from optimus.helpers.constants import ProfilerDataTypes, RELATIVE_ERROR
 from optimus.helpers.core import val_to_list
 from optimus.infer import is_list, is_null, is_bool, \
     is_credit_card_number, is_zip_code, is_int, is_decimal, is_datetime, is_object_value, is_ip, is_url, is_missing, \
@@ -23,7 +29,7 @@ class Functions(ABC):
 
         return wrapper
 
-    def from_delayed(self, delayed):
+    def from_delayed(self, delayed, meta=None):
         return delayed[0]
 
     def to_delayed(self, delayed):
@@ -41,24 +47,32 @@ class Functions(ABC):
     def to_string_accessor(self, series):
         return self.to_string(series).str
 
-    # Aggregation
+    def aggregate(self, aggregations):
+        """
+        Reduce several aggregations together, reading every partition once
+        :param aggregations: {key: Aggregation}
+        :return: {key: value}, delayed with distributed engines
+        """
+        return compute_aggregations(aggregations, self.delayed, self.to_delayed)
+
+    # Aggregation. Every function returns an Aggregation, so any mix of them can be computed together
     def min(self, series):
-        return series.min()
+        return Aggregation(series, *intermediates()["min"])
 
     def max(self, series):
-        return series.max()
+        return Aggregation(series, *intermediates()["max"])
 
     def mean(self, series):
-        return self._to_float(series).mean()
+        return Aggregation(series, *intermediates()["moments"], Moments.mean)
 
     def mode(self, series):
-        return self._to_float(series).mode().to_dict()
+        return Aggregation(series, *intermediates()["value_counts"], modes)
 
     def std(self, series):
-        return self._to_float(series).std()
+        return Aggregation(series, *intermediates()["moments"], Moments.std)
 
     def sum(self, series):
-        return self._to_float(series).sum()
+        return Aggregation(series, *intermediates()["moments"], lambda moments: moments.total)
 
     def cumsum(self, series):
         return self._to_float(series).cumsum()
@@ -73,9 +87,11 @@ class Functions(ABC):
         return self._to_float(series).cummin()
 
     def var(self, series):
-        return self._to_float(series).var()
+        return Aggregation(series, *intermediates()["moments"], Moments.var)
 
-    def count_uniques(self, series, values=None, estimate: bool = True):
+    def count_uniques(self, series, values=None, estimate: bool = False):
+        if estimate:
+            return Aggregation(series, *intermediates()["nunique"], HyperLogLog.count)
         return self.to_string(series).nunique()
 
     def unique(self, series, *args):
@@ -84,7 +100,7 @@ class Functions(ABC):
 
     @staticmethod
     def count_na(series):
-        return series.isna().sum()
+        return Aggregation(series, *intermediates()["count_na"])
         # return {"count_na": {col_name:  for col_name in columns}}
         # return np.count_nonzero(_df[_serie].isnull().values.ravel())
         # return cp.count_nonzero(_df[_serie].isnull().values.ravel())
@@ -105,38 +121,34 @@ class Functions(ABC):
         pass
 
     def mad(self, series, error, more):
-        series = self._to_float(series)
-        series = series[series.notnull()]
-        median_value = series.quantile(0.5)
-        mad_value = {"mad": (series - median_value).abs().quantile(0.5)}
-        if more:
-            mad_value.update({"median": median_value})
 
-        return mad_value
+        def to_dict(sketch):
+            mad_value, median_value = sketch.mad()
+            mad_value = {"mad": mad_value}
+            if more:
+                mad_value.update({"median": median_value})
+            return mad_value
+
+        return Aggregation(series, *intermediates(error)["sketch"], to_dict)
 
-    # TODO: dask seems more efficient triggering multiple .min() task, one for every column
-    # cudf seems to be calculate faster in on pass using df.min()
     def range(self, series):
 
-        return {"min": self._to_float(series).min(), "max": self._to_float(series).max()}
+        def to_dict(_range):
+            return {"min": float(_range[0]), "max": float(_range[1])}
 
-    def var(self, series):
-        return self._to_float(series).var()
+        return Aggregation(series, *intermediates()["range"], to_dict)
 
     def percentile(self, series, values, error):
+        return Aggregation(series, *intermediates(error)["sketch"], lambda sketch: sketch.quantile(values))
 
-        series = self._to_float(series)
-
-        @self.delayed
-        def to_dict(_result):
-            ## In pandas if all values are none it return {} on dict
-            # Dask raise an exception is all values in the series are np.nan
-            if _result.isnull().all():
-                return np.nan
-            else:
-                return _result.quantile(values).to_dict()
-
-        return to_dict(series)
+    def quantile_sketch(self, series, error):
+        """
+        Build a mergeable quantile sketch of every partition and merge them
+        :param series:
+        :param error: Max rank error of the sketch. See sketch_size()
+        :return: Aggregation that returns a QuantileSketch
+        """
+        return Aggregation(series, *intermediates(error)["sketch"])
 
     # def radians(series):
     #     return series._to_float().radians()
@@ -151,7 +163,8 @@ class Functions(ABC):
         return t - t.mean() / t.std(ddof=0)
 
     def modified_z_score(self, series):
-        mad_median = self.mad(series, True, True)
+        # Dask returns the mad as a delayed object. dask.compute() returns the pandas result as is
+        mad_median = dask.compute(self.aggregate({"mad": self.mad(series, RELATIVE_ERROR, True)}))[0]["mad"]
         median = mad_median["median"]
         mad = mad_median["mad"]
 
@@ -174,9 +187,16 @@ class Functions(ABC):
     def exp(self, series):
         return self._to_float(series).exp()
 
-    @abstractmethod
-    def word_tokenize(self, series):
-        pass
+    @staticmethod
+    def word_tokenize(series):
+        return word_tokenize(series)
+
+    def word_count(self, series):
+        return self.word_tokenize(series).str.len()
+
+    @staticmethod
+    def remove_stopwords(series, language="english"):
+        return remove_stopwords(series, stopwords(language))
 
     def len(self, value):
         return len(value)
@@ -328,6 +348,23 @@ class Functions(ABC):
         search = val_to_list(search)
         return series.mask(series.isin(search), replace_by)
 
+    @staticmethod
+    def split(series, separator, splits):
+        return split(series, separator, splits)
+
+    @staticmethod
+    def unnest_array(series, splits):
+        return unnest_array(series, splits)
+
+    @staticmethod
+    def nest_string(series_list, separator):
+        first, *others = [series.astype(str) for series in series_list]
+        return first.str.cat(others, sep=separator)
+
+    @staticmethod
+    def nest_array(dfd):
+        return nest_array(dfd)
+
     def remove_white_spaces(self, series):
         return self.to_string_accessor(series).replace(" ", "")
 
@@ -342,7 +379,7 @@ class Functions(ABC):
     #     return series.str.len()
 
     def to_datetime(self, series, format):
-        pass
+        return to_datetime(series, format)
 
     def normalize_chars(self, series):
         pass
@@ -384,79 +421,124 @@ class Functions(ABC):
         return series == pat
 
     # dates
+    @staticmethod
+    def date_part(series, part):
+        """
+        Extract a part from a datetime series
+        :param series: datetime series
+        :param part: 'year', 'month', 'day', 'hour', 'minute', 'second' or 'weekday'
+        :return:
+        """
+        return getattr(series.dt, part)
+
     def year(self, series, format):
         """
         :param series:
         :param format: "%Y-%m-%d HH:mm:ss"
         :return:
         """
-        # return self.to_datetime(format=format).strftime('%Y').to_self().reset_index(drop=True)
-        return self.to_datetime(series, format=format).dt.year
+        return self.date_part(self.to_datetime(series, format), "year")
+
+    def month(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "month")
+
+    def day(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "day")
+
+    def hour(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "hour")
+
+    def minute(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "minute")
+
+    def second(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "second")
+
+    def weekday(self, series, format):
+        return self.date_part(self.to_datetime(series, format), "weekday")
 
     @staticmethod
-    def month(series, format):
-        return series.to_datetime(format=format).dt.month
+    def format_datetime(series, output_format):
+        """
+        Format a datetime series as string
+        :param series: datetime series
+        :param output_format:
+        :return:
+        """
+        return series.dt.strftime(output_format)
 
     @staticmethod
-    def day(series, format):
-        return series.to_datetime(format=format).dt.day
+    def years_until(series):
+        """
+        Years between the dates in a datetime series and today
+        :param series: datetime series
+        :return:
+        """
+        return (series.dt.normalize() - pd.Timestamp(datetime.now().date())) / timedelta(days=365)
+
+    def date_format(self, series, current_format=None, output_format=None):
+        return self.format_datetime(self.to_datetime(series, current_format), output_format)
 
+    def years_between(self, series, date_format=None):
+        return self.years_until(self.to_datetime(series, date_format))
+
+    # urls
     @staticmethod
-    def hour(series, format):
-        return series.to_datetime(format=format).dt.hour
+    def split_url(series):
+        return split_url(series)
 
     @staticmethod
-    def minute(series, format):
-        return series.to_datetime(format=format).dt.minute
+    def split_hosts(series):
+        return split_hosts(series)
 
     @staticmethod
-    def second(series, format):
-        return series.to_datetime(format=format).dt.second
+    def split_email(series):
+        return split_email(series)
 
     @staticmethod
-    def weekday(series, format):
-        return series.to_datetime(format=format).dt.weekday
+    def fingerprint(series):
+        return fingerprint_keys(series)
 
     @staticmethod
-    @abstractmethod
-    def date_format(self, current_format=None, output_format=None):
-        pass
+    def n_gram_fingerprint(series, n_size=2):
+        return n_gram_keys(series, n_size)
 
     @staticmethod
-    @abstractmethod
-    def years_between(self, date_format=None):
-        pass
+    def phonetic_fingerprint(series):
+        return phonetic_keys(series)
+
+    def top_domain(self, series):
+        return self.split_hosts(self.split_url(series)["host"])["top_domain"]
 
-    def top_domain(self, value):
-        return UrlObject.parse_url(value)["domain"]
+    def domain(self, series):
+        return self.split_hosts(self.split_url(series)["host"])["domain"]
 
-    def domain(self, value):
-        return UrlObject.parse_url(value)["domain"]
-        # return UrlObject.parse_url(value)["domain"]
+    def subdomain(self, series):
+        return self.split_hosts(self.split_url(series)["host"])["subdomain"]
 
-    def url_scheme(self, value):
-        return UrlObject.parse_url(value)["protocol"]
+    def host(self, series):
+        return self.split_url(series)["host"]
 
-    def url_params(self, value):
-        return UrlObject.parse_url(value)["params"]
+    def url_scheme(self, series):
+        return self.split_url(series)["scheme"]
 
-    def url_path(self, value):
-        return UrlObject.parse_url(value)["path"]
+    def url_params(self, series):
+        return self.url_query(series)
 
-    def url_query(self, value):
-        return UrlObject.parse_url(value)["query"]
+    def url_path(self, series):
+        return self.split_url(series)["path"]
 
-    def port(self, value):
-        return UrlObject.parse_url(value)["port"]
+    def url_query(self, series):
+        return self.split_url(series)["query"]
 
-    def sub_domain(self, series):
-        return UrlObject.parse_url(value)["sub_domain"]
+    def port(self, series):
+        return self.split_url(series)["port"]
 
     def email_username(self, series):
-        return series.str.split('@').str[0]
+        return self.split_email(series)["username"]
 
     def email_domain(self, series):
-        return series.str.split('@').str[1]
+        return self.split_email(series)["domain"]
 
     def infer_dtypes(self, value, cols_dtype):
         """
@@ -466,6 +548,7 @@ class Functions(ABC):
         :param cols_dtype:
         :return:
         """
+        from jsonschema._format import is_email
 
         if is_list(value):
             dtype = ProfilerDataTypes.ARRAY.value
@@ -0,0 +1,215 @@
+import glob
+import os
+from contextlib import contextmanager
+
+import fsspec
+import pyarrow as pa
+import simplejson as json
+from pyarrow import feather
+
+from optimus.engines.base.io.parquet import _natural_key
+from optimus.helpers.functions import path_is_local
+from optimus.helpers.json import json_converter
+
+# Key used to keep the Optimus metadata inside the Arrow schema
+META_KEY = b"optimus"
+ARROW_EXTENSIONS = ["arrow", "feather", "ipc"]
+
+
+def arrow_files(path, storage_options=None):
+    """
+    Return the Arrow files in a path. If the path is a folder, return the files with an Arrow extension inside it.
+    The files are sorted by the numbers in their names, so the partitions saved as part.N are read in order
+    :param path: File, folder or glob pattern
+    :param storage_options:
+    :return: list of file paths
+    """
+    if not path_is_local(path):
+        fs, fs_path = fsspec.core.url_to_fs(path, **(storage_options or {}))
+        if fs.isdir(fs_path):
+            files = []
+            for ext in ARROW_EXTENSIONS:
+                files.extend(fs.glob(f"{fs_path.rstrip('/')}/*.{ext}"))
+        else:
+            files = fs.glob(fs_path)
+        if len(files) == 0:
+            raise FileNotFoundError(f"No Arrow file found in {path}")
+        return [fs.unstrip_protocol(file) for file in sorted(files, key=_natural_key)]
+
+    if os.path.isdir(path):
+        files = []
+        for ext in ARROW_EXTENSIONS:
+            files.extend(glob.glob(os.path.join(path, "*." + ext)))
+        return sorted(files, key=_natural_key)
+
+    files = sorted(glob.glob(path), key=_natural_key)
+    if len(files) == 0:
+        raise FileNotFoundError(f"No Arrow file found in {path}")
+    return files
+
+
+@contextmanager
+def _open(path, storage_options=None):
+    """
+    Open an Arrow file. Local files are memory mapped so the data is not copied until it is used. Remote files are
+    read on demand, so only the footer and the record batches used are downloaded
+    :param path:
+    :param storage_options:
+    :return:
+    """
+    if path_is_local(path):
+        # Record batches keep the mapped memory alive after the file is closed
+        with pa.memory_map(path.replace("file://", ""), "r") as source:
+            yield source
+    else:
+        storage_options = storage_options or {}
+        with fsspec.open(path, "rb", **storage_options) as f:
+            yield pa.PythonFile(f, mode="r")
+
+
+def _select(batch, columns):
+    if columns is None:
+        return batch
+    return pa.RecordBatch.from_arrays([batch.column(batch.schema.get_field_index(c)) for c in columns], names=columns)
+
+
+def arrow_reader(source):
+    """
+    Return a reader for the Arrow IPC file format (Feather V2) and fallback to the streaming format
+    :param source:
+    :return:
+    """
+    try:
+        return pa.ipc.open_file(source)
+    except pa.ArrowInvalid:
+        source.seek(0)
+        return pa.ipc.open_stream(source)
+
+
+def arrow_info(path, storage_options=None):
+    """
+    Return the schema and the number of record batches in a file. Only the file footer is read
+    :param path:
+    :param storage_options:
+    :return: (schema, number of record batches). The number of record batches is None for the streaming format
+    """
+    with _open(path, storage_options) as source:
+        reader = arrow_reader(source)
+        return reader.schema, getattr(reader, "num_record_batches", None)
+
+
+def read_batches(path, columns=None, start=0, stop=None, storage_options=None):
+    """
+    Iterate over the record batches in a file
+    :param path: Path to the file
+    :param columns: Columns to be loaded
+    :param start: First record batch to be read
+    :param stop: Last record batch to be read (not included)
+    :param storage_options:
+    :return: generator of pyarrow.RecordBatch
+    """
+    with _open(path, storage_options) as source:
+        reader = arrow_reader(source)
+
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            stop = reader.num_record_batches if stop is None else min(stop, reader.num_record_batches)
+            for i in range(start, stop):
+                yield _select(reader.get_batch(i), columns)
+        else:
+            for i, batch in enumerate(reader):
+                if stop is not None and i >= stop:
+                    break
+                if i >= start:
+                    yield _select(batch, columns)
+
+
+def remove_arrow_files(path, storage_options=None):
+    """
+    Remove the Arrow files inside a folder, so files from a previous save with more partitions are not loaded
+    :param path: Folder
+    :param storage_options:
+    :return:
+    """
+    fs, fs_path = fsspec.core.url_to_fs(path, **(storage_options or {}))
+    if fs.isdir(fs_path):
+        for ext in ARROW_EXTENSIONS:
+            files = fs.glob(f"{fs_path.rstrip('/')}/*.{ext}")
+            if files:
+                fs.rm(files)
+
+
+def read_table(path, columns=None, start=0, stop=None, storage_options=None):
+    """
+    Read the record batches of a file in a pyarrow Table
+    :param path: Path to the file
+    :param columns: Columns to be loaded
+    :param start: First record batch to be read
+    :param stop: Last record batch to be read (not included)
+    :param storage_options:
+    :return: pyarrow.Table
+    """
+    schema, _ = arrow_info(path, storage_options)
+    if columns is not None:
+        schema = pa.schema([schema.field(c) for c in columns], metadata=schema.metadata)
+    return pa.Table.from_batches(list(read_batches(path, columns, start, stop, storage_options)), schema=schema)
+
+
+def to_pandas(table):
+    """
+    Convert a pyarrow Table to pandas
+    :param table:
+    :return:
+    """
+    return table.to_pandas(split_blocks=True)
+
+
+def read_pandas(path, columns=None, start=0, stop=None, storage_options=None):
+    """
+    Read the record batches of a file in a pandas dataframe
+    :param path: Path to the file
+    :param columns: Columns to be loaded
+    :param start: First record batch to be read
+    :param stop: Last record batch to be read (not included)
+    :param storage_options:
+    :return: pandas dataframe
+    """
+    return to_pandas(read_table(path, columns, start, stop, storage_options))
+
+
+def table_meta(schema):
+    """
+    Get the Optimus metadata saved in the Arrow schema
+    :param schema:
+    :return: dict
+    """
+    metadata = schema.metadata or {}
+    value = metadata.get(META_KEY)
+    return json.loads(value) if value else {}
+
+
+def write_table(pdf, path, meta=None, compression=None, chunk_size=None, storage_options=None):
+    """
+    Write a pandas dataframe to a Arrow IPC file
+    :param pdf: pandas dataframe
+    :param path: Path to the file
+    :param meta: Optimus metadata to be saved in the Arrow schema
+    :param compression: 'lz4', 'zstd' or 'uncompressed'
+    :param chunk_size: Number of rows in every record batch
+    :param storage_options:
+    :return:
+    """
+    table = pa.Table.from_pandas(pdf, preserve_index=False)
+
+    if meta:
+        metadata = {**(table.schema.metadata or {}), META_KEY: json.dumps(meta, default=json_converter)}
+        table = table.replace_schema_metadata(metadata)
+
+    if compression is None:
+        compression = "uncompressed"
+
+    if path_is_local(path):
+        feather.write_feather(table, path.replace("file://", ""), compression=compression, chunksize=chunk_size)
+    else:
+        storage_options = storage_options or {}
+        with fsspec.open(path, "wb", **storage_options) as f:
+            feather.write_feather(table, f, compression=compression, chunksize=chunk_size)
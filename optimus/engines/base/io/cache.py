@@ -0,0 +1,214 @@
+import hashlib
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+import fsspec
+import simplejson as json
+
+from optimus.helpers.logger import logger
+
+CACHE_PATH = os.path.join(tempfile.gettempdir(), "optimus", "cache")
+CACHE_SIZE = 2 * 1024 ** 3
+BLOCK_SIZE = 8 * 1024 ** 2
+WORKERS = 8
+
+# Keys used by the different fsspec file systems to report the version of an object
+VERSION_KEYS = ["ETag", "etag", "md5Hash", "mtime", "LastModified", "last_modified", "updated", "modificationTime",
+                "created"]
+
+
+def _version(info):
+    """
+    Return a value that changes every time the remote object is modified
+    :param info: fsspec info dict of the object
+    :return:
+    """
+    for key in VERSION_KEYS:
+        value = info.get(key)
+        if value is not None:
+            return str(value)
+    return str(info.get("size"))
+
+
+def _disk_size(file_name):
+    """
+    Size in disk of a file. The local copies are sparse files so only the downloaded blocks use space
+    :param file_name:
+    :return:
+    """
+    stat = os.stat(file_name)
+    return stat.st_blocks * 512 if hasattr(stat, "st_blocks") else stat.st_size
+
+
+class RemoteCache:
+    """
+    Local read-through block cache for remote files. Every object is saved in a local file keyed by its path and its
+    ETag or modification time so a modified object is downloaded again. Objects are downloaded in blocks using parallel
+    range requests, and only the blocks that are requested are downloaded, so reading the head of a file to sniff its
+    format does not download the whole file and the blocks are reused when the file is loaded.
+    The least recently used objects are removed when the cache is bigger than max_size.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_size=CACHE_SIZE, block_size=BLOCK_SIZE, workers=WORKERS):
+        """
+        :param path: Local folder where the objects are saved
+        :param max_size: Max size in bytes of the cache in disk
+        :param block_size: Size in bytes of every range request
+        :param workers: Number of range requests made in parallel
+        """
+        self.path = path
+        self.max_size = max_size
+        self.block_size = block_size
+        self.workers = workers
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry(self, path, storage_options=None):
+        """
+        Get the file system, the info and the local file name of a remote object
+        :param path:
+        :param storage_options:
+        :return:
+        """
+        storage_options = storage_options or {}
+        fs, _, paths = fsspec.core.get_fs_token_paths(path, storage_options=storage_options)
+        remote_path = paths[0]
+        info = fs.info(remote_path)
+        if info.get("type") == "directory":
+            raise IsADirectoryError(f"{path} is a folder. Only files can be cached")
+        key = hashlib.sha256(f"{fs.protocol}://{remote_path}:{_version(info)}".encode("utf-8")).hexdigest()
+        # Keep the extensions so the format and the compression can be inferred from the local copy
+        suffix = "".join(PurePosixPath(remote_path).suffixes)
+        return fs, remote_path, info["size"], os.path.join(self.path, key + suffix)
+
+    @staticmethod
+    def _cached_blocks(local_path):
+        if not os.path.exists(local_path):
+            return set()
+        try:
+            with open(local_path + ".blocks", "r") as f:
+                return set(json.load(f))
+        except (IOError, ValueError):
+            return set()
+
+    def _fetch_block(self, fs, remote_path, size, local_path, block, cached):
+        start = block * self.block_size
+        end = min(start + self.block_size, size)
+        data = fs.cat_file(remote_path, start=start, end=end)
+
+        with self._lock:
+            with open(local_path, "r+b") as f:
+                f.seek(start)
+                f.write(data)
+            cached.add(block)
+            with open(local_path + ".blocks", "w") as f:
+                json.dump(sorted(cached), f)
+
+    def _read_through(self, fs, remote_path, size, local_path, blocks):
+        """
+        Download the blocks that are not in the cache yet
+        :return:
+        """
+        with self._lock:
+            cached = self._cached_blocks(local_path)
+            if not os.path.exists(local_path):
+                with open(local_path, "wb") as f:
+                    f.truncate(size)
+
+        missing = [block for block in blocks if block not in cached]
+
+        if len(missing) == 1:
+            self._fetch_block(fs, remote_path, size, local_path, missing[0], cached)
+        elif len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                list(executor.map(lambda block: self._fetch_block(fs, remote_path, size, local_path, block, cached),
+                                  missing))
+
+        # Used to track the least recently used objects
+        os.utime(local_path)
+
+        if missing:
+            self.evict(keep=local_path)
+
+    def head(self, path, size, storage_options=None):
+        """
+        Read the first bytes of a remote file through the cache
+        :param path: Remote path
+        :param size: Number of bytes to be read
+        :param storage_options:
+        :return: bytes
+        """
+        fs, remote_path, file_size, local_path = self._entry(path, storage_options)
+        size = min(size, file_size)
+        blocks = range(0, max(-(-size // self.block_size), 1)) if file_size else []
+        self._read_through(fs, remote_path, file_size, local_path, blocks)
+
+        with open(local_path, "rb") as f:
+            return f.read(size)
+
+    def fetch(self, path, storage_options=None):
+        """
+        Download a remote file through the cache
+        :param path: Remote path
+        :param storage_options:
+        :return: Path to the local copy of the file
+        """
+        fs, remote_path, size, local_path = self._entry(path, storage_options)
+        self._read_through(fs, remote_path, size, local_path, range(0, -(-size // self.block_size)))
+        return local_path
+
+    def size(self):
+        """
+        Size in bytes of the cache in disk
+        :return:
+        """
+        return sum(_disk_size(os.path.join(self.path, file_name)) for file_name in os.listdir(self.path))
+
+    def evict(self, keep=None):
+        """
+        Remove the least recently used objects until the cache is smaller than max_size
+        :param keep: Local path of an object that must not be removed
+        :return:
+        """
+        with self._lock:
+            entries = [os.path.join(self.path, file_name) for file_name in os.listdir(self.path)
+                       if not file_name.endswith(".blocks")]
+            entries.sort(key=os.path.getmtime)
+            total = self.size()
+
+            for local_path in entries:
+                if total <= self.max_size:
+                    break
+                if local_path == keep:
+                    continue
+                logger.print("Removing %s from the cache", local_path)
+                for file_name in [local_path, local_path + ".blocks"]:
+                    if os.path.exists(file_name):
+                        total -= _disk_size(file_name)
+                        os.remove(file_name)
+
+    def clear(self):
+        """
+        Remove all the objects in the cache
+        :return:
+        """
+        with self._lock:
+            for file_name in os.listdir(self.path):
+                os.remove(os.path.join(self.path, file_name))
+
+
+_default_cache = None
+
+
+def default_cache():
+    """
+    Cache shared by all the connections that do not set their own
+    :return:
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RemoteCache()
+    return _default_cache
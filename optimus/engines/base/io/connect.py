@@ -1,6 +1,8 @@
 import re
 
-from optimus.engines.base.dask.io.jdbc import DaskBaseJDBC
+import fsspec
+
+from optimus.engines.base.io.cache import RemoteCache, default_cache
 from optimus.engines.spark.io.properties import DriverProperties
 from optimus.helpers.constants import Schemas
 from optimus.helpers.raiseit import RaiseIt
@@ -12,12 +14,24 @@ class Connection:
     Generic
     """
 
-    def __init__(self, config=None, **kwargs):
+    def __init__(self, config=None, cache=None, **kwargs):
+        """
+        :param config:
+        :param cache: Keep a local copy of the files read from this connection. True to use the default cache,
+        a dict with the RemoteCache params or a RemoteCache
+        :param kwargs:
+        """
         if not kwargs["base_url"].endswith("/"):
             kwargs["base_url"] = kwargs["base_url"] + "/"
         self._storage_options = kwargs
         self.options = config if config else kwargs
 
+        if cache is True:
+            cache = default_cache()
+        elif isinstance(cache, dict):
+            cache = RemoteCache(**cache)
+        self.cache = cache or None
+
     def path(self, path):
         if self._storage_options["base_url"] and not path.startswith(
                 (self._storage_options["base_url"], *Schemas.list())):
@@ -37,6 +51,42 @@ class Connection:
 
         return storage_options
 
+    def head(self, path, size):
+        """
+        Read the first bytes of a file
+        :param path:
+        :param size: Number of bytes to be read
+        :return:
+        """
+        path = self.path(path)
+        if self.cache:
+            return self.cache.head(path, size, self.storage_options)
+
+        with fsspec.open(path, "rb", **(self.storage_options or {})) as f:
+            return f.read(size)
+
+    def local_path(self, path):
+        """
+        Download a file through the cache and return the path to the local copy
+        :param path:
+        :return:
+        """
+        return self.cache.fetch(self.path(path), self.storage_options)
+
+    def source(self, path):
+        """
+        Path and storage options used to read a file. If the connection has a cache the file is read from its local
+        copy. Folders and glob patterns are always read from the remote file system
+        :param path:
+        :return: (path, storage_options)
+        """
+        if self.cache:
+            try:
+                return self.local_path(path), None
+            except (IsADirectoryError, FileNotFoundError):
+                pass
+        return self.path(path), self.storage_options
+
     def boto(self):
         return self.options
 
@@ -48,7 +98,7 @@ class S3(Connection):
 
     type = "s3"
 
-    def __init__(self, endpoint_url=None, bucket=None, **kwargs):
+    def __init__(self, endpoint_url=None, bucket=None, cache=None, **kwargs):
         """
         endpoint_url: http(s)://<...>
         bucket
@@ -65,6 +115,8 @@ class S3(Connection):
             as they concern the behaviour of the buffer between successive reads
         kwargs: Other parameters are passed to the boto3 Session object, such as profile_name,
             to pick one of the authentication sections from the configuration files referred to above (see here)
+        cache: Keep a local copy of the files read. True to use the default cache, a dict with the RemoteCache params
+            or a RemoteCache
 
 
         """
@@ -93,7 +145,7 @@ class S3(Connection):
             elif endpoint_url:
                 kwargs["base_url"] = Schemas.S3.value + endpoint_url
 
-        super().__init__(config, **kwargs)
+        super().__init__(config, cache=cache, **kwargs)
 
     @property
     def boto(self):
@@ -109,12 +161,14 @@ class Local(Connection):
     Local file system
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, cache=None, **kwargs):
         """
         supports base_url
+        :param cache: Keep a local copy of the files read. True to use the default cache, a dict with the
+        RemoteCache params or a RemoteCache
         :param kwargs:
         """
-        super().__init__(**kwargs)
+        super().__init__(cache=cache, **kwargs)
 
 
 class MAS(Connection):
@@ -122,26 +176,36 @@ class MAS(Connection):
     Microsoft Azure Storage
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, cache=None, **kwargs):
         """
         Authentication for adl requires tenant_id, client_id and client_secret in the storage_options dictionary.
         Authentication for abfs requires account_name and account_key in storage_options.
+        :param cache: Keep a local copy of the files read. True to use the default cache, a dict with the
+        RemoteCache params or a RemoteCache
         :param kwargs:
         """
-        super().__init__(**kwargs)
+        super().__init__(cache=cache, **kwargs)
 
 
 class GCS(Connection):
-    def __init__(self, host, port, user, kerb_ticket):
-        config["host"] = host
-        config["port"] = port
-        config["user"] = user
-        config["kerb_ticket"] = kerb_ticket
-        super().__init__(config, host, port, user, kerb_ticket)
+    """
+    Google Cloud Storage
+    """
+
+    def __init__(self, bucket=None, cache=None, **kwargs):
+        """
+        :param bucket:
+        :param cache: Keep a local copy of the files read. True to use the default cache, a dict with the
+        RemoteCache params or a RemoteCache
+        :param kwargs: Parameters passed to gcsfs like project or token
+        """
+        if not kwargs.get("base_url", False):
+            kwargs["base_url"] = Schemas.GCS.value + (bucket or "")
+        super().__init__(cache=cache, **kwargs)
 
 
 class HDFS(Connection):
-    def __init__(self, **kwargs):
+    def __init__(self, cache=None, **kwargs):
 
         config = kwargs.copy()
 
@@ -162,63 +226,69 @@ class HDFS(Connection):
         kwargs["base_url"] = kwargs["url"]
         kwargs.pop("url")
 
-        super().__init__(config, **kwargs)
+        super().__init__(config, cache=cache, **kwargs)
+
+
+def _jdbc(*args, **kwargs):
+    # sqlalchemy and the database drivers are only imported when a database connection is created
+    from optimus.engines.base.dask.io.jdbc import DaskBaseJDBC
+    return DaskBaseJDBC(*args, **kwargs)
 
 
 class Connect:
     @staticmethod
     def mysql(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.MYSQL.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.MYSQL.value["name"],
+                     schema=schema)
 
     @staticmethod
     def postgres(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.POSTGRESQL.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.POSTGRESQL.value["name"],
+                     schema=schema)
 
     @staticmethod
     def mssql(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.MSSQL.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.MSSQL.value["name"],
+                     schema=schema)
 
     @staticmethod
     def redshift(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.REDSHIFT.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.REDSHIFT.value["name"],
+                     schema=schema)
 
     @staticmethod
     def sqlite(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.SQLITE.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.SQLITE.value["name"],
+                     schema=schema)
 
     @staticmethod
     def bigquery(host=None, database=None, user=None, password=None, port=None, schema="public", project=None,
                  dataset=None):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.BIGQUERY.value["name"],
-                            schema=schema, bigquery_project=project, bigquery_dataset=dataset)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.BIGQUERY.value["name"],
+                     schema=schema, bigquery_project=project, bigquery_dataset=dataset)
 
     @staticmethod
     def presto(host=None, database=None, user=None, password=None, port=None, schema="public", catalog=None):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.PRESTO.value["name"],
-                            schema=schema, presto_catalog=catalog, )
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.PRESTO.value["name"],
+                     schema=schema, presto_catalog=catalog, )
 
     @staticmethod
     def cassandra(host=None, database=None, user=None, password=None, port=None, schema="public", keyspace=None,
                   table=None):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.CASSANDRA.value["name"],
-                            schema=schema, cassandra_keyspace=keyspace,
-                            cassandra_table=table)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.CASSANDRA.value["name"],
+                     schema=schema, cassandra_keyspace=keyspace,
+                     cassandra_table=table)
 
     @staticmethod
     def redis(host=None, database=None, user=None, password=None, port=None, schema="public"):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.REDIS.value["name"],
-                            schema=schema)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.REDIS.value["name"],
+                     schema=schema)
 
     @staticmethod
     def oracle(host=None, database=None, user=None, password=None, port=None, schema="public",
                tns=None, service_name=None, sid=None):
-        return DaskBaseJDBC(host, database, user, password, port=port, driver=DriverProperties.ORACLE.value["name"],
-                            schema=schema, oracle_tns=tns, oracle_service_name=service_name, oracle_sid=sid)
+        return _jdbc(host, database, user, password, port=port, driver=DriverProperties.ORACLE.value["name"],
+                     schema=schema, oracle_tns=tns, oracle_service_name=service_name, oracle_sid=sid)
 
     @staticmethod
     def s3(**kwargs):
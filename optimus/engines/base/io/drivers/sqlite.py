@@ -12,6 +12,9 @@ class SQLiteDriver(AbstractDriver):
     def properties(self) -> Enum:
         return DriverProperties.SQLITE
 
+    def uri(self, *args, **kwargs) -> str:
+        return f"""{kwargs["driver"]}:///{kwargs["database"]}"""
+
     def url(self, *args, **kwargs) -> str:
         return f"""jdbc:{kwargs["driver"]}:{kwargs["host"]}"""
 
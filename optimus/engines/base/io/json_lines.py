@@ -0,0 +1,96 @@
+import fsspec
+import pandas as pd
+import pyarrow as pa
+
+BATCH_SIZE = 100000
+
+
+def _orjson_dumps():
+    import orjson
+
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+
+    def dumps(records):
+        return b"".join(orjson.dumps(record, default=str, option=options) for record in records)
+
+    return dumps
+
+
+def write_json_lines(pdf, path, batch_size=BATCH_SIZE, compression="infer", use_orjson=False, storage_options=None):
+    """
+    Write a pandas dataframe to a JSON lines file. The rows are serialized in batches so only one batch is in memory
+    as a string at a time
+    :param pdf: pandas dataframe
+    :param path: Path to the file
+    :param batch_size: Number of rows serialized at a time
+    :param compression: 'gzip', 'bz2', 'infer' or None. 'infer' use the file extension
+    :param use_orjson: Use orjson to serialize the rows. It is several times faster than the pandas serializer
+    :param storage_options:
+    :return: Number of rows written
+    """
+    storage_options = storage_options or {}
+    dumps = _orjson_dumps() if use_orjson else None
+
+    with fsspec.open(path, "wb", compression=compression, **storage_options) as f:
+        for start in range(0, len(pdf), batch_size):
+            batch = pdf.iloc[start:start + batch_size]
+            if dumps:
+                f.write(dumps(batch.to_dict(orient="records")))
+            else:
+                value = batch.to_json(orient="records", lines=True, date_format="iso")
+                if not value.endswith("\n"):
+                    value += "\n"
+                f.write(value.encode("utf-8"))
+
+    return len(pdf)
+
+
+def read_json_lines(path, batch_size=BATCH_SIZE, compression="infer", use_orjson=False, storage_options=None,
+                    **kwargs):
+    """
+    Iterate over a JSON lines file in pandas dataframes of batch_size rows
+    :param path: Path to the file
+    :param batch_size: Number of rows in every dataframe
+    :param compression: 'gzip', 'bz2', 'infer' or None. 'infer' use the file extension
+    :param use_orjson: Use orjson to parse the rows
+    :param storage_options:
+    :param kwargs: Keyword arguments to be passed to pandas read_json
+    :return: generator of pandas dataframes
+    """
+    storage_options = storage_options or {}
+
+    with fsspec.open(path, "rb", compression=compression, **storage_options) as f:
+        if use_orjson:
+            import orjson
+
+            records = []
+            for line in f:
+                if line.strip():
+                    records.append(orjson.loads(line))
+                if len(records) == batch_size:
+                    yield pd.DataFrame.from_records(records)
+                    records = []
+            if records:
+                yield pd.DataFrame.from_records(records)
+        else:
+            for chunk in pd.read_json(f, lines=True, chunksize=batch_size, **kwargs):
+                yield chunk
+
+
+def read_json_lines_table(path, block_size=None, compression="infer", storage_options=None):
+    """
+    Read a JSON lines file in a pyarrow Table. The pyarrow reader parses the file in blocks of block_size bytes, so
+    the rows are never in memory as Python objects
+    :param path: Path to the file
+    :param block_size: Number of bytes parsed at a time
+    :param compression: 'gzip', 'bz2', 'infer' or None. 'infer' use the file extension
+    :param storage_options:
+    :return: pyarrow.Table
+    """
+    from pyarrow import json as pa_json
+
+    storage_options = storage_options or {}
+    read_options = pa_json.ReadOptions(block_size=block_size) if block_size else None
+
+    with fsspec.open(path, "rb", compression=compression, **storage_options) as f:
+        return pa_json.read_json(f, read_options=read_options)
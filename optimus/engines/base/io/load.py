@@ -2,11 +2,10 @@ import csv
 import os
 from abc import abstractmethod
 
-import boto3
 import joblib
-import magic
 
 from optimus.engines.base.basedataframe import BaseDataFrame
+from optimus.engines.base.io.arrow import ARROW_EXTENSIONS
 from optimus.helpers.functions import prepare_path
 from optimus.helpers.raiseit import RaiseIt
 
@@ -62,33 +61,38 @@ class BaseLoad:
     def hdf5(full_path, columns=None, *args, **kwargs) -> BaseDataFrame:
         pass
 
-    def file(self, path, *args, **kwargs) -> BaseDataFrame:
+    @staticmethod
+    @abstractmethod
+    def arrow(full_path, columns=None, *args, **kwargs) -> BaseDataFrame:
+        pass
+
+    def file(self, path, conn=None, *args, **kwargs) -> BaseDataFrame:
         """
         Try to  infer the file data format and encoding
         :param path: Path to the file we want to load.
+        :param conn: Connection used to read the file. If it has a cache the head is read through it, so the blocks
+        are reused when the file is loaded
         :param args:
         :param kwargs:
         :return:
         """
-        conn = kwargs.get("conn")
-
         if conn:
-
-            remote_obj = boto3.resource(conn.type, **conn.boto).Object(conn.options.get("bucket"), path)
-            body = remote_obj.get()['Body']
-            buffer = body.read(amt=BYTES_SIZE)
-            full_path = conn.path(path)
+            buffer = conn.head(path, BYTES_SIZE)
+            full_path = path
             file_name = os.path.basename(path)
+            kwargs["conn"] = conn
 
         else:
 
             full_path, file_name = prepare_path(path)[0]
-            file = open(full_path, "rb")
-            buffer = file.read(BYTES_SIZE)
+            with open(full_path, "rb") as file:
+                buffer = file.read(BYTES_SIZE)
 
         # Detect the file type
         try:
             file_ext = os.path.splitext(file_name)[1].replace(".", "")
+            import magic
+
             mime, encoding = magic.Magic(mime=True, mime_encoding=True).from_buffer(buffer).split(";")
             mime_info = {"mime": mime, "encoding": encoding.strip().split("=")[1], "file_ext": file_ext}
 
@@ -103,7 +107,7 @@ class BaseLoad:
         file_type = file_ext
 
         if mime:
-            if mime in ["text/plain", "application/csv"]:
+            if mime in ["text/plain", "text/csv", "application/csv"]:
                 file_type = "csv"
             elif mime == "application/json":
                 file_type = "json"
@@ -112,8 +116,10 @@ class BaseLoad:
             elif mime in ["application/vnd.ms-excel",
                           "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]:
                 file_type = "excel"
+            elif file_ext in ARROW_EXTENSIONS:
+                file_type = "arrow"
             else:
-                RaiseIt.value_error(mime, ["csv", "json", "xml", "xls", "xlsx"])
+                RaiseIt.value_error(mime, ["csv", "json", "xml", "xls", "xlsx", "arrow"])
 
         # Detect the file encoding
         if file_type == "csv":
@@ -126,7 +132,7 @@ class BaseLoad:
                     dialect = csv.Sniffer().sniff(str(buffer))
                     mime_info["file_type"] = "csv"
 
-                    r = {"properties": {"delimiter": dialect.delimiter,
+                    r = {"properties": {"sep": dialect.delimiter,
                                         "doublequote": dialect.doublequote,
                                         "escapechar": dialect.escapechar,
                                         "lineterminator": dialect.lineterminator,
@@ -158,8 +164,12 @@ class BaseLoad:
             mime_info["file_type"] = "excel"
             df = self.excel(full_path, **kwargs)
 
+        elif file_type == "arrow":
+            mime_info["file_type"] = "arrow"
+            df = self.arrow(full_path, **kwargs)
+
         else:
-            RaiseIt.value_error(file_type, ["csv", "json", "xml", "xls", "xlsx"])
+            RaiseIt.value_error(file_type, ["csv", "json", "xml", "xls", "xlsx", "arrow"])
 
         return df
 
@@ -0,0 +1,130 @@
+import posixpath
+import re
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fsspec.core import get_fs_token_paths
+
+from optimus.helpers.core import val_to_list
+
+# This character are invalid as column names by parquet
+INVALID_CHARACTERS = [" ", ",", ";", "{", "}", "(", ")", "\n", "\t", "="]
+
+
+def parquet_column_name(col_name):
+    """
+    Replace the characters that can not be used in a parquet column name
+    :param col_name:
+    :return:
+    """
+    for i in INVALID_CHARACTERS:
+        col_name = col_name.replace(i, "_")
+    return col_name
+
+
+def write_parquet(pdf, path, mode="overwrite", partition_on=None, sort_by=None, compression="snappy",
+                  row_group_size=None, write_metadata_file=True, storage_options=None, **kwargs):
+    """
+    Write a pandas dataframe to parquet. If partition_on is used or mode is 'append' the data is written as a
+    dataset folder, if not as a single file. Appending to a single file moves it inside a dataset folder.
+    :param pdf: pandas dataframe
+    :param path: Path to the file or dataset folder
+    :param mode: 'overwrite' or 'append'
+    :param partition_on: Columns used to hive partition the dataset in folders like col=value
+    :param sort_by: Columns used to sort the rows so the row groups have tight min/max statistics
+    :param compression: 'snappy', 'gzip', 'brotli', 'lz4', 'zstd' or None
+    :param row_group_size: Number of rows in every row group
+    :param write_metadata_file: Write a _metadata file with the statistics of all the row groups in the dataset
+    :param storage_options:
+    :return:
+    """
+    storage_options = storage_options or {}
+    fs, _, paths = get_fs_token_paths(path, storage_options=storage_options)
+    path = paths[0]
+
+    if sort_by is not None:
+        pdf = pdf.sort_values(val_to_list(sort_by))
+
+    table = pa.Table.from_pandas(pdf, preserve_index=False)
+
+    if mode == "overwrite" and fs.exists(path):
+        fs.rm(path, recursive=True)
+
+    if partition_on is None and mode != "append":
+        parent = posixpath.dirname(path)
+        if parent:
+            fs.makedirs(parent, exist_ok=True)
+        with fs.open(path, "wb") as f:
+            pq.write_table(table, f, compression=compression, row_group_size=row_group_size, **kwargs)
+        return
+
+    if mode == "append" and fs.isfile(path):
+        # A single file saved before. Move it inside a dataset folder so the new data can be appended
+        file_path = path + ".tmp"
+        fs.mv(path, file_path)
+        fs.makedirs(path, exist_ok=True)
+        fs.mv(file_path, posixpath.join(path, "part.0.parquet"))
+
+    if mode == "append" and fs.exists(posixpath.join(path, "_metadata")):
+        # The summary would not include the appended files
+        fs.rm(posixpath.join(path, "_metadata"))
+
+    partition_on = val_to_list(partition_on) if partition_on is not None else None
+    metadata_collector = []
+    pq.write_to_dataset(table, path, partition_cols=partition_on, filesystem=fs, compression=compression,
+                        row_group_size=row_group_size, metadata_collector=metadata_collector, **kwargs)
+
+    # The summary is only complete if all the files in the dataset were written
+    if write_metadata_file and mode != "append" and metadata_collector:
+        metadata = metadata_collector[0]
+        for file_metadata in metadata_collector[1:]:
+            metadata.append_row_groups(file_metadata)
+
+        with fs.open(posixpath.join(path, "_metadata"), "wb") as f:
+            metadata.write_metadata_file(f)
+
+
+def _natural_key(path):
+    """
+    Sort key that compares the numbers in a path by value, so part.2 goes before part.10
+    :param path:
+    :return:
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", path)]
+
+
+def _dataset(path, storage_options=None):
+    import pyarrow.dataset as ds
+
+    fs, _, paths = get_fs_token_paths(path, storage_options=storage_options or {})
+    source = paths[0] if len(paths) == 1 else paths
+    dataset = ds.dataset(source, format="parquet", filesystem=fs, partitioning="hive")
+
+    # pyarrow lists the files of a folder in lexicographic order. They are read in the same order Dask uses
+    files = sorted(dataset.files, key=_natural_key)
+    if files != dataset.files:
+        dataset = ds.dataset(files, format="parquet", filesystem=fs, partitioning="hive",
+                             partition_base_dir=source if len(paths) == 1 else None)
+    return dataset
+
+
+def parquet_count(path, storage_options=None):
+    """
+    Number of rows in a parquet file or dataset. Only the footers of the files are read
+    :param path: File, folder or glob pattern
+    :param storage_options:
+    :return:
+    """
+    return _dataset(path, storage_options).count_rows()
+
+
+def parquet_head(path, n_rows, columns=None, storage_options=None):
+    """
+    First rows of a parquet file or dataset. Only the row groups with the first n_rows rows are read
+    :param path: File, folder or glob pattern
+    :param n_rows:
+    :param columns:
+    :param storage_options:
+    :return: pandas dataframe
+    """
+    return _dataset(path, storage_options).head(n_rows, columns=columns).to_pandas()
@@ -5,7 +5,10 @@ from optimus.helpers.columns import parse_columns
 from optimus.helpers.core import val_to_list, one_list_to_val
 from optimus.infer import is_str, regex_http_code, regex_social_security_number, regex_phone_number, \
     regex_credit_card_number, regex_zip_code, regex_gender, regex_url, regex_ip, regex_email, \
-    is_datetime, is_list, is_bool, is_object, regex_full_url
+    is_list, is_bool, is_object, regex_full_url
+
+# Number of values used to infer the format of a date column
+INFER_DATE_FORMAT_ROWS = 200
 
 
 class Mask(ABC):
@@ -152,26 +155,19 @@ class Mask(ABC):
 
         return self.root.new(mask)
 
-    def duplicated(self, columns, keep="first"):
+    def duplicated(self, columns="*", keep="first", approx=False):
         """
         Find the rows that have duplicated values
 
-        :param keep:
+        :param keep: 'first', 'last' or False to mark all the duplicates
         :param columns:
+        :param approx: Use a Bloom filter in distributed engines. Some unique rows can be marked as duplicated
         :return:
         """
+        df = self.root
+        subset = parse_columns(df, columns)
 
-        dfd = self.root.data
-
-        if columns is not None:
-            subset = val_to_list(columns)
-            subset_df = dfd[subset]
-        else:
-            subset_df = dfd
-
-        mask = subset_df.duplicated(keep=keep, subset=columns)
-
-        return self.root.new(mask)
+        return self.root.new(df._duplicated(subset, keep, approx))
 
     def empty(self, col_name):
         """
@@ -209,11 +205,28 @@ class Mask(ABC):
     def credit_card_number(self, col_name="*"):
         return self.root[col_name].cols.to_string().cols.match(col_name, regex_credit_card_number)
 
-    def datetime(self, col_name="*"):
-        # df = self.root
-        # if df[col_name].cols.dtype  == df.constants.
-        return self.root.cols.apply(col_name, is_datetime)
-        # return self.root[col_name].cols.to_string().cols.match(col_name, regex_date)
+    def datetime(self, col_name="*", format=None):
+        """
+        Return True for the values that can be parsed as a date
+        :param col_name:
+        :param format: Date format. If None, the format set with set_dtype() or inferred by the profiler is used.
+        If there is none, the most common formats in the first values of the column are validated
+        :return:
+        """
+        df = self.root
+        result = df
+
+        for _col_name in parse_columns(df, col_name):
+            _format = format if format is not None else df.cols.datetime_format(_col_name)
+
+            if _format is None:
+                values = df.cols.select(_col_name).rows.limit(INFER_DATE_FORMAT_ROWS).to_pandas()[_col_name]
+                _format, _ = df.cols.infer_date_format(_col_name, values)
+
+            result = result.cols.apply(_col_name, lambda series, _f: df.functions.to_datetime(series, _f).notnull(),
+                                       args=(_format,))
+
+        return result
 
     def object(self, col_name="*"):
         return self.root[col_name].cols.apply(col_name, is_object)
@@ -1,11 +1,15 @@
 import copy
+import time
 
 from glom import glom, assign, delete
 
+from optimus.helpers.constants import ROWS_ACTIONS
 from optimus.helpers.core import val_to_list
 from optimus.infer import is_list_value
 
 ACTIONS_PATH = "transformations.actions"
+# Rows count and partition lengths. See BaseDataFrame._partition_lengths()
+ROWS_PATH = "rows"
 
 
 class Meta:
@@ -97,7 +101,10 @@ class Meta:
             value = [value]
         for v in value:
             meta = Meta.update(meta, ACTIONS_PATH, {name: v}, list)
-        return meta
+        if name in ROWS_ACTIONS:
+            meta = Meta.reset(meta, ROWS_PATH)
+        # Used to know if the buffer was created before the action
+        return Meta.set(meta, "last_action_time", time.time())
 
     @staticmethod
     def update(meta, path, value, default=list) -> dict:
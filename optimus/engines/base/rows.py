@@ -1,12 +1,14 @@
 from abc import abstractmethod, ABC
 
+import pandas as pd
 from multipledispatch import dispatch
 
 from optimus.engines.base.meta import Meta
 # This implementation works for Spark, Dask, dask_cudf
 from optimus.helpers.columns import parse_columns
-from optimus.helpers.constants import Actions
+from optimus.helpers.constants import COALESCE_FILTERS, Actions
 from optimus.helpers.core import one_list_to_val
+from optimus.helpers.raiseit import RaiseIt
 from optimus.infer import is_str, is_list_of_str_or_int
 
 
@@ -18,24 +20,49 @@ class BaseRows(ABC):
 
     @staticmethod
     @abstractmethod
-    def _sort(df, col_name, ascending):
+    def _sort(dfd, col_name, ascending):
+        """
+        Sort the rows by all the columns at once
+        :param col_name: list of columns
+        :param ascending: list of bool, one per column
+        """
         pass
 
+    @staticmethod
+    def _sort_keys(col_sort, order="desc"):
+        """
+        Split a sort specification in the columns names and their order
+        :param col_sort: list of columns or column and sort type combination (col_name, "asc")
+        :param order: order used for the columns given without one
+        :return: list of columns names, list of bool
+        """
+        col_names = []
+        ascending = []
+        for cs in col_sort:
+            if is_str(cs) or isinstance(cs, int):
+                col_name, col_order = cs, order
+            else:
+                col_name, col_order = one_list_to_val(cs[0]), cs[1]
+
+            if col_order != "asc" and col_order != "desc":
+                RaiseIt.value_error(col_order, ["asc", "desc"])
+
+            col_names.append(col_name)
+            ascending.append(col_order == "asc")
+
+        return col_names, ascending
+
     def _sort_multiple(self, dfd, meta, col_sort):
         """
-        Sort rows taking into account multiple columns
+        Sort rows taking into account multiple columns. All the columns are sorted in a single operation so the result
+        is ordered by the first column, then by the second one, and so on
         :param col_sort: column and sort type combination (col_name, "asc")
         :type col_sort: list of tuples
         """
+        col_names, ascending = self._sort_keys(col_sort)
+        dfd = self._sort(dfd, col_names, ascending)
 
-        for cs in col_sort:
-            col_name = one_list_to_val(cs[0])
-            order = cs[1]
-
-            if order != "asc" and order != "desc":
-                RaiseIt.value_error(order, ["asc", "desc"])
-
-            dfd = self._sort(dfd, col_name, True if order == "asc" else False)
+        for col_name in col_names:
             meta = Meta.action(meta, Actions.SORT_ROW.value, col_name)
 
         return dfd, meta
@@ -173,7 +200,18 @@ class BaseRows(ABC):
             dfd = dfd[expr]
         meta = Meta.action(df.meta, Actions.SELECT_ROW.value, df.cols.names())
 
-        df = self.root.new(dfd, meta=meta)
+        return self._coalesce(self.root.new(dfd, meta=meta))
+
+    def _coalesce(self, df):
+        """
+        Join the partitions a filter left almost empty. Only with COALESCE_FILTERS and if the rows count before the
+        filter is known, so the partitions are only joined if the filter removed most of the rows
+        :param df: Filtered dataframe
+        :return:
+        """
+        rows = Meta.get(self.root.meta, "rows.count")
+        if COALESCE_FILTERS and rows is not None:
+            df = df._auto_repartition(coalesce_only=True, filtered_rows=rows)
         return df
 
     def _count(self, compute=True) -> int:
@@ -187,7 +225,9 @@ class BaseRows(ABC):
         dfd = df.data
         # TODO: Be sure that we need the compute param
         if compute is True:
-            result = self._count(compute)
+            result = Meta.get(df.meta, "rows.count")
+            if result is None:
+                result = sum(df._partition_lengths())
         else:
             result = df.functions.delayed(len)(dfd)
         return result
@@ -235,7 +275,7 @@ class BaseRows(ABC):
     @dispatch(list)
     def sort(self, input_col):
         df = self.root
-        return df.rows.sort(input_col)
+        return df.rows.sort(input_col, "desc")
 
     @dispatch(list, str)
     def sort(self, input_col, order="desc"):
@@ -260,6 +300,48 @@ class BaseRows(ABC):
 
         return self.root.new(dfd, meta=meta)
 
+    def top_k(self, input_col, k=10, order="desc"):
+        """
+        Return the first k rows sorted by one or multiple columns without sorting the whole dataframe. Every partition
+        keeps its k first rows and only those are merged, so it is the shortcut for a sort followed by a limit
+        :param input_col: column, list of columns or column and sort type combination (col_name, "asc")
+        :param k: Number of rows
+        :param order: order used for the columns given without one, 'asc' or 'desc'
+        :return: Optimus Dataframe with k rows at most
+        """
+        df = self.root
+
+        if is_str(input_col):
+            input_col = [input_col]
+        elif isinstance(input_col, dict):
+            input_col = list(input_col.items())
+
+        col_names, ascending = self._sort_keys(input_col, order)
+
+        def _top_k(pdf):
+            key = pdf[col_names[0]]
+            # Only the rows with one of the k first values of the first column can be in the result. nsmallest/nlargest
+            # find them without sorting, so only those rows are sorted by all the columns
+            if 0 < k <= key.count() and pd.api.types.is_numeric_dtype(key) and not pd.api.types.is_bool_dtype(key):
+                if ascending[0]:
+                    pdf = pdf[key <= key.nsmallest(k).iloc[-1]]
+                else:
+                    pdf = pdf[key >= key.nlargest(k).iloc[-1]]
+            return pdf.sort_values(col_names, ascending=ascending).head(k)
+
+        @df.functions.delayed
+        def _merge(pdfs):
+            return _top_k(pd.concat(pdfs))
+
+        partitions = [df.functions.delayed(_top_k)(part) for part in df.functions.to_delayed(df.data)]
+        dfd = df.functions.from_delayed([_merge(partitions)], meta=getattr(df.data, "_meta", None))
+
+        meta = df.meta
+        for col_name in col_names:
+            meta = Meta.action(meta, Actions.SORT_ROW.value, col_name)
+
+        return self.root.new(dfd, meta=meta)
+
     def reverse(self):
         """
 
@@ -284,7 +366,7 @@ class BaseRows(ABC):
                 where = eval(where)
         dfd = dfd[where.get_series()==0]
         meta = Meta.action(df.meta, Actions.DROP_ROW.value, df.cols.names())
-        return self.root.new(dfd, meta=meta)
+        return self._coalesce(self.root.new(dfd, meta=meta))
 
     @staticmethod
     @abstractmethod
@@ -310,17 +392,20 @@ class BaseRows(ABC):
         meta = Meta.action(df.meta, Actions.DROP_ROW.value, df.cols.names())
         return self.root.new(df.data.dropna(how=how, subset=subset), meta=meta)
 
-    @staticmethod
-    @abstractmethod
-    def drop_duplicates(input_cols=None):
+    def drop_duplicates(self, subset=None, keep="first", approx=False):
         """
         Drop duplicates values in a dataframe
-        :param input_cols: List of columns to make the comparison, this only  will consider this subset of columns,
+        :param subset: List of columns to make the comparison, this only  will consider this subset of columns,
+        :param keep: Row to keep when find a duplicate. 'first', 'last' or False to drop all the duplicates
+        :param approx: Use a Bloom filter in distributed engines. It streams the partitions instead of shuffling,
+        but some unique rows can be dropped
         :return: Return a new DataFrame with duplicate rows removed
-        :param input_cols:
-        :return:
         """
-        pass
+        df = self.root
+        subset = parse_columns(df, subset)
+        dfd = df.data[~df._duplicated(subset, keep, approx)]
+        meta = Meta.action(df.meta, Actions.DROP_ROW.value, df.cols.names())
+        return self._coalesce(self.root.new(dfd, meta=meta))
 
     def limit(self, count=10):
         """
@@ -328,7 +413,9 @@ class BaseRows(ABC):
         :param count:
         :return:
         """
-        return self.root.new(self.root.data[:count - 1])
+        df = self.root
+        meta = Meta.action(df.meta, Actions.LIMIT_ROW.value, df.cols.names())
+        return self.root.new(df.data.head(count), meta=meta)
 
     def is_in(self, input_cols, values, output_cols=None):
 
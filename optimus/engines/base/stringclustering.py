@@ -1,6 +1,15 @@
 import copy
+import functools
+import re
+import string
+
+import dask
+import numpy as np
+import pandas as pd
+
 from optimus.engines.base.ml.contants import FINGERPRINT_COL
 from optimus.helpers.columns import parse_columns, name_col
+from optimus.helpers.raiseit import RaiseIt
 
 
 class Clusters:
@@ -64,40 +73,314 @@ class Clusters:
     def display(self, columns="*", limit_clusters = None, limit_suggestions = None, verbose=True):
         return self.to_dict(columns, limit_clusters, limit_suggestions, verbose)
 
-def fingerprint(df, input_cols):
+
+# Punctuation and control characters are removed before tokenizing, like the OpenRefine keyers
+PUNCTUATION_REGEX = "[" + re.escape(string.punctuation) + "\x00-\x08\x0b-\x1f\x7f]"
+
+# Soundex codes. The vowels are coded as "0" so they separate repeated codes, and h and w are removed
+SOUNDEX_TABLE = str.maketrans("AEIOUYBFPVCGJKQSXZDTLMNR", "000000111122222222334556", "HW")
+
+
+def by_distinct(func):
     """
-    Create the fingerprint for a column
-    :param df: Dataframe to be processed
-    :param input_cols: Column to be processed
+    Decorator to calculate a key only once for every distinct value in a pandas series.
+    Missing values get a missing key. cuDF series are keyed in host memory and returned as cuDF
+    :param func: Function that receives a series of distinct strings and returns their keys
     :return:
     """
 
-    # https://github.com/OpenRefine/OpenRefine/blob/master/main/src/com/google/refine/clustering/binning/FingerprintKeyer.java#L56
-    def _split_sort_remove_join(value):
-        """
-        Helper function to split, remove duplicates, sort and join back together
-        """
-        # Split into whitespace-separated token
-        # print("value", type(value), value)
-        split_key = value.split()
+    def wrapper(series, *args, **kwargs):
+        if hasattr(series, "to_pandas"):
+            import cudf
+            return cudf.from_pandas(wrapper(series.to_pandas(), *args, **kwargs))
 
-        # Sort and remove duplicated items
-        split_key = sorted(set(split_key))
+        codes, uniques = pd.factorize(series)
+        keys = func(pd.Series(uniques, dtype=object).astype(str), *args, **kwargs).to_numpy(dtype=object)
+        keys = np.append(keys, None)
+        # Missing values have code -1, the last position
+        return pd.Series(keys[codes], index=series.index, dtype=object)
 
-        # join the tokens back together
-        return "".join(split_key)
+    return wrapper
 
-    input_cols = parse_columns(df, input_cols)
-    for input_col in input_cols:
-        output_col = name_col(input_col, FINGERPRINT_COL)
-        df = (df
-              .cols.trim(input_col, output_col)
-              .cols.lower(output_col)
-              .cols.remove_special_chars(output_col)
-              .cols.normalize_chars(output_col)
-              .cols.apply(output_col, _split_sort_remove_join, "string", mode="map")
-              )
-    return df
+
+def _normalize(series):
+    # Trim, lower case, remove accents and punctuation
+    series = series.str.strip().str.lower()
+    series = series.str.normalize("NFKD").str.encode("ascii", errors="ignore").str.decode("ascii")
+    return series.str.replace(PUNCTUATION_REGEX, "", regex=True)
+
+
+@by_distinct
+def fingerprint_keys(series):
+    """
+    Fingerprint keyer. Split the normalized value in words, remove the duplicated ones and sort them.
+    'Optimus, the prime' and 'prime the optimus' get the same key
+    https://github.com/OpenRefine/OpenRefine/wiki/Clustering-In-Depth
+    :param series: pandas series
+    :return:
+    """
+    return _normalize(series).str.split().map(lambda tokens: " ".join(sorted(set(tokens))))
+
+
+@by_distinct
+def n_gram_keys(series, n_size=2):
+    """
+    N-gram fingerprint keyer. Remove the white spaces of the normalized value and sort its distinct n-grams.
+    It matches values with typos or words that were joined or split
+    :param series: pandas series
+    :param n_size: Size of the n-grams
+    :return:
+    """
+    series = _normalize(series).str.replace(r"\s+", "", regex=True)
+    return series.map(lambda value: "".join(sorted({value[i:i + n_size] for i in range(len(value) - n_size + 1)})))
+
+
+def soundex(series):
+    """
+    Soundex code of every word in a series of words
+    :param series: pandas series of uppercase words with only ascii letters
+    :return:
+    """
+    first = series.str[0]
+    # The first letter is kept. It is coded too, only to skip the next letter when it has the same code
+    codes = first.str.translate(SOUNDEX_TABLE).replace("", "-") + series.str[1:].str.translate(SOUNDEX_TABLE)
+    codes = codes.str.replace(r"(\d)\1+", r"\1", regex=True).str[1:].str.replace("0", "", regex=False)
+    return first + (codes + "000").str[:3]
+
+
+@by_distinct
+def phonetic_keys(series):
+    """
+    Phonetic keyer. The soundex code of every word in the normalized value, without duplicates and sorted.
+    It matches values that sound similar like 'Jon Smith' and 'John Smyth'
+    :param series: pandas series
+    :return:
+    """
+    words = _normalize(series).str.upper().str.replace("[^A-Z\\s]", "", regex=True).str.split().explode()
+    words = words[words.str.len() > 0]
+    keys = soundex(words)
+    keys = keys.groupby(level=0).agg(lambda codes: " ".join(sorted(set(codes))))
+    return keys.reindex(series.index).fillna("")
+
+
+def _segments(length, threshold):
+    """
+    Split a string length in threshold + 1 segments. If the edit distance between two strings is not greater than
+    threshold at least one segment of a string is not edited and is found in the other string (pass-join)
+    :param length:
+    :param threshold:
+    :return: list of (start, length) of every segment
+    """
+    n = threshold + 1
+    size, extra = divmod(length, n)
+    segments = []
+    start = 0
+    for i in range(n):
+        _size = size + (1 if i >= n - extra else 0)
+        segments.append((start, _size))
+        start += _size
+    return segments
+
+
+def candidate_pairs(series, threshold):
+    """
+    Pairs of strings that could be within a edit distance without comparing every string with all the others.
+    Every string is indexed by its segments and only the strings with a substring equal to a segment, near the
+    segment position and with a similar length are candidates. The pairs are returned by chunks, one for every string
+    length, to bound the memory used
+    :param series: pandas series of distinct strings
+    :param threshold: Max edit distance
+    :return: generator of numpy arrays with the positions of the strings of every pair
+    """
+    series = series.reset_index(drop=True)
+    by_length = {length: group for length, group in series.groupby(series.str.len())}
+
+    for length, group in by_length.items():
+        segments = []
+        substrings = []
+        for i, (start, size) in enumerate(_segments(length, threshold)):
+            segments.append(pd.DataFrame({"segment": i, "value": group.str[start:start + size], "left": group.index}))
+
+            # Only compare with strings of the same length or longer. The shorter ones are compared in their chunk
+            for _length in range(length, length + threshold + 1):
+                if _length not in by_length:
+                    continue
+                _group = by_length[_length]
+                for position in range(max(start - threshold, 0), min(start + threshold, _length - size) + 1):
+                    substrings.append(pd.DataFrame({"segment": i, "value": _group.str[position:position + size],
+                                                    "right": _group.index}))
+
+        pairs = pd.concat(segments).merge(pd.concat(substrings), on=["segment", "value"])
+        left = pairs["left"].to_numpy(dtype=np.int64)
+        right = pairs["right"].to_numpy(dtype=np.int64)
+
+        # Every pair once
+        left, right = np.minimum(left, right), np.maximum(left, right)
+        pairs = pd.unique(left[left != right] * len(series) + right[left != right])
+        yield pairs // len(series), pairs % len(series)
+
+
+def _levenshtein_pairs(chars, offsets, left, right, threshold):
+    """
+    Edit distance of every pair of strings. Only the cells of the matrix that can be lower than threshold are
+    calculated, and the computation stops when the distance is greater than threshold
+    :param chars: Code points of all the strings
+    :param offsets: Position of every string in chars
+    :param left: Position of the first string of every pair
+    :param right: Position of the second string of every pair
+    :param threshold:
+    :return: distances. threshold + 1 for the pairs that are farther than threshold
+    """
+    far = threshold + 1
+    result = np.empty(len(left), dtype=np.int64)
+    # Two rows of the matrix. They are reused by all the pairs
+    size = np.max(offsets[1:] - offsets[:-1]) + 2 if len(offsets) > 1 else 2
+    previous = np.empty(size, dtype=np.int64)
+    current = np.empty(size, dtype=np.int64)
+
+    for n in range(len(left)):
+        a = chars[offsets[left[n]]:offsets[left[n] + 1]]
+        b = chars[offsets[right[n]]:offsets[right[n] + 1]]
+        if abs(len(a) - len(b)) > threshold:
+            result[n] = far
+            continue
+
+        for j in range(len(b) + 2):
+            previous[j] = min(j, far)
+            current[j] = far
+        distance = previous[len(b)]
+        for i in range(1, len(a) + 1):
+            start = max(1, i - threshold)
+            end = min(len(b), i + threshold)
+            current[start - 1] = min(i, far) if start == 1 else far
+            row_min = current[start - 1]
+            for j in range(start, end + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost, far)
+                row_min = min(row_min, current[j])
+            current[end + 1] = far
+            previous, current = current, previous
+            distance = previous[len(b)]
+            # The distance can only grow from the minimum of a row
+            if row_min > threshold:
+                distance = far
+                break
+        result[n] = min(distance, far)
+    return result
+
+
+def _union_find(size, left, right):
+    """
+    Connected components of a graph
+    :param size: Number of nodes
+    :param left: First node of every edge
+    :param right: Second node of every edge
+    :return: component of every node
+    """
+    parent = np.arange(size)
+    for n in range(len(left)):
+        a = left[n]
+        while parent[a] != a:
+            a = parent[a]
+        b = right[n]
+        while parent[b] != b:
+            b = parent[b]
+        if a != b:
+            parent[max(a, b)] = min(a, b)
+    for n in range(size):
+        parent[n] = parent[parent[n]]
+    return parent
+
+
+@functools.lru_cache(maxsize=1)
+def _kernels():
+    # numba is optional. The kernels are compiled the first time they are used
+    try:
+        import numba
+        return numba.njit(_levenshtein_pairs), numba.njit(_union_find)
+    except ImportError:
+        return _levenshtein_pairs, _union_find
+
+
+def levenshtein_distances(series, left, right, threshold):
+    """
+    Edit distance between pairs of strings
+    :param series: pandas series of strings
+    :param left: Position in the series of the first string of every pair
+    :param right: Position in the series of the second string of every pair
+    :param threshold: Max distance calculated. The pairs farther than threshold get threshold + 1
+    :return: numpy array
+    """
+    chars, offsets = _encode(series)
+    levenshtein_pairs, _ = _kernels()
+    return levenshtein_pairs(chars, offsets, np.asarray(left, dtype=np.int64), np.asarray(right, dtype=np.int64),
+                             threshold)
+
+
+def _encode(series):
+    # Code points of all the strings in one array so the strings can be passed to numba
+    encoded = [np.frombuffer(value.encode("utf-32-le"), dtype=np.uint32) for value in series]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(value) for value in encoded])
+    chars = np.concatenate(encoded) if encoded else np.array([], dtype=np.uint32)
+    return chars, offsets
+
+
+@by_distinct
+def levenshtein_keys(series, threshold=1):
+    """
+    Nearest neighbor keyer. Values whose fingerprints are within a edit distance get the same key. Distances are only
+    calculated between the candidates that share a segment, see candidate_pairs. Clusters are connected, so if 'a' is
+    near 'b' and 'b' is near 'c' the three values get the same key
+    :param series: pandas series of distinct values
+    :param threshold: Max edit distance
+    :return:
+    """
+    fingerprints = fingerprint_keys(series)
+    fingerprints = fingerprints.where(fingerprints != "")
+    codes, uniques = pd.factorize(fingerprints)
+    uniques = pd.Series(uniques, dtype=object)
+
+    chars, offsets = _encode(uniques)
+    levenshtein_pairs, union_find = _kernels()
+
+    edges_left, edges_right = [np.array([], dtype=np.int64)], [np.array([], dtype=np.int64)]
+    for left, right in candidate_pairs(uniques, threshold):
+        near = levenshtein_pairs(chars, offsets, left, right, threshold) <= threshold
+        edges_left.append(left[near])
+        edges_right.append(right[near])
+
+    components = union_find(len(uniques), np.concatenate(edges_left), np.concatenate(edges_right))
+
+    # Values without fingerprint get a missing key
+    keys = components[codes].astype(object)
+    keys[codes < 0] = None
+    return pd.Series(keys, index=series.index, dtype=object)
+
+
+KEYERS = {"fingerprint": fingerprint_keys, "n_gram_fingerprint": n_gram_keys, "phonetic_fingerprint": phonetic_keys,
+          "levenshtein": levenshtein_keys}
+
+
+def keyer(algorithm):
+    """
+    Get the keyer of a clustering algorithm
+    :param algorithm: 'fingerprint', 'n_gram_fingerprint', 'phonetic_fingerprint' or 'levenshtein'
+    :return:
+    """
+    if algorithm not in KEYERS:
+        RaiseIt.value_error(algorithm, list(KEYERS.keys()))
+    return KEYERS[algorithm]
+
+
+def fingerprint(df, input_cols):
+    """
+    Create the fingerprint for a column
+    :param df: Dataframe to be processed
+    :param input_cols: Column to be processed
+    :return:
+    """
+    return _fingerprint(df, input_cols, "fingerprint")
 
 
 def n_gram_fingerprint(df, input_cols, n_size=2):
@@ -108,55 +391,99 @@ def n_gram_fingerprint(df, input_cols, n_size=2):
     :param n_size:
     :return:
     """
+    return _fingerprint(df, input_cols, "n_gram_fingerprint", n_size)
 
-    def calculate_ngrams(value, args):
-        # remove white spaces
-        ngram = list(ngrams(value, n_size))
 
-        # sort and remove duplicated
-        ngram = sorted(set(ngram))
+def phonetic_fingerprint(df, input_cols):
+    """
+    Calculate the phonetic fingerprint for a column
+    :param df: Dataframe to be processed
+    :param input_cols: Columns to be processed
+    :return:
+    """
+    return _fingerprint(df, input_cols, "phonetic_fingerprint")
 
-        _result = ""
-        for item in ngram:
-            for i in item:
-                _result = _result + i
 
-        # join the tokens back together
-        _result = "".join(_result)
+def _fingerprint(df, input_cols, algorithm, *args):
+    keyer(algorithm)
+    input_cols = parse_columns(df, input_cols)
+    # Every engine calculates the keys with the keyers in this module. See Functions.fingerprint
+    return df.cols.apply(input_cols, getattr(df.functions, algorithm), args=args,
+                         output_cols=[name_col(input_col, FINGERPRINT_COL) for input_col in input_cols])
 
-        return _result
 
-    input_cols = parse_columns(df, input_cols)
+def fingerprint_cluster(df, input_cols, output: str = "dict"):
+    return base_clustering_function(df, input_cols, output, algorithm="fingerprint")
 
-    for input_col in input_cols:
-        ngram_fingerprint_col = name_col(input_col, FINGERPRINT_COL)
-        # ngram_fingerprint_col = name_col(input_col, NGRAM_FINGERPRINT_COL)
 
-        df = (df
-              .cols.copy(input_col, ngram_fingerprint_col)
-              .cols.lower(ngram_fingerprint_col)
-              .cols.remove_white_spaces(ngram_fingerprint_col)
-              .cols.apply(ngram_fingerprint_col, calculate_ngrams, "string", output_cols=ngram_fingerprint_col)
-              .cols.remove_special_chars(ngram_fingerprint_col)
-              .cols.normalize_chars(ngram_fingerprint_col)
+def n_gram_fingerprint_cluster(df, input_cols, n_size=2, output: str = "dict"):
+    return base_clustering_function(df, input_cols, output, algorithm="n_gram_fingerprint", args=[n_size])
 
-              )
 
-    return df
+def phonetic_fingerprint_cluster(df, input_cols, output: str = "dict"):
+    return base_clustering_function(df, input_cols, output, algorithm="phonetic_fingerprint")
 
 
-def fingerprint_cluster(df, input_cols, output: str = "dict"):
-    return base_clustering_function(df, input_cols, output, func=fingerprint, args=[input_cols])
+def levenshtein_cluster(df, input_cols, threshold=1, output: str = "dict"):
+    return base_clustering_function(df, input_cols, output, algorithm="levenshtein", args=[threshold])
 
 
-def n_gram_fingerprint_cluster(df, input_cols, n_size=2, output: str = "dict"):
-    return base_clustering_function(df, input_cols, output, func=n_gram_fingerprint, args=[input_cols, n_size])
+def clusters_from_counts(value_counts, func, *args):
+    """
+    Group the distinct values of a column by their key
+    :param value_counts: pandas series with the distinct values as index and its count as value
+    :param func: Keyer. Function to calculate the key of a pandas series of values
+    :param args: Arguments passed to the keyer
+    :return: list of clusters sorted by its number of distinct values and its count.
+    """
+    pdf = pd.DataFrame({"value": value_counts.index, "count": value_counts.to_numpy()})
+    pdf["key"] = func(pdf["value"], *args).to_numpy()
+    pdf = pdf[pdf["key"].notnull() & (pdf["key"] != "")]
+
+    # Only the keys shared by more than one distinct value make a cluster
+    pdf = pdf[pdf.duplicated("key", keep=False)]
+    # The most common value is the suggestion. Ties are sorted alphabetically so every engine gets the same result
+    pdf = pdf.sort_values(["key", "count", "value"], ascending=[True, False, True])
+
+    grouped = pdf.groupby("key", sort=False)
+    result = pd.DataFrame({"suggestions": grouped["value"].agg(list), "counts": grouped["count"].agg(list),
+                           "suggestions_size": grouped.size(), "total_count": grouped["count"].sum()})
+    result = result.sort_values(["suggestions_size", "total_count"], ascending=False, kind="mergesort")
 
+    return [{"suggestion": suggestions[0], "suggestions": suggestions, "counts": counts,
+             "suggestions_size": int(size), "total_count": int(total)}
+            for suggestions, counts, size, total in
+            zip(result["suggestions"], result["counts"], result["suggestions_size"], result["total_count"])]
 
-def base_clustering_function(df, input_cols, output, func=None, args=None):
+
+def base_clustering_function(df, input_cols, output, algorithm="fingerprint", args=None):
     """
-    Cluster a dataframe column based on the Fingerprint algorithm
+    Cluster the values in a column using a key collision method. The values are counted first, so the key is only
+    calculated for every distinct value
+    :param df: Dataframe to be processed
+    :param input_cols: Columns to be processed
+    :param output: 'dict' to return a Clusters object, 'dataframe' to return a pandas dataframe for every column
+    :param algorithm: 'fingerprint', 'n_gram_fingerprint', 'phonetic_fingerprint' or 'levenshtein'
+    :param args: Arguments passed to the keyer
     :return:
     """
+    args = args or []
+    func = keyer(algorithm)
+
+    input_cols = parse_columns(df, input_cols)
+    dfd = df.data
+
+    value_counts = dask.compute(*[dfd[input_col].value_counts() for input_col in input_cols])
+
+    clusters = {}
+    for input_col, _value_counts in zip(input_cols, value_counts):
+        if not isinstance(_value_counts, pd.Series):
+            _value_counts = _value_counts.to_pandas()
+        clusters[input_col] = clusters_from_counts(_value_counts, func, *args)
+
+    if output == "dataframe":
+        return {input_col: pd.DataFrame(_clusters) for input_col, _clusters in clusters.items()}
 
-    raise
+    result = Clusters(clusters)
+    result.type = algorithm
+    return result
@@ -44,7 +44,7 @@ class CUDFDataFrame(BaseDataFrame):
         return constants(self)
 
     def _buffer_window(self, input_cols, lower_bound, upper_bound):
-        return PandasDataFrame(self.data[input_cols][lower_bound: upper_bound].to_pandas())
+        return PandasDataFrame(self.data[input_cols].iloc[lower_bound: upper_bound].to_pandas())
 
     def encoding(self):
         pass
@@ -2,7 +2,8 @@
 
 import cudf
 
-from optimus.engines.base.commons.functions import to_float_cudf, to_integer_cudf
+from optimus.engines.base.commons.functions import to_float_cudf, to_integer_cudf, to_datetime_cudf
+from optimus.engines.base.commons.nlp import remove_stopwords_cudf, stopwords
 from optimus.engines.base.functions import Functions
 
 
@@ -11,6 +12,10 @@ class CUDFFunctions(Functions):
     def word_tokenize(self, series):
         pass
 
+    @staticmethod
+    def remove_stopwords(series, language="english"):
+        return remove_stopwords_cudf(series, stopwords(language))
+
     def to_float(self, series):
         return to_float_cudf(series)
 
@@ -114,6 +119,9 @@ class CUDFFunctions(Functions):
         else:
             return series
 
+    def to_datetime(self, series, format):
+        return to_datetime_cudf(series, format)
+
     def date_format(self, series, current_format=None, output_format=None):
 
         # Some formats are no supported yet. https://github.com/rapidsai/cudf/issues/5991
@@ -145,8 +145,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
         
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
         
         file, file_name = prepare_path(path, "avro")[0]
 
@@ -174,8 +173,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
         
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
         
         file, file_name = prepare_path(path, "orc")[0]
 
@@ -203,8 +201,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
         
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "xls")
 
@@ -2,15 +2,18 @@
 # Must return None if the data type can not be handle
 
 
-from datetime import datetime, timedelta
-
 import dask
 import dask.array as da
-import pandas as pd
+import dask.dataframe as dd
 from dask.array import stats
 
-from optimus.engines.base.commons.functions import to_float, to_integer, to_boolean, to_datetime, word_tokenize
+from optimus.engines.base.commons.functions import to_float, to_integer, to_boolean, to_datetime, split, \
+    unnest_array, nest_array
+from optimus.engines.base.commons.nlp import stopwords, remove_stopwords, word_tokenize
+from optimus.engines.base.commons.url import split_hosts
 from optimus.engines.base.functions import Functions
+from optimus.engines.base.stringclustering import fingerprint_keys, n_gram_keys, phonetic_keys
+from optimus.helpers.check import is_dask_series
 from optimus.helpers.core import val_to_list
 
 
@@ -27,8 +30,8 @@ class DaskFunctions(Functions):
 
         return wrapper
 
-    def from_delayed(self, delayed):
-        return dask.dataframe.from_delayed(delayed)
+    def from_delayed(self, delayed, meta=None):
+        return dask.dataframe.from_delayed(delayed, meta=meta)
 
     def to_delayed(self, value):
         return value.to_delayed()
@@ -53,8 +56,13 @@ class DaskFunctions(Functions):
             return series
         return series.astype(str)
 
-    def word_tokenize(self, value):
-        return word_tokenize(value)
+    @staticmethod
+    def word_tokenize(series):
+        return series.map_partitions(word_tokenize, meta=(series.name, object))
+
+    @staticmethod
+    def remove_stopwords(series, language="english"):
+        return series.map_partitions(remove_stopwords, stopwords(language), meta=(series.name, object))
 
     def count_zeros(self, series, *args):
         return int((self._to_float(series).values == 0).sum())
@@ -137,14 +145,37 @@ class DaskFunctions(Functions):
         # str.decode return a float column. We are forcing to return a string again
         return series.str.normalize("NFKD").str.encode('ascii', errors='ignore').str.decode('utf8').astype(str)
 
-    def date_format(self, series, current_format=None, output_format=None):
-        return pd.to_datetime(series, format=current_format, errors="coerce").dt.strftime(output_format)
+    @staticmethod
+    def split_hosts(series):
+        return series.map_partitions(split_hosts, meta={"subdomain": object, "domain": object, "top_domain": object})
+
+    @staticmethod
+    def split(series, separator, splits):
+        return series.map_partitions(split, separator, splits, meta={i: object for i in range(splits)})
+
+    @staticmethod
+    def unnest_array(series, splits):
+        return series.map_partitions(unnest_array, splits, meta={i: object for i in range(splits)})
+
+    @staticmethod
+    def nest_array(dfd):
+        return dfd.map_partitions(nest_array, meta=(None, object))
+
+    @staticmethod
+    def fingerprint(series):
+        return series.map_partitions(fingerprint_keys, meta=(series.name, object))
+
+    @staticmethod
+    def n_gram_fingerprint(series, n_size=2):
+        return series.map_partitions(n_gram_keys, n_size, meta=(series.name, object))
 
-    def years_between(self, series, date_format=None):
-        return (pd.to_datetime(series, format=date_format,
-                               errors="coerce").dt.date - datetime.now().date()) / timedelta(days=365)
+    @staticmethod
+    def phonetic_fingerprint(series):
+        return series.map_partitions(phonetic_keys, meta=(series.name, object))
 
     def to_datetime(self, series, format):
+        if is_dask_series(series):
+            return dd.to_datetime(series, format=format, errors="coerce")
         return to_datetime(series, format)
 
     def replace_chars(self, series, search, replace_by):
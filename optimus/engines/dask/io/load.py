@@ -3,11 +3,15 @@ import ntpath
 import dask.bag as dask_bag
 import pandas as pd
 from dask import dataframe as dd
+from dask.delayed import delayed
 
 import optimus.helpers.functions_spark
+from optimus.engines.base.io.arrow import arrow_files, arrow_info, read_pandas, table_meta, to_pandas
 from optimus.engines.base.io.load import BaseLoad
+from optimus.engines.base.io.parquet import parquet_count, parquet_head
 from optimus.engines.base.meta import Meta
 from optimus.engines.dask.dataframe import DaskDataFrame
+from optimus.helpers.constants import AUTO_REPARTITION
 from optimus.helpers.core import val_to_list
 from optimus.helpers.functions import prepare_path, unquote_path
 from optimus.helpers.logger import logger
@@ -35,8 +39,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         try:
             # TODO: Check a better way to handle this Spark.instance.spark. Very verbose.
@@ -66,7 +69,7 @@ class Load(BaseLoad):
     @staticmethod
     def csv(path, sep=',', header=True, infer_schema=True, na_values=None, encoding="utf-8", n_rows=-1, cache=False,
             quoting=0, lineterminator=None, error_bad_lines=False, engine="c", keep_default_na=False,
-            na_filter=False, null_value=None, storage_options=None, conn=None, n_partitions=1, *args, **kwargs):
+            na_filter=False, null_value=None, storage_options=None, conn=None, n_partitions="auto", *args, **kwargs):
 
         """
         Return a dataframe from a csv file. It is the same read.csv Spark function with some predefined
@@ -86,6 +89,7 @@ class Load(BaseLoad):
         :param error_bad_lines:
         :param keep_default_na:
         :param cache: If calling from a url we cache save the path to the temp file so we do not need to download the file again
+        :param n_partitions: Number of partitions. 'auto' fits the partitions to PARTITION_SIZE bytes in memory
 
         """
 
@@ -95,8 +99,7 @@ class Load(BaseLoad):
             prepare_path.cache_clear()
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         remove_param = "chunk_size"
         if kwargs.get(remove_param):
@@ -123,11 +126,17 @@ class Load(BaseLoad):
                                   keep_default_na=True, na_values=None, engine=engine, na_filter=na_filter,
                                   storage_options=storage_options, low_memory=False, *args, **kwargs)
 
-            if n_rows > -1:
-                dfd = dd.from_pandas(dfd.head(n=n_rows), npartitions=1).reset_index(drop=True)
-
             df = DaskDataFrame(dfd)
             df.meta = Meta.set(df.meta, value={"file_name": path, "name": ntpath.basename(path)})
+
+            # dd.read_csv does not support nrows. Only the leading blocks of the file are read by limit
+            if n_rows > -1:
+                df = df.rows.limit(n_rows)
+            elif n_partitions == "auto":
+                if AUTO_REPARTITION:
+                    df = df._auto_repartition(estimate=True)
+            elif n_partitions is not None:
+                df = df.repartition(n_partitions)
         except IOError as error:
             logger.print(error)
             raise
@@ -135,12 +144,13 @@ class Load(BaseLoad):
         return df
 
     @staticmethod
-    def parquet(path, columns=None, engine="pyarrow", storage_options=None, conn=None, *args, **kwargs):
+    def parquet(path, columns=None, engine="pyarrow", n_rows=-1, storage_options=None, conn=None, *args, **kwargs):
         """
         Return a dataframe from a parquet file.
         :param path: path or location of the file. Must be string dataType
         :param columns: select the columns that will be loaded. In this way you do not need to load all the dataframe
         :param engine:
+        :param n_rows: Number of rows to be loaded. Only the row groups with the first n_rows rows are read
         :param args: custom argument to be passed to the spark parquet function
         :param kwargs: custom keyword arguments to be passed to the spark parquet function
         :return: Spark Dataframe
@@ -149,15 +159,75 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         try:
+            if n_rows > -1 and not args and not kwargs:
+                pdf = parquet_head(path, n_rows, columns, storage_options)
+                df = DaskDataFrame(dd.from_pandas(pdf.reset_index(drop=True), npartitions=1))
+                df.meta = Meta.set(df.meta, "file_name", path)
+                return df
+
             dfd = dd.read_parquet(path, columns=columns, engine=engine, storage_options=storage_options, *args,
                                   **kwargs)
             df = DaskDataFrame(dfd)
             df.meta = Meta.set(df.meta, "file_name", path)
 
+            # Filters change the rows read, so the count in the files metadata can only be used without them
+            if not kwargs.get("filters"):
+                df.meta = Meta.set(df.meta, "rows.count", parquet_count(path, storage_options))
+
+            if n_rows > -1:
+                df = df.rows.limit(n_rows)
+            elif AUTO_REPARTITION:
+                df = df._auto_repartition(estimate=True)
+
+        except IOError as error:
+            logger.print(error)
+            raise
+
+        return df
+
+    @staticmethod
+    def arrow(path, columns=None, batches_per_partition=16, storage_options=None, conn=None, *args, **kwargs):
+        """
+        Return a dataframe from Arrow IPC (Feather) files. Every partition is a range of record batches that is read
+        from a memory mapped file, so only the footer of the files is read when the dataframe is created.
+        :param path: path or location of the file. A folder with multiple Arrow files is also accepted
+        :param columns: select the columns that will be loaded. In this way you do not need to load all the dataframe
+        :param batches_per_partition: Number of record batches in every partition
+        :param storage_options:
+        :param conn:
+        :return:
+        """
+
+        path = unquote_path(path)
+
+        if conn is not None:
+            path, storage_options = conn.source(path)
+
+        try:
+            files = arrow_files(path, storage_options)
+            schema, _ = arrow_info(files[0], storage_options)
+            meta_df = to_pandas(schema.empty_table())
+            if columns is not None:
+                meta_df = meta_df[columns]
+
+            parts = []
+            for file in files:
+                _, num_batches = arrow_info(file, storage_options)
+                if num_batches is None:
+                    parts.append(delayed(read_pandas)(file, columns, storage_options=storage_options))
+                else:
+                    for start in range(0, max(num_batches, 1), batches_per_partition):
+                        parts.append(delayed(read_pandas)(file, columns, start, start + batches_per_partition,
+                                                          storage_options))
+
+            dfd = dd.from_delayed(parts, meta=meta_df)
+            df = DaskDataFrame(dfd)
+            meta = table_meta(schema)
+            df.meta = Meta.set(meta, value={**meta, "file_name": path, "name": ntpath.basename(path)})
+
         except IOError as error:
             logger.print(error)
             raise
@@ -220,8 +290,7 @@ class Load(BaseLoad):
             prepare_path.cache_clear()
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         try:
             # From the panda docs using na_filter
@@ -251,8 +320,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "avro")
 
@@ -282,8 +350,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path)
         header = None
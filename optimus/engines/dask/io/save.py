@@ -1,5 +1,14 @@
 import os
 
+import dask
+from dask.delayed import delayed
+from fsspec.core import get_fs_token_paths
+
+from optimus.engines.base.io.arrow import remove_arrow_files, write_table
+from optimus.engines.base.io.json_lines import BATCH_SIZE, write_json_lines
+from optimus.engines.base.io.parquet import parquet_column_name
+from optimus.helpers.core import val_to_list
+from optimus.helpers.raiseit import RaiseIt
 from optimus.helpers.logger import logger
 from optimus.helpers.functions import prepare_path_local, path_is_local
 
@@ -8,16 +17,16 @@ class Save:
     def __init__(self, root):
         self.root = root
 
-    def json(self, path, storage_options=None, conn=None, *args, **kwargs):
+    def json(self, path, lines=True, batch_size=BATCH_SIZE, compression=None, use_orjson=False,
+             storage_options=None, conn=None, *args, **kwargs):
         """
         Save data frame in a json file
         :param path: path where the spark will be saved.
-        :param mode: Specifies the behavior of the save operation when data already exists.
-                "append": Append contents of this DataFrame to existing data.
-                "overwrite" (default case): Overwrite existing data.
-                "ignore": Silently ignore this operation if data already exists.
-                "error": Throw an exception if data already exists.
-        :param num_partitions: the number of partitions of the DataFrame
+        :param lines: Save the data in JSON lines format. Every partition is written in parallel to its own file and
+        the rows are serialized incrementally in batches so the whole serialized string is never in memory
+        :param batch_size: Number of rows serialized at a time in JSON lines format
+        :param compression: 'gzip', 'bz2' or None
+        :param use_orjson: Use orjson to serialize the rows in JSON lines format
         :return:
         """
         
@@ -28,14 +37,21 @@ class Save:
             storage_options = conn.storage_options
 
         try:
-            os.makedirs(path, exist_ok=True)
-            df.to_json(filename=path, storage_options=storage_options, *args, **kwargs)
+            if path_is_local(path):
+                os.makedirs(path, exist_ok=True)
+
+            if lines:
+                ext = {"gzip": ".json.gz", "bz2": ".json.bz2"}.get(compression, ".json")
+                path = path.rstrip("/")
+                parts = [delayed(write_json_lines)(part, f"{path}/part.{i}{ext}", batch_size, compression, use_orjson,
+                                                   storage_options) for i, part in enumerate(df.to_delayed())]
+                dask.compute(*parts)
+            else:
+                df.to_json(filename=path, lines=False, compression=compression, storage_options=storage_options,
+                           *args, **kwargs)
         except (OSError, IOError) as error:
             logger.print(error)
             raise
-        #     print("Creation of the directory %s failed" % path)
-        # else:
-        #     print("Successfully created the directory %s" % path)
 
     def csv(self, path, mode="wt", index=False, single_file=True, storage_options=None, conn=None, **kwargs):
         """
@@ -63,9 +79,11 @@ class Save:
             logger.print(error)
             raise
 
-    def parquet(self, path, mode="overwrite", num_partitions=1, engine="pyarrow", storage_options=None, conn=None, **kwargs):
+    def parquet(self, path, mode="overwrite", num_partitions=None, engine="pyarrow", partition_on=None, sort_by=None,
+                compression="snappy", row_group_size=None, write_metadata_file=True, storage_options=None, conn=None,
+                **kwargs):
         """
-        Save data frame to a parquet file
+        Save data frame to a parquet dataset. Every partition is written in parallel.
         :param path: path where the spark will be saved.
         :param mode: Specifies the behavior of the save operation when data already exists.
                     "append": Append contents of this DataFrame to existing data.
@@ -73,33 +91,94 @@ class Save:
                     "ignore": Silently ignore this operation if data already exists.
                     "error": Throw an exception if data already exists.
         :param num_partitions: the number of partitions of the DataFrame
+        :param engine: 'pyarrow' or 'fastparquet'
+        :param partition_on: Columns used to hive partition the dataset in folders like col=value
+        :param sort_by: Columns used to sort the rows inside every partition. Sorted data produce tight min/max
+        statistics per row group so filtered reads can skip most of the data
+        :param compression: 'snappy', 'gzip', 'brotli', 'lz4', 'zstd' or None
+        :param row_group_size: Number of rows in every row group
+        :param write_metadata_file: Write a _metadata file with the statistics of all the row groups
         :return:
         """
 
-        # This character are invalid as column names by parquet
-        invalid_character = [" ", ",", ";", "{", "}", "(", ")", "\n", "\t", "="]
-
-        def func(col_name):
-            for i in invalid_character:
-                col_name = col_name.replace(i, "_")
-            return col_name
+        modes = ["append", "overwrite", "ignore", "error"]
+        if mode not in modes:
+            RaiseIt.value_error(mode, modes)
 
-        df = self.root.cols.rename(func)
+        df = self.root.cols.rename(parquet_column_name)
 
         if conn is not None:
             path = conn.path(path)
             storage_options = conn.storage_options
+
+        fs, _, _ = get_fs_token_paths(path, storage_options=storage_options)
+        if fs.exists(path):
+            if mode == "ignore":
+                return
+            elif mode == "error":
+                raise FileExistsError(f"{path} already exists")
+
         dfd = df.data
-        try:
-            if engine == 'pyarrow':
-                dfd.to_parquet(path,  engine='pyarrow', storage_options=storage_options, **kwargs)
+
+        if num_partitions is not None:
+            dfd = dfd.repartition(npartitions=num_partitions)
+
+        if sort_by is not None:
+            sort_by = [parquet_column_name(col_name) for col_name in val_to_list(sort_by)]
+            dfd = dfd.map_partitions(lambda pdf: pdf.sort_values(sort_by), meta=dfd._meta)
+
+        if partition_on is not None:
+            partition_on = [parquet_column_name(col_name) for col_name in val_to_list(partition_on)]
+
+        if row_group_size is not None:
+            if engine == "pyarrow":
+                kwargs["row_group_size"] = row_group_size
             elif engine == "fastparquet":
-                dfd.to_parquet(path, engine='fastparquet', storage_options=storage_options, **kwargs)
+                kwargs["row_group_offsets"] = row_group_size
+
+        try:
+            dfd.to_parquet(path, engine=engine, compression=compression, partition_on=partition_on,
+                           write_metadata_file=write_metadata_file, append=mode == "append",
+                           overwrite=mode == "overwrite" and fs.exists(path), write_index=False,
+                           storage_options=storage_options, **kwargs)
 
         except IOError as e:
             logger.print(e)
             raise
 
+    def arrow(self, path, compression=None, chunk_size=None, storage_options=None, conn=None):
+        """
+        Save data frame to Arrow IPC (Feather) files. Every partition is written in parallel to its own file inside
+        the path folder. The dataframe metadata is saved in the files so they can be used as an intermediate format
+        between Optimus pipelines
+        :param path: folder where the files will be saved. Arrow files already in the folder are removed.
+        :param compression: 'lz4', 'zstd' or 'uncompressed'
+        :param chunk_size: Number of rows in every record batch
+        :param storage_options:
+        :param conn:
+        :return:
+        """
+
+        dfd = self.root.data
+        meta = self.root.meta
+
+        if conn is not None:
+            path = conn.path(path)
+            storage_options = conn.storage_options
+
+        try:
+            if path_is_local(path):
+                os.makedirs(path, exist_ok=True)
+            remove_arrow_files(path, storage_options)
+
+            path = path.rstrip("/")
+            parts = [delayed(write_table)(part, f"{path}/part.{i}.arrow", meta, compression, chunk_size,
+                                          storage_options) for i, part in enumerate(dfd.to_delayed())]
+            dask.compute(*parts)
+        except IOError as error:
+            logger.print(error)
+            raise
+
     @staticmethod
     def avro(path):
         raise NotImplementedError('Not implemented yet')
@@ -43,9 +43,6 @@ class DaskCUDFDataFrame(DaskBaseDataFrame):
         from optimus.engines.base.dask.constants import constants
         return constants(self)
 
-    def _buffer_window(self, input_cols, lower_bound, upper_bound):
-        return PandasDataFrame(self.get_buffer().data[input_cols][lower_bound: upper_bound].to_pandas())
-
 
     @staticmethod
     def pivot(index, column, values):
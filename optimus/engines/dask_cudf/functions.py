@@ -11,6 +11,7 @@ import cudf
 import dask
 
 from optimus.engines.base.commons.functions import to_float_cudf, to_integer_cudf
+from optimus.engines.base.commons.nlp import remove_stopwords_cudf, stopwords
 from optimus.engines.base.functions import Functions
 from optimus.helpers.core import val_to_list
 
@@ -73,6 +74,10 @@ class DaskCUDFFunctions(Functions):
     def to_delayed(self, value):
         return value.to_delayed()
 
+    @staticmethod
+    def remove_stopwords(series, language="english"):
+        return series.map_partitions(remove_stopwords_cudf, stopwords(language), meta=(series.name, object))
+
     def _to_float(self, series, *args):
         return series.map_partitions(to_float_cudf, meta=float)
 
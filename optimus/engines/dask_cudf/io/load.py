@@ -29,8 +29,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "json")[0]
 
@@ -89,8 +88,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         remove_param = "chunk_size"
         if kwargs.get(remove_param):
@@ -141,8 +139,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "parquet")
 
@@ -171,8 +168,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "avro")
 
@@ -200,8 +196,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "xls")
 
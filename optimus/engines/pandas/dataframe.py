@@ -54,11 +54,8 @@ class PandasDataFrame(BaseDataFrame):
         from optimus.engines.pandas.ml.encoding import Encoding
         return Encoding(self)
 
-    def _create_buffer_df(self, input_cols, n):
-        pass
-
     def _buffer_window(self, input_cols, lower_bound, upper_bound):
-        return PandasDataFrame(self.data[input_cols][lower_bound: upper_bound])
+        return PandasDataFrame(self.data[input_cols].iloc[lower_bound: upper_bound])
 
     def set_buffer(self, columns="*", n=None):
         return True
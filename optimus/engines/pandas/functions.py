@@ -1,19 +1,19 @@
 # DataFrame = pd.DataFrame
-from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
 
-from optimus.engines.base.commons.functions import to_string, to_integer, to_float, to_boolean, word_tokenize
+from optimus.engines.base.commons.functions import to_string, to_integer, to_float, to_boolean
 from optimus.engines.base.functions import Functions
 from optimus.helpers.core import val_to_list
-import nltk
 
 
 class PandasFunctions(Functions):
 
-    def _to_float(self, value):
-        return value.map(to_float)
+    def _to_float(self, series):
+        if pd.api.types.is_float_dtype(series):
+            return series
+        return to_float(series).set_axis(series.index)
 
     def to_float(self, series):
         return to_float(series)
@@ -33,9 +33,6 @@ class PandasFunctions(Functions):
     def to_string(self, series):
         return to_string(series)
 
-    def word_tokenize(self, value):
-        return word_tokenize(value)
-
     def count_zeros(self, series, *args):
         return int((self._to_float(series).values == 0).sum())
 
@@ -125,11 +122,3 @@ class PandasFunctions(Functions):
 
     def normalize_chars(self, series):
         return series.str.normalize("NFKD").str.encode('ascii', errors='ignore').str.decode('utf8')
-
-    def date_format(self, series, current_format=None, output_format=None):
-        return pd.to_datetime(series, format=current_format, errors="coerce").dt.strftime(output_format).reset_index(
-            drop=True)
-
-    def years_between(self, series, date_format=None):
-        return (pd.to_datetime(series, format=date_format,
-                               errors="coerce").dt.date - datetime.now().date()) / timedelta(days=365)
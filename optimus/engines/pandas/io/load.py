@@ -8,11 +8,14 @@ from zipfile import ZipFile
 import pandas as pd
 import pandavro as pdx
 import psutil
+import pyarrow as pa
 
+from optimus.engines.base.io.arrow import arrow_files, read_table, table_meta, to_pandas
+from optimus.engines.base.io.json_lines import BATCH_SIZE, read_json_lines, read_json_lines_table
 from optimus.engines.base.io.load import BaseLoad
 from optimus.engines.base.meta import Meta
 from optimus.engines.pandas.dataframe import PandasDataFrame
-from optimus.helpers.functions import prepare_path, unquote_path
+from optimus.helpers.functions import path_is_local, prepare_path, unquote_path
 from optimus.helpers.logger import logger
 from optimus.infer import is_str, is_list, is_url
 
@@ -23,24 +26,46 @@ class Load(BaseLoad):
         self.op = op
 
     @staticmethod
-    def json(path, multiline=False, *args, **kwargs):
+    def json(path, multiline=False, batch_size=BATCH_SIZE, use_orjson=False, storage_options=None, conn=None, *args,
+             **kwargs):
         """
         Return a dataframe from a json file.
         :param path: path or location of the file.
-        :param multiline:
+        :param multiline: The file is in JSON lines format. It is parsed in blocks by the pyarrow reader, or in batches
+        of batch_size rows if pyarrow can not parse it or use_orjson or pandas arguments are used.
+        :param batch_size: Number of rows parsed at a time when reading a JSON lines file in batches
+        :param use_orjson: Use orjson to parse the rows of a JSON lines file
+        :param storage_options:
+        :param conn:
 
         :return:
         """
 
         path = unquote_path(path)
 
-        local_file_names = prepare_path(path, "json")
+        if conn is not None:
+            path, storage_options = conn.source(path)
+
+        if storage_options is None:
+            local_file_names = prepare_path(path, "json")
+        else:
+            local_file_names = [(path, ntpath.basename(path))]
+
         try:
             df_list = []
 
             for file_name, j in local_file_names:
-                df = pd.read_json(file_name, lines=multiline, *args, **kwargs)
-                df_list.append(df)
+                if multiline and not use_orjson and not kwargs:
+                    try:
+                        df_list.append(to_pandas(read_json_lines_table(file_name, storage_options=storage_options)))
+                    except (pa.ArrowInvalid, pa.ArrowTypeError):
+                        # Columns with values of different types. Parse the file in batches with pandas
+                        df_list.extend(read_json_lines(file_name, batch_size, storage_options=storage_options))
+                elif multiline:
+                    df_list.extend(read_json_lines(file_name, batch_size, use_orjson=use_orjson,
+                                                   storage_options=storage_options, **kwargs))
+                else:
+                    df_list.append(pd.read_json(file_name, storage_options=storage_options, *args, **kwargs))
 
             df = pd.concat(df_list, axis=0, ignore_index=True)
             df = PandasDataFrame(df)
@@ -93,7 +118,10 @@ class Load(BaseLoad):
 
         :return dataFrame
         """
-        if not is_url(filepath_or_buffer):
+        if conn is not None:
+            filepath_or_buffer, storage_options = conn.source(unquote_path(filepath_or_buffer))
+
+        if not is_url(filepath_or_buffer) and path_is_local(filepath_or_buffer):
             filepath_or_buffer = glob.glob(unquote_path(filepath_or_buffer))
 
 
@@ -107,12 +135,6 @@ class Load(BaseLoad):
             if lineterminator and lineterminator.encode(encoding='UTF-8', errors='strict') == b'\r\n':
                 lineterminator = None
 
-            if conn is not None:
-                filepath_or_buffer = conn.path(filepath_or_buffer)
-                storage_options = conn.storage_options
-            else:
-                storage_options = None
-
             if kwargs.get("chunk_size") == "auto":
                 ## Chunk size is going to be 75% of the memory available
                 kwargs.pop("chunk_size")
@@ -161,8 +183,7 @@ class Load(BaseLoad):
         # file, file_name = prepare_path(path, "parquet")[0]
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         try:
             df = pd.read_parquet(path, columns=columns, engine='pyarrow', storage_options=storage_options, **kwargs)
@@ -175,6 +196,36 @@ class Load(BaseLoad):
 
         return df
 
+    @staticmethod
+    def arrow(path, columns=None, storage_options=None, conn=None, *args, **kwargs):
+        """
+        Return a dataframe from an Arrow IPC (Feather) file. Local files are memory mapped and the metadata saved
+        by Optimus is restored.
+        :param path: path or location of the file. A folder with multiple Arrow files is also accepted
+        :param columns: select the columns that will be loaded. In this way you do not need to load all the dataframe
+        :param storage_options:
+        :param conn:
+        """
+
+        path = unquote_path(path)
+
+        if conn is not None:
+            path, storage_options = conn.source(path)
+
+        try:
+            tables = [read_table(file, columns, storage_options=storage_options)
+                      for file in arrow_files(path, storage_options)]
+            table = pa.concat_tables(tables)
+            df = PandasDataFrame(to_pandas(table))
+            meta = table_meta(table.schema)
+            df.meta = Meta.set(meta, value={**meta, "file_name": path, "name": ntpath.basename(path)})
+
+        except IOError as error:
+            logger.print(error)
+            raise
+
+        return df
+
     @staticmethod
     def avro(path, storage_options=None, conn=None, *args, **kwargs):
         """
@@ -188,8 +239,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "avro")[0]
 
@@ -217,8 +267,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "xls")[0]
 
@@ -257,8 +306,7 @@ class Load(BaseLoad):
         path = unquote_path(path)
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         file, file_name = prepare_path(path, "orc")[0]
 
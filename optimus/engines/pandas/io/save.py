@@ -1,24 +1,46 @@
-import pandavro as pdx
 import os
+
+import pandavro as pdx
+from fsspec.core import get_fs_token_paths
+
+from optimus.engines.base.io.arrow import write_table
+from optimus.engines.base.io.json_lines import BATCH_SIZE, write_json_lines
+from optimus.engines.base.io.parquet import parquet_column_name, write_parquet
+from optimus.helpers.core import val_to_list
+from optimus.helpers.functions import prepare_path_local, path_is_local
 from optimus.helpers.logger import logger
+from optimus.helpers.raiseit import RaiseIt
 
 
 class Save:
     def __init__(self, root):
         self.root = root
 
-    def json(self, path, orient="records", *args, **kwargs):
+    def json(self, path, orient="records", lines=False, batch_size=BATCH_SIZE, compression="infer",
+             use_orjson=False, storage_options=None, conn=None, *args, **kwargs):
         """
         Save data frame in a json file
         :param path: path where the spark will be saved.
         :param orient:
+        :param lines: Save the data in JSON lines format. The rows are serialized incrementally in batches so the
+        whole serialized string is never in memory
+        :param batch_size: Number of rows serialized at a time in JSON lines format
+        :param compression: 'gzip', 'bz2', 'infer' or None. 'infer' use the file extension
+        :param use_orjson: Use orjson to serialize the rows in JSON lines format
 
         :return:
         """
         df = self.root.data
 
+        if conn is not None:
+            path = conn.path(path)
+            storage_options = conn.storage_options
+
         try:
-            df.to_json(path, orient=orient, *args, **kwargs)
+            if lines:
+                write_json_lines(df, path, batch_size, compression, use_orjson, storage_options)
+            else:
+                df.to_json(path, orient=orient, storage_options=storage_options, *args, **kwargs)
 
         except IOError as e:
             logger.print(e)
@@ -86,7 +108,8 @@ class Save:
         with open(filename, mode) as f:
             f.write(res)
 
-    def parquet(self, path, *args, **kwargs):
+    def parquet(self, path, mode="overwrite", partition_on=None, sort_by=None, compression="snappy",
+                row_group_size=None, write_metadata_file=True, storage_options=None, conn=None, **kwargs):
         """
         Save data frame to a parquet file
         :param path: path where the spark will be saved.
@@ -95,22 +118,67 @@ class Save:
                     "overwrite" (default case): Overwrite existing data.
                     "ignore": Silently ignore this operation if data already exists.
                     "error": Throw an exception if data already exists.
-        :param num_partitions: the number of partitions of the DataFrame
+        :param partition_on: Columns used to hive partition the dataset in folders like col=value
+        :param sort_by: Columns used to sort the rows. Sorted data produce tight min/max statistics per row group
+        so filtered reads can skip most of the data
+        :param compression: 'snappy', 'gzip', 'brotli', 'lz4', 'zstd' or None
+        :param row_group_size: Number of rows in every row group
+        :param write_metadata_file: Write a _metadata file with the statistics of all the row groups when the data
+        is saved as a dataset folder
         :return:
         """
 
-        # This character are invalid as column names by parquet
-        invalid_character = [" ", ",", ";", "{", "}", "(", ")", "\n", "\t", "="]
+        modes = ["append", "overwrite", "ignore", "error"]
+        if mode not in modes:
+            RaiseIt.value_error(mode, modes)
+
+        df = self.root.cols.rename(parquet_column_name)
+
+        if conn is not None:
+            path = conn.path(path)
+            storage_options = conn.storage_options
+
+        if sort_by is not None:
+            sort_by = [parquet_column_name(col_name) for col_name in val_to_list(sort_by)]
+
+        if partition_on is not None:
+            partition_on = [parquet_column_name(col_name) for col_name in val_to_list(partition_on)]
 
-        def func(col_name):
-            for i in invalid_character:
-                col_name = col_name.replace(i, "_")
-            return col_name
+        try:
+            fs, _, _ = get_fs_token_paths(path, storage_options=storage_options)
+            if fs.exists(path):
+                if mode == "ignore":
+                    return
+                elif mode == "error":
+                    raise FileExistsError(f"{path} already exists")
+
+            write_parquet(df.data, path, mode=mode, partition_on=partition_on, sort_by=sort_by,
+                          compression=compression, row_group_size=row_group_size,
+                          write_metadata_file=write_metadata_file, storage_options=storage_options, **kwargs)
+        except IOError as e:
+            logger.print(e)
+            raise
+
+    def arrow(self, path, compression=None, chunk_size=None, storage_options=None, conn=None):
+        """
+        Save data frame to an Arrow IPC (Feather) file. The dataframe metadata is saved in the file so it can be
+        used as an intermediate format between Optimus pipelines
+        :param path: path where the dataframe will be saved.
+        :param compression: 'lz4', 'zstd' or 'uncompressed'
+        :param chunk_size: Number of rows in every record batch
+        :param storage_options:
+        :param conn:
+        :return:
+        """
 
-        df = self.root.cols.rename(func)
+        if conn is not None:
+            path = conn.path(path)
+            storage_options = conn.storage_options
 
         try:
-            df.data.to_parquet(path)
+            if path_is_local(path):
+                prepare_path_local(path)
+            write_table(self.root.data, path, self.root.meta, compression, chunk_size, storage_options)
         except IOError as e:
             logger.print(e)
             raise
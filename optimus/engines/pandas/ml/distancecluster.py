@@ -0,0 +1,2 @@
+# The nearest neighbor methods are implemented for all the engines in optimus.engines.base.stringclustering
+from optimus.engines.base.stringclustering import levenshtein_cluster
@@ -8,7 +8,7 @@ from optimus.engines.base.meta import Meta
 from optimus.engines.base.rows import BaseRows
 from optimus.helpers.columns import parse_columns
 from optimus.helpers.constants import Actions
-from optimus.helpers.core import val_to_list, one_list_to_val
+from optimus.helpers.core import one_list_to_val
 from optimus.helpers.raiseit import RaiseIt
 from optimus.infer import is_list_of_str_or_int, is_list_value
 
@@ -100,23 +100,6 @@ class Rows(BaseRows):
         df = self.root
         return df
 
-    def drop_duplicates(self, subset=None) -> DataFrame:
-        """
-        Drop duplicates values in a dataframe
-        :param subset: List of columns to make the comparison, this only  will consider this subset of columns,
-        :return: Return a new DataFrame with duplicate rows removed
-        :return:
-        """
-        df = self.root
-        dfd = df.data
-        subset = parse_columns(df, subset)
-        subset = val_to_list(subset)
-        dfd = dfd.drop_duplicates(subset=subset)
-
-        return self.root.new(dfd)
-
-
-
     @staticmethod
     def unnest(input_cols) -> DataFrame:
         df = self
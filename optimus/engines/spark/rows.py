@@ -93,7 +93,7 @@ class Rows(DaskBaseRows):
         """
         return self.root.data.filter(*args, **kwargs)
 
-    def _sort_multiple(self, dfd, col_sort, meta):
+    def _sort_multiple(self, dfd, meta, col_sort):
         func = []
         for cs in col_sort:
             col_name = one_list_to_val(cs[0])
@@ -23,6 +23,21 @@ class Load(BaseLoad):
         df.meta = Meta.set(df.meta, value={"file_name": path, "name": ntpath.basename(path)})
         return df
 
+    @staticmethod
+    def arrow(path, columns=None, *args, **kwargs):
+        """
+        Return a dataframe from an Arrow IPC (Feather) file. Vaex memory maps the file so no data is copied
+        :param path: path or location of the file.
+        :param columns: select the columns that will be loaded
+        :return:
+        """
+        path = unquote_path(path)
+        dfd = vaex.open(path, *args, **kwargs)
+        if columns is not None:
+            dfd = dfd[columns]
+        df = VaexDataFrame(dfd)
+        df.meta = Meta.set(df.meta, value={"file_name": path, "name": ntpath.basename(path)})
+        return df
 
     @staticmethod
     def json(path, multiline=False, *args, **kwargs):
@@ -83,8 +98,7 @@ class Load(BaseLoad):
             prepare_path.cache_clear()
 
         if conn is not None:
-            path = conn.path(path)
-            storage_options = conn.storage_options
+            path, storage_options = conn.source(path)
 
         remove_param = "chunk_size"
         if kwargs.get(remove_param):
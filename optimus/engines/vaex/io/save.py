@@ -25,6 +25,32 @@ class Save:
             logger.print(error)
             raise
 
+    def arrow(self, path, chunk_size=None, conn=None, *args, **kwargs):
+        """
+        Save data frame to an Arrow IPC (Feather) file. The data is exported in chunks so it is not loaded in memory
+        :param path: path where the dataframe will be saved.
+        :param chunk_size: Number of rows in every record batch
+        :param conn:
+        :return:
+        """
+        df = self.root.data
+
+        if conn is not None:
+            path = conn.path(path)
+            kwargs["fs_options"] = conn.storage_options
+
+        if chunk_size is not None:
+            kwargs["chunk_size"] = chunk_size
+
+        try:
+            if path_is_local(path):
+                prepare_path_local(path)
+            df.export_arrow(path, *args, **kwargs)
+
+        except (OSError, IOError) as error:
+            logger.print(error)
+            raise
+
     def json(self, path, storage_options=None, conn=None, *args, **kwargs):
         """
         Save data frame in a json file
@@ -93,6 +93,7 @@ class Actions(Enum):
     HOST = "host"
     DOMAIN_PARAMS = "domain_params"
     DOMAIN_PATH = "domain_path"
+    DOMAIN_QUERY = "domain_query"
 
     EMAIL_DOMAIN = "email_domain"
     EMAIL_USER = "email_user"
@@ -102,12 +103,18 @@ class Actions(Enum):
     DROP_ROW = "drop_row"
     BETWEEN_ROW = "between_drop"
     SORT_ROW = "sort_row"
+    LIMIT_ROW = "limit_row"
 
     @staticmethod
     def list():
         return list(map(lambda c: c.value, Actions))
 
 
+# Actions that can change the number of rows or the rows in every partition
+ROWS_ACTIONS = [Actions.SELECT_ROW.value, Actions.DROP_ROW.value, Actions.BETWEEN_ROW.value, Actions.SORT_ROW.value,
+                Actions.LIMIT_ROW.value, Actions.APPEND.value]
+
+
 class ProfilerDataTypesQuality(Enum):
     MISMATCH = 0
     MISSING = 1
@@ -192,6 +199,22 @@ RELATIVE_ERROR = 10000
 
 # Buffer size in rows
 BUFFER_SIZE = 500000
+
+# Max number of parsed columns, sketches and previews cached by a dataframe
+DATAFRAME_CACHE_SIZE = 32
+
+# Max size in bytes of a dataframe sent whole to every partition of the other one in a join
+BROADCAST_JOIN_SIZE = 100 * 1024 ** 2
+
+# Target size in bytes of a partition in memory
+PARTITION_SIZE = 128 * 1024 ** 2
+
+# Fit the partitions to PARTITION_SIZE after loading a file
+AUTO_REPARTITION = True
+
+# Coalesce the partitions left almost empty by a filter. The filtered partitions must be computed to know their
+# lengths, so filters are not lazy when it is on
+COALESCE_FILTERS = False
 US_STATES_NAMES = ["alabama",
                    "alaska",
                    "american samoa",
@@ -18,7 +18,6 @@ import humanize
 import pandas as pd
 import six
 from fastnumbers import isint, isfloat
-from string_grouper import match_strings
 
 from optimus import ROOT_DIR
 from optimus.helpers.core import val_to_list, one_list_to_val
@@ -281,6 +280,8 @@ def infer_dataframes_keys(df_left: pd.DataFrame, df_right: pd.DataFrame):
                 result.append((col_l, col_r,))
 
     # String Clustering
+    from string_grouper import match_strings
+
     for col_l in df_left:
         for col_r in df_right:
             try:
@@ -643,3 +644,20 @@ def singleton(cls):
     attribute to access decorated class directly in unit tests
     """
     return _SingletonWrapper(cls)
+
+
+@functools.lru_cache(maxsize=None)
+def nltk_resource(resource):
+    """
+    Check if a NLTK resource is available locally and download it only if it is not found. The check is done once per
+    process, so the corpora are not downloaded every time Optimus starts
+    :param resource: Resource path like 'corpora/stopwords' or 'tokenizers/punkt'
+    :return:
+    """
+    import nltk
+
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        logger.print("Downloading NLTK resource %s", resource)
+        nltk.download(resource.split("/")[-1], quiet=True)
@@ -4,9 +4,6 @@ import os
 import pprint
 from io import BytesIO
 
-from IPython.core.display import display, HTML
-from matplotlib import pyplot as plt
-
 from optimus.infer import is_str
 
 
@@ -17,6 +14,7 @@ def output_image(fig, path):
     :param path: Matplotlib figure
     :return: Base64 encode image
     """
+    from matplotlib import pyplot as plt
 
     fig.savefig(path, format='png')
     plt.close()
@@ -28,6 +26,8 @@ def output_base64(fig):
     :param fig: Matplotlib figure
     :return: Base64 encode image
     """
+    from matplotlib import pyplot as plt
+
     fig_file = BytesIO()
     plt.savefig(fig_file, format='png')
     # rewind to beginning of file
@@ -46,12 +46,14 @@ def print_html(html):
     :return:
     """
     try:
+        from IPython.core.display import display, HTML
+
         if "DATABRICKS_RUNTIME_VERSION" in os.environ:
             displayHTML(result)
         else:
             display(HTML(html))
         return True
-    except NameError:
+    except (NameError, ImportError):
         return False
 
 
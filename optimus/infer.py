@@ -5,28 +5,25 @@ import datetime
 import math
 import os
 import re
+import sys
 from ast import literal_eval
 
 import fastnumbers
 import pandas as pd
-import pendulum
-from dask import distributed
-from dask.dataframe.core import DataFrame as DaskDataFrame
+from pandas._libs.tslibs.parsing import guess_datetime_format
 
 # This function return True or False if a string can be converted to any datatype.
 from optimus.helpers.constants import ProfilerDataTypes, CURRENCIES
 
 
 def is_datetime_str(_value):
-    try:
-        pendulum.parse(_value, strict=False)
-        return True
-    except ValueError:
-        return False
+    return guess_datetime_format(_value) is not None or guess_datetime_format(_value, dayfirst=True) is not None
 
 
 def str_to_date_format(_value, date_format):
     # Check this https://stackoverflow.com/questions/17134716/convert-dataframe-column-type-from-string-to-datetime-dd-mm-yyyy-format
+    import pendulum
+
     try:
         pendulum.from_format(_value, date_format)
         return True
@@ -389,6 +386,11 @@ def is_list_of_dask_dataframes(value):
     :param value:
     :return:
     """
+    # Dask dataframes can not exist if dask.dataframe was never imported, so there is no need to import it here
+    if "dask.dataframe" not in sys.modules:
+        return False
+    from dask.dataframe.core import DataFrame as DaskDataFrame
+
     return isinstance(value, list) and all(isinstance(elem, DaskDataFrame) for elem in value)
 
 
@@ -539,8 +541,7 @@ def is_list_of_futures(value):
     :param value:
     :return:
     """
-    return bool(value) and isinstance(value, list) and all(
-        isinstance(elem, distributed.client.Future) for elem in value)
+    return bool(value) and isinstance(value, list) and all(is_future(elem) for elem in value)
 
 
 def is_future(value):
@@ -549,7 +550,12 @@ def is_future(value):
     :param value:
     :return:
     """
-    return isinstance(value, distributed.client.Future)
+    # Same as in is_list_of_dask_dataframes. A Future can not exist if distributed was never imported
+    if "distributed" not in sys.modules:
+        return False
+    from distributed import Future
+
+    return isinstance(value, Future)
 
 
 def is_decimal(value):
@@ -2,7 +2,6 @@ from enum import Enum
 
 from optimus.helpers.logger import logger
 from optimus.helpers.raiseit import RaiseIt
-import nltk
 
 # if importlib.util.find_spec("vaex") is not None:
 #     from vaex import DataFrame as VaexDataFrame
@@ -39,12 +38,8 @@ def optimus(engine=Engine.DASK.value, *args, **kwargs):
     """
     logger.print("ENGINE", engine)
 
-    # lemmatizer
-    nltk.download('wordnet', quiet= True)
-
-    # Stopwords
-    nltk.download('stopwords', quiet=True)
-
+    # The NLTK corpora are checked and downloaded only when a function that needs them is called.
+    # See optimus.helpers.functions.nltk_resource
     # Init engine
     if engine == Engine.PANDAS.value:
         from optimus.engines.pandas.engine import PandasEngine
@@ -1,9 +1,12 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
+import pandas as pd
+
 from optimus.helpers.columns import parse_columns
 from optimus.helpers.core import val_to_list, one_list_to_val
-from optimus.helpers.filters import dict_filter
 from optimus.helpers.json import dump_json
+from optimus.infer import is_dict
 
 
 class AbstractOutlierBounds(ABC):
@@ -12,16 +15,21 @@ class AbstractOutlierBounds(ABC):
      Also you need to add the new outlier detection method to outliers.py
      """
 
-    def __init__(self, df, col_name: str, lower_bound: int, upper_bound: int):
+    def __init__(self, df, col_name: str, lower_bound: int, upper_bound: int, min_value=None, max_value=None):
         """
 
         :param df: Spark Dataframe
         :param col_name: column name
+        :param min_value: Min value of the column. Used as the lower limit of the lower bound histogram
+        :param max_value: Max value of the column. Used as the upper limit of the upper bound histogram
         """
         self.df = df
         self.col_name = one_list_to_val(parse_columns(df, col_name))
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
+        self.min_value = min_value
+        self.max_value = max_value
+        self._stats = {}
 
     @abstractmethod
     def whiskers(self):
@@ -38,31 +46,81 @@ class AbstractOutlierBounds(ABC):
         """
         df = self.df
         col_name = self.col_name
-        upper_bound, lower_bound = dict_filter(self.whiskers(), ["upper_bound", "lower_bound"])
-        return df.rows.select((df[col_name] > upper_bound) | (df[col_name] < lower_bound))
-
-    # TODO: Pass a defined division param instead or run 3 separated jobs
-    def hist(self, col_name: str):
-        df = self.df
-        # lower bound
-        lower_bound_hist = df.rows.select(df[col_name] < self.lower_bound).cols.hist(col_name, 20)
-
-        # upper bound
-        upper_bound_hist = df.rows.select(df[col_name] > self.upper_bound).cols.hist(col_name, 20)
+        return df.rows.select((df[col_name] > self.upper_bound) | (df[col_name] < self.lower_bound))
 
-        # Non outliers
-        non_outlier_hist = df.rows.select(
-            (df[col_name] >= self.lower_bound) & (df[col_name] <= self.upper_bound)).cols.hist(col_name, 20)
-
-        result = {}
-        if lower_bound_hist is not None:
-            result.update(lower_bound_hist)
-        if upper_bound_hist is not None:
-            result.update(upper_bound_hist)
-        if non_outlier_hist is not None:
-            result.update(non_outlier_hist)
+    def stats(self, buckets: int = 20):
+        """
+        Count the lower bound outliers, the upper bound outliers and the non outliers and calculate their histograms
+        in a single pass over the column. The result is cached so info() and hist() share it
+        :param buckets: Number of edges of every histogram
+        :return: {"lower_bound_count", "upper_bound_count", "count_non_outliers", "hist"}
+        """
+        if buckets in self._stats:
+            return self._stats[buckets]
 
-        return dump_json(result)
+        df = self.df
+        col_name = self.col_name
+        lower_bound = self.lower_bound
+        upper_bound = self.upper_bound
+        min_value = self.min_value
+        max_value = self.max_value
+
+        if min_value is None or max_value is None:
+            _range = df.cols.range(col_name, tidy=False)["range"][col_name]
+            min_value, max_value = _range["min"], _range["max"]
+
+        # The histograms ranges are known before the pass, so every partition can be binned independently and the
+        # counts summed
+        ranges = {"lower_bound": (min_value, lower_bound),
+                  "non_outliers": (max(lower_bound, min_value), min(upper_bound, max_value)),
+                  "upper_bound": (upper_bound, max_value)}
+        ranges = {key: (float(lower), float(upper)) for key, (lower, upper) in ranges.items()
+                  if pd.notnull(lower) and pd.notnull(upper) and lower <= upper}
+        bins = buckets - 1
+
+        @df.functions.delayed
+        def _partition_stats(series):
+            values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=float)
+            masks = {"lower_bound": values < lower_bound,
+                     "non_outliers": (values >= lower_bound) & (values <= upper_bound),
+                     "upper_bound": values > upper_bound}
+            return {key: (int(np.count_nonzero(mask)),
+                          np.histogram(values[mask], bins=bins, range=ranges[key])[0] if key in ranges else None)
+                    for key, mask in masks.items()}
+
+        @df.functions.delayed
+        def _merge_stats(partitions):
+            keys = ["lower_bound", "non_outliers", "upper_bound"]
+            counts = {key: sum(partition[key][0] for partition in partitions) for key in keys}
+            hist = {}
+            for key in keys:
+                if key in ranges and counts[key] > 0:
+                    _count = np.sum([partition[key][1] for partition in partitions], axis=0)
+                    edges = np.histogram_bin_edges([], bins=bins, range=ranges[key])
+                    hist[key] = [{"lower": float(edges[i]), "upper": float(edges[i + 1]), "count": int(_count[i])}
+                                 for i in range(bins)]
+                else:
+                    hist[key] = []
+
+            return {"lower_bound_count": counts["lower_bound"], "upper_bound_count": counts["upper_bound"],
+                    "count_non_outliers": counts["non_outliers"], "hist": hist}
+
+        partitions = df.functions.to_delayed(df.data[col_name])
+        result = _merge_stats([_partition_stats(partition) for partition in partitions])
+        if not is_dict(result):
+            result = result.compute()
+
+        self._stats[buckets] = result
+        return result
+
+    def hist(self, col_name: str = None, buckets: int = 20):
+        """
+        Histograms of the lower bound outliers, the upper bound outliers and the non outliers
+        :param col_name: Deprecated. The histograms are always calculated over the outliers column
+        :param buckets: Number of edges of every histogram
+        :return: json {"hist": {"lower_bound": [...], "non_outliers": [...], "upper_bound": [...]}}
+        """
+        return dump_json({"hist": self.stats(buckets)["hist"]})
 
     def select_lower_bound(self):
         col_name = self.col_name
@@ -108,18 +166,15 @@ class AbstractOutlierBounds(ABC):
         Count the outliers rows using the selected column
         :return:
         """
-        col_name = self.col_name
-        df = self.df
-        return df.rows.select((df[col_name] > self.upper_bound) | (df[col_name] < self.lower_bound)).rows.count()
+        stats = self.stats()
+        return stats["lower_bound_count"] + stats["upper_bound_count"]
 
     def non_outliers_count(self):
         """
         Count non outliers rows using the selected column
         :return:
         """
-        df = self.df
-        col_name = self.col_name
-        return df.rows.select((df[col_name] <= self.upper_bound) & (df[col_name] >= self.lower_bound)).rows.count()
+        return self.stats()["count_non_outliers"]
 
     @abstractmethod
     def info(self, output: str = "dict"):
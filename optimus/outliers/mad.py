@@ -1,4 +1,6 @@
+from optimus.helpers.columns import parse_columns
 from optimus.helpers.constants import RELATIVE_ERROR
+from optimus.helpers.core import one_list_to_val
 from optimus.helpers.filters import dict_filter
 from optimus.helpers.json import dump_json
 from optimus.outliers.abstract_outliers_bounds import AbstractOutlierBounds
@@ -18,38 +20,39 @@ class MAD(AbstractOutlierBounds):
         :type relative_error: object
         """
         self.df = df
-        self.col_name = col_name
+        self.col_name = one_list_to_val(parse_columns(df, col_name))
         self.threshold = threshold
         self.relative_error = relative_error
-        self.upper_bound, self.lower_bound = dict_filter(self.whiskers(), ["upper_bound", "lower_bound"])
-        super().__init__(df, col_name, self.lower_bound, self.upper_bound)
+        self.upper_bound, self.lower_bound, min_value, max_value = dict_filter(
+            self.whiskers(), ["upper_bound", "lower_bound", "min", "max"])
+        super().__init__(df, col_name, self.lower_bound, self.upper_bound, min_value, max_value)
 
     def whiskers(self):
         """
-        Get the wisker used to defined outliers
+        Get the wisker used to defined outliers. The MAD and the column range are read from the same quantile sketch
         :return:
         """
-        mad_median_value = self.df.cols.mad(self.col_name, self.relative_error, more=True)
-        col_name = self.col_name
-        mad_value = mad_median_value[col_name]["mad"]
-        median_value = mad_median_value[col_name]["median"]
+        sketch = self.df.cols.quantile_sketch(self.col_name, self.relative_error)[self.col_name]
+        mad_value, median_value = sketch.mad()
 
         lower_bound = median_value - self.threshold * mad_value
         upper_bound = median_value + self.threshold * mad_value
 
-        return {"lower_bound": lower_bound, "upper_bound": upper_bound}
+        return {"lower_bound": lower_bound, "upper_bound": upper_bound, "min": sketch.min, "max": sketch.max}
 
     def info(self, output: str = "dict"):
         """
-        Get whiskers, iqrs and outliers and non outliers count
+        Get whiskers, iqrs and outliers and non outliers count. All the counts are calculated in a single pass
         :return:
         """
-        upper_bound, lower_bound, = dict_filter(self.whiskers(),
-                                                ["upper_bound", "lower_bound"])
-
-        result = {"count_outliers": self.count(), "count_non_outliers": self.non_outliers_count(),
-                  "lower_bound": lower_bound, "lower_bound_count": self.count_lower_bound(lower_bound),
-                  "upper_bound": upper_bound, "upper_bound_count": self.count_upper_bound(upper_bound)}
+        stats = self.stats()
+        lower_bound = self.lower_bound
+        upper_bound = self.upper_bound
+
+        result = {"count_outliers": stats["lower_bound_count"] + stats["upper_bound_count"],
+                  "count_non_outliers": stats["count_non_outliers"],
+                  "lower_bound": lower_bound, "lower_bound_count": stats["lower_bound_count"],
+                  "upper_bound": upper_bound, "upper_bound_count": stats["upper_bound_count"]}
         if output == "json":
             result = dump_json(result)
         return result
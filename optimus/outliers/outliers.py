@@ -10,8 +10,8 @@ class Outliers:
     def __init__(self, df):
         self.df = df
 
-    def tukey(self, columns):
-        return Tukey(self.df, columns)
+    def tukey(self, columns, relative_error=RELATIVE_ERROR):
+        return Tukey(self.df, columns, relative_error)
 
     def z_score(self, columns, threshold):
         return ZScore(self.df, columns, threshold)
@@ -1,3 +1,6 @@
+from optimus.helpers.columns import parse_columns
+from optimus.helpers.constants import RELATIVE_ERROR
+from optimus.helpers.core import one_list_to_val
 from optimus.helpers.filters import dict_filter
 from optimus.helpers.json import dump_json
 from optimus.outliers.abstract_outliers_bounds import AbstractOutlierBounds
@@ -8,42 +11,48 @@ class Tukey(AbstractOutlierBounds):
     Handle outliers using inter quartile range
     """
 
-    def __init__(self, df, col_name):
+    def __init__(self, df, col_name, relative_error: int = RELATIVE_ERROR):
         """
 
         :param df: Spark Dataframe
         :param col_name: column name
+        :param relative_error:
         """
         self.df = df
-        self.col_name = col_name
+        self.col_name = one_list_to_val(parse_columns(df, col_name))
+        self.relative_error = relative_error
 
-        self.lower_bound, self.upper_bound, self.q1, self.median, self.q3, self.iqr = dict_filter(
-            self.whiskers(), ["lower_bound", "upper_bound", "q1", "median", "q3", "iqr"]
+        self.lower_bound, self.upper_bound, self.q1, self.median, self.q3, self.iqr, min_value, max_value = dict_filter(
+            self.whiskers(), ["lower_bound", "upper_bound", "q1", "median", "q3", "iqr", "min", "max"]
         )
-        # print(self.lower_bound, self.upper_bound)
-        super().__init__(df, col_name, self.lower_bound, self.upper_bound)
+        super().__init__(df, col_name, self.lower_bound, self.upper_bound, min_value, max_value)
 
     def whiskers(self):
         """
-        Get the whiskers and IQR
+        Get the whiskers and IQR. The quartiles and the column range are read from the same quantile sketch
         :return:
         """
-        iqr = self.df.cols.iqr(self.col_name, more=True)
+        sketch = self.df.cols.quantile_sketch(self.col_name, self.relative_error)[self.col_name]
+        quartile = sketch.quantile([0.25, 0.5, 0.75])
 
-        lower_bound = iqr["q1"] - (iqr["iqr"] * 1.5)
-        upper_bound = iqr["q3"] + (iqr["iqr"] * 1.5)
+        q1, median, q3 = quartile[0.25], quartile[0.5], quartile[0.75]
+        iqr = q3 - q1
 
-        result = {"lower_bound": lower_bound, "upper_bound": upper_bound, "q1": iqr["q1"], "median": iqr["q2"],
-                  "q3": iqr["q3"], "iqr": iqr["iqr"]}
+        lower_bound = q1 - (iqr * 1.5)
+        upper_bound = q3 + (iqr * 1.5)
+
+        result = {"lower_bound": lower_bound, "upper_bound": upper_bound, "q1": q1, "median": median, "q3": q3,
+                  "iqr": iqr, "min": sketch.min, "max": sketch.max}
 
         return result
 
     def info(self, output: str = "dict"):
         """
-        Get whiskers, iqrs and outliers and non outliers count
+        Get whiskers, iqrs and outliers and non outliers count. All the counts are calculated in a single pass
         :return:
         """
 
+        stats = self.stats()
         lower_bound = self.lower_bound
         upper_bound = self.upper_bound
 
@@ -52,9 +61,10 @@ class Tukey(AbstractOutlierBounds):
         q3 = self.q3
         iqr = self.iqr
 
-        result = {"count_outliers": self.count(), "count_non_outliers": self.non_outliers_count(),
-                  "lower_bound": lower_bound, "lower_bound_count": self.count_lower_bound(lower_bound),
-                  "upper_bound": upper_bound, "upper_bound_count": self.count_upper_bound(upper_bound),
+        result = {"count_outliers": stats["lower_bound_count"] + stats["upper_bound_count"],
+                  "count_non_outliers": stats["count_non_outliers"],
+                  "lower_bound": lower_bound, "lower_bound_count": stats["lower_bound_count"],
+                  "upper_bound": upper_bound, "upper_bound_count": stats["upper_bound_count"],
                   "q1": q1, "median": median, "q3": q3, "iqr": iqr}
 
         if output == "json":
@@ -1,7 +1,5 @@
 from optimus.helpers.columns import check_column_numbers
 from optimus.helpers.columns import parse_columns
-from optimus.plots.functions import plot_scatterplot, plot_boxplot, plot_frequency, plot_hist, \
-    plot_correlation, plot_qqplot
 
 
 class Plot:
@@ -17,6 +15,8 @@ class Plot:
         :param output_path: path where the image is going to be saved
         :return:
         """
+        from optimus.plots.functions import plot_hist
+
         df = self.df
         columns = parse_columns(df, columns)
 
@@ -34,6 +34,8 @@ class Plot:
         :param output_path: path where the image is going to be saved
         :return:
         """
+        from optimus.plots.functions import plot_scatterplot
+
         df = self.df
         columns = parse_columns(df, columns, filter_by_column_dtypes=df.constants.NUMERIC_TYPES)
         check_column_numbers(columns, "*")
@@ -49,6 +51,8 @@ class Plot:
         :param output_path: path where the image is going to be saved
         :return:
         """
+        from optimus.plots.functions import plot_boxplot
+
         df = self.df
         columns = parse_columns(df, columns, filter_by_column_dtypes=df.constants.NUMERIC_TYPES)
         check_column_numbers(columns, "*")
@@ -66,6 +70,8 @@ class Plot:
         :param output_path: path where the image is going to be saved
         :return:
         """
+        from optimus.plots.functions import plot_frequency
+
         df = self.df
         columns = parse_columns(df, columns)
         data = df.cols.frequency(columns, buckets)
@@ -84,6 +90,8 @@ class Plot:
         :param output_path: Output path
         :return: Heatmap plot of the corr matrix using seaborn.
         """
+        from optimus.plots.functions import plot_correlation
+
         df = self.df
         cols_data = df.cols.correlation(col_name, method, output="array")
         plot_correlation(cols_data, output=output_format, path=output_path)
@@ -97,6 +105,8 @@ class Plot:
         :param output_path: Path to the output file
         :return:
         """
+        from optimus.plots.functions import plot_qqplot
+
         df = self.df
 
         columns = parse_columns(df, cols_args=columns, filter_by_column_dtypes=df.constants.NUMERIC_TYPES)
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.aggregations import Aggregation, HyperLogLog, Moments, compute_aggregations, \
+    intermediates, plan
+from optimus.engines.base.functions import Functions
+
+rng = np.random.default_rng(0)
+data = pd.DataFrame({"key": rng.integers(0, 10, 5000), "value": rng.normal(100, 3, 5000),
+                     "name": rng.choice(["a", "b", "c", None], 5000)})
+
+op = Optimus("pandas")
+
+
+class TestAggregations(object):
+    @staticmethod
+    def test_plan_shares_intermediates():
+        needed, outputs, others = plan({"value": ["mean", "std", "var", "sum", "median", "percentile_90"],
+                                        "name": ["mode"]})
+        assert needed == {"value": ["moments", "sketch"]}
+        assert list(outputs) == ["value_mean", "value_std", "value_var", "value_sum", "value_median",
+                                 "value_percentile_90"]
+        assert others == [("name", "mode")]
+
+    @staticmethod
+    def test_merged_moments():
+        values = data["value"]
+        moments = Moments.merge([Moments.from_series(values[i:i + 700]) for i in range(0, len(values), 700)])
+        assert moments.count == 5000
+        assert np.isclose(moments.mean(), values.mean())
+        assert np.isclose(moments.std(), values.std())
+
+    @staticmethod
+    def test_hyperloglog():
+        values = pd.Series(rng.integers(0, 20000, 50000))
+        sketch = HyperLogLog.merge([HyperLogLog.from_series(values[i:i + 10000]) for i in range(0, 50000, 10000)])
+        assert abs(sketch.count() - values.nunique()) / values.nunique() < 0.05
+        assert HyperLogLog.from_series(pd.Series(["a", "b", "a", None])).count() == 2
+
+    @staticmethod
+    def test_compute_aggregations():
+        def to_delayed(series):
+            return [series[i:i + 100] for i in range(0, len(series), 100)]
+
+        aggregations = {"min": Aggregation(data["value"], *intermediates()["min"]),
+                        "std": Aggregation(data["value"], *intermediates()["moments"], Moments.std),
+                        "na": Aggregation(data["name"], *intermediates()["count_na"])}
+        result = compute_aggregations(aggregations, Functions.delayed, to_delayed)
+        assert result["min"] == data["value"].min()
+        assert np.isclose(result["std"], data["value"].std())
+        assert result["na"] == data["name"].isna().sum()
+
+    @staticmethod
+    def test_agg_exprs():
+        df = op.create.dataframe(data)
+        result = df.cols.agg_exprs(["value", "name"], [df.functions.count_na, df.functions.min], tidy=False)
+        assert result == {"count_na": {"value": 0, "name": data["name"].isna().sum()},
+                          "min": {"value": data["value"].min(), "name": "a"}}
+        assert df.cols.percentile("value", [0.5], compute=False) == df.cols.median("value")
+        assert df.cols.mad("value", compute=False) == df.cols.mad("value")
+
+    @staticmethod
+    def test_agg():
+        df = op.create.dataframe(data)
+        result = df.agg({"value": ["sum", "mean", "std", "min", "max", "count", "median"],
+                         "name": ["count", "nunique_approx", "min"]})
+        assert list(result) == ["value_sum", "value_mean", "value_std", "value_min", "value_max", "value_count",
+                                "value_median", "name_count", "name_nunique_approx", "name_min"]
+        assert np.isclose(result["value_sum"], data["value"].sum())
+        assert np.isclose(result["value_std"], data["value"].std())
+        assert result["value_max"] == data["value"].max()
+        assert np.isclose(result["value_median"], data["value"].median())
+        assert result["name_count"] == data["name"].count()
+        assert result["name_nunique_approx"] == 3
+        assert result["name_min"] == "a"
+
+    @staticmethod
+    def test_agg_groupby():
+        df = op.create.dataframe(data)
+        result = df.agg({"value": ["mean", "std", "percentile_50"], "name": "nunique_approx"}, groupby="key",
+                        output="dataframe").data
+        expected = data.groupby("key").agg(value_mean=("value", "mean"), value_std=("value", "std"),
+                                           value_percentile_50=("value", "median"),
+                                           name_nunique_approx=("name", "nunique")).reset_index()
+        assert list(result.columns) == list(expected.columns)
+        assert np.allclose(result.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+    @staticmethod
+    def test_cols_groupby():
+        df = op.create.dataframe(data)
+        result = df.cols.groupby("key", {"total": {"value": "sum"}, "median": {"value": "median"}}).data
+        assert list(result.columns) == ["key", "total", "median"]
+        assert np.allclose(result["total"], data.groupby("key")["value"].sum())
+        assert np.allclose(result["median"], data.groupby("key")["value"].median())
+
+    @staticmethod
+    def test_count_uniques():
+        df = op.create.dataframe(pd.DataFrame({"id": np.arange(50000)}))
+        assert df.cols.count_uniques("id") == 50000
+        assert abs(df.cols.count_uniques("id", estimate=True) - 50000) / 50000 < 0.05
@@ -0,0 +1,67 @@
+import os
+import tempfile
+
+import dask
+import dask.dataframe as dd
+import fsspec
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.io import arrow
+from optimus.engines.base.io.arrow import arrow_info, read_pandas, write_table
+from optimus.engines.base.meta import Meta
+from optimus.engines.dask.dataframe import DaskDataFrame
+from optimus.engines.dask.io import save
+from optimus.engines.dask.io.load import Load
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(100), "name": ["a", "b", "c", "d"] * 25})
+
+
+class TestArrow(object):
+    @staticmethod
+    def test_save_and_load():
+        path = os.path.join(tempfile.mkdtemp(), "data.arrow")
+        df = op.create.dataframe(data)
+        df.meta = Meta.set(df.meta, "source", "test")
+        df.save.arrow(path, chunk_size=10)
+        df = op.load.arrow(path, columns=["name"])
+        assert df.data.equals(data[["name"]])
+        assert Meta.get(df.meta, "source") == "test"
+
+    @staticmethod
+    def test_save_removes_previous_files():
+        path = tempfile.mkdtemp()
+        with dask.config.set(scheduler="sync"):
+            DaskDataFrame(dd.from_pandas(data, npartitions=4)).save.arrow(path)
+            DaskDataFrame(dd.from_pandas(data.head(10), npartitions=2)).save.arrow(path)
+            assert sorted(os.listdir(path)) == ["part.0.arrow", "part.1.arrow"]
+            assert Load.arrow(path).data.compute().reset_index(drop=True).equals(data.head(10))
+
+    @staticmethod
+    def test_remote_batches(monkeypatch):
+        # memory:// is not one of the remote schemas Optimus knows
+        monkeypatch.setattr(arrow, "path_is_local", lambda path: not path.startswith("memory://"))
+        path = "memory://arrow/data.arrow"
+        write_table(data, path, chunk_size=10)
+        assert arrow_info(path)[1] == 10
+        assert read_pandas(path, ["id"], 2, 4).equals(data[["id"]].iloc[20:40].reset_index(drop=True))
+        fsspec.filesystem("memory").rm("/arrow", recursive=True)
+
+    @staticmethod
+    def test_partitions_order():
+        path = tempfile.mkdtemp()
+        with dask.config.set(scheduler="sync"):
+            DaskDataFrame(dd.from_pandas(data, npartitions=12)).save.arrow(path)
+            assert Load.arrow(path).data.compute().reset_index(drop=True).equals(data)
+            assert op.load.arrow(path).data.equals(data)
+
+    @staticmethod
+    def test_remote_folder(monkeypatch):
+        for module in [arrow, save]:
+            monkeypatch.setattr(module, "path_is_local", lambda path: not path.startswith("memory://"))
+        path = "memory://arrow_folder"
+        with dask.config.set(scheduler="sync"):
+            DaskDataFrame(dd.from_pandas(data, npartitions=12)).save.arrow(path)
+            assert Load.arrow(path).data.compute().reset_index(drop=True).equals(data)
+        fsspec.filesystem("memory").rm("/arrow_folder", recursive=True)
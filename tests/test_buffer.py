@@ -0,0 +1,55 @@
+import dask
+import dask.dataframe as dd
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.dask.buffer import Buffer
+from optimus.engines.base.meta import Meta
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(100), "name": ["a", "b", "c", "d"] * 25})
+
+
+def create_buffer(n=100, prefetch=1):
+    dfd = dd.from_pandas(data, npartitions=10)
+    lengths = dfd.map_partitions(len).compute(scheduler="sync")
+    return Buffer(dfd, ["id", "name"], lengths, n, prefetch)
+
+
+class TestBuffer(object):
+    @staticmethod
+    def test_window_across_partitions():
+        buffer = create_buffer()
+        with dask.config.set(scheduler="sync"):
+            assert buffer.window(25, 42).equals(data.iloc[25:42])
+            assert buffer.window(95, None).equals(data.iloc[95:])
+            assert buffer.window(120, 130).empty
+
+    @staticmethod
+    def test_window_only_loads_near_partitions():
+        buffer = create_buffer(n=30)
+        with dask.config.set(scheduler="sync"):
+            buffer.window(52, 57)
+            # The window partition and one neighbour page on each side
+            assert sorted(buffer.blocks) == [4, 5, 6]
+            buffer.window(80, 85)
+            assert sum(len(pdf) for pdf in buffer.blocks.values()) <= 30
+            assert 8 in buffer.blocks
+
+    @staticmethod
+    def test_buffer_window():
+        df = op.create.dataframe(data)
+        assert df.buffer_window("name", 10, 13).data.equals(data[["name"]].iloc[10:13])
+        assert df[90:].data.equals(data.iloc[90:])
+
+    @staticmethod
+    def test_action_expires_buffer():
+        df = op.create.dataframe(data)
+        df.buffer = create_buffer()
+        df.buffer.data = df.data
+        df.meta = Meta.set(df.meta, "buffer_time", 1)
+        assert not df._buffer_expired(["id"])
+        assert df._buffer_expired(["id", "other"])
+
+        df.meta = Meta.action(df.meta, "action", "id")
+        assert df._buffer_expired(["id"])
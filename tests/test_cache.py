@@ -0,0 +1,52 @@
+import gzip
+import os
+import tempfile
+
+import fsspec
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.io.cache import RemoteCache
+from optimus.engines.base.io.connect import Connection
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(100), "name": ["a", "b", "c", "d"] * 25})
+
+
+def create_connection(block_size=64):
+    memory = fsspec.filesystem("memory")
+    memory.pipe("/bucket/data.csv", data.to_csv(index=False).encode("utf-8"))
+    memory.pipe("/bucket/data.csv.gz", gzip.compress(data.to_csv(index=False).encode("utf-8")))
+    memory.pipe("/bucket/folder/part.0.json", b'{"id": 1}\n')
+    cache = RemoteCache(path=tempfile.mkdtemp(), block_size=block_size)
+    return Connection(base_url="memory://bucket", cache=cache)
+
+
+class TestCache(object):
+    @staticmethod
+    def test_head_is_reused():
+        conn = create_connection()
+        assert conn.head("data.csv", 100) == data.to_csv(index=False).encode("utf-8")[:100]
+        assert conn.cache.size() > 0
+        local_path = conn.local_path("data.csv")
+        assert local_path.endswith(".csv")
+        assert pd.read_csv(local_path).equals(data)
+
+    @staticmethod
+    def test_source():
+        conn = create_connection()
+        path, storage_options = conn.source("data.csv.gz")
+        assert path.endswith(".csv.gz") and os.path.exists(path) and storage_options is None
+        # Folders are read from the remote file system
+        assert conn.source("folder") == ("memory://bucket/folder", None)
+
+    @staticmethod
+    def test_loaders_read_the_local_copy():
+        conn = create_connection()
+        assert op.load.csv("data.csv.gz", conn=conn).data.equals(data)
+        assert op.load.json("folder/part.0.json", multiline=True, conn=conn).data["id"].tolist() == [1]
+
+    @staticmethod
+    def test_file_with_positional_connection():
+        conn = create_connection()
+        assert op.load.file("data.csv", conn).data.equals(data)
@@ -0,0 +1,83 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.functions import break_date_formats_tie, infer_date_formats, rank_date_formats
+from optimus.helpers.constants import DATAFRAME_CACHE_SIZE
+
+op = Optimus("pandas")
+data = pd.DataFrame({"date": ["2021-03-04 10:20:30", "2020-12-31 23:59:01", None]})
+
+
+class TestDates(object):
+    @staticmethod
+    def test_date_parts():
+        df = op.create.dataframe(data)
+        result = df.cols.date_parts("date", ["year", "month", "day", "hour", "weekday"], format="%Y-%m-%d %H:%M:%S")
+        assert result.data["date_year"].tolist()[:2] == [2021, 2020]
+        assert result.data["date_month"].tolist()[:2] == [3, 12]
+        assert result.data["date_day"].tolist()[:2] == [4, 31]
+        assert result.data["date_hour"].tolist()[:2] == [10, 23]
+        assert result.data["date_weekday"].tolist()[:2] == [3, 3]
+        assert pd.isna(result.data["date_year"].iloc[2])
+
+    @staticmethod
+    def test_single_part():
+        df = op.create.dataframe(data)
+        result = df.cols.date_parts("date", "minute", format="%Y-%m-%d %H:%M:%S", output_cols="minute")
+        assert result.data["minute"].tolist()[:2] == [20, 59]
+
+    @staticmethod
+    def test_parsed_column_is_cached():
+        df = op.create.dataframe(data)
+        calls = []
+
+        def parse(series):
+            calls.append(1)
+            return pd.to_datetime(series)
+
+        assert df.cols._parsed("datetime", "date", parse) is df.cols._parsed("datetime", "date", parse)
+        assert len(calls) == 1
+
+        # New data is parsed again
+        df["other"] = 1
+        df.cols._parsed("datetime", "date", parse)
+        assert len(calls) == 2
+
+    @staticmethod
+    def test_cache_is_bounded():
+        df = op.create.dataframe(data)
+        for i in range(DATAFRAME_CACHE_SIZE + 10):
+            df._cached(("key", i), lambda: i)
+        assert len(df._cache) == DATAFRAME_CACHE_SIZE
+        assert df._cached(("key", 0)) is None
+        assert df._cached(("key", DATAFRAME_CACHE_SIZE + 9)) == DATAFRAME_CACHE_SIZE + 9
+
+    @staticmethod
+    def test_infer_date_formats():
+        sample = pd.Series(["01/02/2021", "03/04/2021", None, 5])
+        assert infer_date_formats(sample) == ["%m/%d/%Y", "%d/%m/%Y"]
+        assert rank_date_formats(pd.Series(["2021-01-02", "bad"]), ["%Y-%m-%d"]) == [("%Y-%m-%d", 0.5)]
+
+    @staticmethod
+    def test_tied_formats_use_the_whole_column():
+        df = op.create.dataframe(pd.DataFrame({"date": ["01/02/2021", "03/04/2021", "25/12/2021"]}))
+        # Both formats parse the sample
+        assert df.cols.infer_date_format("date", df.data["date"].head(2)) == ("%d/%m/%Y", 1.0)
+
+    @staticmethod
+    def test_break_date_formats_tie():
+        formats = ["%m/%d/%Y", "%d/%m/%Y"]
+        assert break_date_formats_tie(pd.Series(["01/02/2021", "03/04/2021", "25/12/2021"]), formats) == ["%d/%m/%Y"]
+        assert break_date_formats_tie(pd.Series(["01/01/2021", None, "bad"]), formats) == formats
+
+    @staticmethod
+    def test_profiler_keeps_the_format():
+        df = op.create.dataframe(pd.DataFrame({"date": ["01/02/2021", "03/04/2021", "25/12/2021", None] * 5}))
+        assert df.cols.infer_profiler_dtypes("date") == {"date": {"dtype": "datetime", "categorical": False,
+                                                                  "format": "%d/%m/%Y"}}
+
+    @staticmethod
+    def test_mask_datetime():
+        df = op.create.dataframe(pd.DataFrame({"date": ["01/02/2021", "03/04/2021", "25/12/2021", "bad"]}))
+        assert df.mask.datetime("date").data["date"].tolist() == [True, True, True, False]
+        assert df.mask.datetime("date", format="%m/%d/%Y").data["date"].tolist() == [True, True, False, False]
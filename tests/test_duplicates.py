@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.duplicates import bloom_duplicated, bloom_size, duplicated_ids, ids_to_mask, \
+    row_hashes
+
+op = Optimus("pandas")
+rng = np.random.default_rng(0)
+data = pd.DataFrame({"id": rng.integers(0, 30, 200), "name": rng.choice(["a", "b", None], 200),
+                     "value": rng.normal(size=200)})
+
+
+class TestDuplicates(object):
+    @staticmethod
+    def test_duplicated_ids():
+        parts = [data.iloc[:80], data.iloc[80:]]
+        hashes = pd.concat([row_hashes(part, ["id", "name"], i) for i, part in enumerate(parts)])
+        for keep in ["first", "last", False]:
+            ids = duplicated_ids(hashes.sample(frac=1, random_state=0), keep)
+            mask = np.concatenate([ids_to_mask(ids[(ids >> np.uint64(40)) == i], len(part))
+                                   for i, part in enumerate(parts)])
+            assert (mask == data.duplicated(["id", "name"], keep=keep).to_numpy()).all()
+
+    @staticmethod
+    def test_bloom_duplicated():
+        bits, k = bloom_size(len(data))
+        bloom = np.zeros((bits + 7) // 8, dtype=np.uint8)
+        masks = []
+        for i, part in enumerate([data.iloc[:80], data.iloc[80:]]):
+            mask, bloom = bloom_duplicated(row_hashes(part, ["id", "name"], i), bloom, k)
+            masks.append(mask)
+        expected = data.duplicated(["id", "name"]).to_numpy()
+        mask = np.concatenate(masks)
+        # A Bloom filter never misses a duplicate
+        assert mask[expected].all()
+        assert (mask & ~expected).sum() <= 5
+
+    @staticmethod
+    def test_drop_duplicates():
+        df = op.create.dataframe(data)
+        actual = df.rows.drop_duplicates(["id", "name"], keep="last").data
+        assert actual.equals(data.drop_duplicates(["id", "name"], keep="last"))
+        assert df.mask.duplicated("id", keep=False).data.equals(data.duplicated("id", keep=False))
@@ -0,0 +1,70 @@
+import os
+import tempfile
+
+import pandas as pd
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from optimus import Optimus
+from optimus.engines.base.dask.io.jdbc import DaskBaseJDBC
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": [1, 2, 3], "name": ["a", "b", "c"]})
+
+
+def create_db():
+    path = os.path.join(tempfile.mkdtemp(), "test.db")
+    return DaskBaseJDBC(host=None, database=path, user=None, password=None, driver="sqlite")
+
+
+def read_table(db, table):
+    return pd.read_sql(f"SELECT * FROM {table} ORDER BY id", sa.create_engine(db.uri))
+
+
+class TestJDBC(object):
+    @staticmethod
+    def test_overwrite_is_the_default():
+        db = create_db()
+        df = op.create.dataframe(data)
+        assert db.df_to_table(df, "users")["rows"] == 3
+        assert db.df_to_table(df, "users")["rows"] == 3
+        assert read_table(db, "users").equals(data)
+
+    @staticmethod
+    def test_append():
+        db = create_db()
+        df = op.create.dataframe(data)
+        db.df_to_table(df, "users")
+        db.df_to_table(df, "users", mode="append")
+        assert len(read_table(db, "users")) == 6
+
+    @staticmethod
+    def test_upsert():
+        db = create_db()
+        db.df_to_table(op.create.dataframe(data), "users", mode="upsert", key_columns="id")
+        update = pd.DataFrame({"id": [3, 4], "name": ["z", "d"]})
+        db.df_to_table(op.create.dataframe(update), "users", mode="upsert", key_columns="id")
+        assert read_table(db, "users")["name"].tolist() == ["a", "b", "z", "d"]
+
+    @staticmethod
+    def test_copy_quotes_identifiers():
+        executed = []
+
+        class Cursor(object):
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            @staticmethod
+            def copy_expert(query, buffer):
+                executed.append((query, buffer.read()))
+
+        class Connection(object):
+            dialect = postgresql.dialect()
+            connection = type("DBAPIConnection", (object,), {"cursor": lambda self: Cursor()})()
+
+        table = type("PandasTable", (object,), {"table": sa.Table("user data", sa.MetaData(), schema="my schema")})
+        DaskBaseJDBC._copy_from_stdin(table, Connection(), ["id", "full name"], iter([(1, "a")]))
+        assert executed == [('COPY "my schema"."user data" (id, "full name") FROM STDIN WITH CSV', "1,a\r\n")]
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.join import key_kind
+
+rng = np.random.default_rng(0)
+left = pd.DataFrame({"id": rng.integers(0, 50, 300), "value": rng.normal(size=300),
+                     "code": rng.choice(["a", "b", "c", None], 300)})
+right = pd.DataFrame({"id": np.arange(40), "weight": np.arange(40) * 2.0, "code": ["a", "b", "d", None] * 10})
+
+op = Optimus("pandas")
+
+
+def assert_frame_equal(actual, expected):
+    assert actual.reset_index(drop=True).fillna(-1).equals(expected.reset_index(drop=True).fillna(-1))
+
+
+class TestJoin(object):
+    @staticmethod
+    def test_key_kind():
+        assert key_kind(np.dtype("int64")) == key_kind(np.dtype("float64")) == "numeric"
+        assert key_kind(np.dtype("O")) == key_kind(pd.CategoricalDtype(["a"])) == "string"
+        assert key_kind(pd.CategoricalDtype([1, 2])) == "numeric"
+        assert key_kind(np.dtype("datetime64[ns]")) == "datetime"
+
+    @staticmethod
+    def test_join_keeps_key_dtype():
+        for how in ["left", "inner", "outer", "right"]:
+            actual = op.create.dataframe(left).cols.join(op.create.dataframe(right), how=how, on="id").data
+            assert actual["id"].dtype == np.int64
+            assert_frame_equal(actual, left.merge(right, how=how, on="id", suffixes=("_left", "_right")))
+
+    @staticmethod
+    def test_join_string_keys():
+        for how in ["left", "inner", "outer", "right"]:
+            actual = op.create.dataframe(left).cols.join(op.create.dataframe(right), how=how, on="code").data
+            assert_frame_equal(actual, left.merge(right, how=how, on="code", suffixes=("_left", "_right")))
+
+    @staticmethod
+    def test_join_different_kinds():
+        actual = op.create.dataframe(left).cols.join(op.create.dataframe(right.assign(id=right["id"].astype(str))),
+                                                     on="id").data
+        assert actual["weight"].notna().sum() == left["id"].isin(right["id"]).sum()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.io.json_lines import read_json_lines, read_json_lines_table, write_json_lines
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(100), "name": ["a", "b", "c", None] * 25, "value": [1.5, 2.0] * 50})
+
+
+class TestJSONLines(object):
+    @staticmethod
+    def test_write_in_batches():
+        path = os.path.join(tempfile.mkdtemp(), "data.jsonl")
+        assert write_json_lines(data, path, batch_size=30) == 100
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 100
+        assert lines[3] == '{"id":3,"name":null,"value":2.0}'
+
+    @staticmethod
+    def test_read_in_batches():
+        path = os.path.join(tempfile.mkdtemp(), "data.jsonl.gz")
+        write_json_lines(data, path, batch_size=30)
+        batches = list(read_json_lines(path, batch_size=40))
+        assert [len(batch) for batch in batches] == [40, 40, 20]
+        assert pd.concat(batches, ignore_index=True).equals(data)
+        assert read_json_lines_table(path).to_pandas().equals(data)
+
+    @staticmethod
+    def test_orjson():
+        path = os.path.join(tempfile.mkdtemp(), "data.jsonl")
+        write_json_lines(data, path, use_orjson=True)
+        assert pd.concat(read_json_lines(path, use_orjson=True), ignore_index=True).equals(data)
+
+    @staticmethod
+    def test_save_and_load():
+        path = os.path.join(tempfile.mkdtemp(), "data.jsonl")
+        op.create.dataframe(data).save.json(path, lines=True)
+        assert op.load.json(path, multiline=True).data.equals(data)
+
+    @staticmethod
+    def test_load_mixed_types():
+        path = os.path.join(tempfile.mkdtemp(), "data.jsonl")
+        with open(path, "w") as f:
+            f.write('{"id": 1, "value": "a"}\n{"id": 2, "value": 3}\n')
+        # pyarrow can not parse a column with strings and numbers
+        assert op.load.json(path, multiline=True).data["value"].tolist() == ["a", 3]
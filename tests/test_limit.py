@@ -0,0 +1,35 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.io.parquet import parquet_head
+from optimus.engines.base.meta import Meta
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(30), "name": ["a", "b", "c"] * 10})
+
+
+class TestLimit(object):
+    @staticmethod
+    def test_limit():
+        df = op.create.dataframe(data)
+        assert df.rows.limit(10).data.equals(data.head(10))
+        assert df.rows.limit(100).rows.count() == 30
+
+    @staticmethod
+    def test_limit_resets_count():
+        df = op.create.dataframe(data)
+        df.rows.count()
+        assert Meta.get(df.rows.limit(5).meta, "rows") is None
+
+    @staticmethod
+    def test_parquet_head(tmp_path):
+        data.to_parquet(tmp_path / "a.parquet", row_group_size=10)
+        data.to_parquet(tmp_path / "b.parquet", row_group_size=10)
+        assert parquet_head(str(tmp_path / "a.parquet"), 12, ["name"]).equals(data[["name"]].head(12))
+        assert len(parquet_head(str(tmp_path), 45)) == 45
+
+    @staticmethod
+    def test_parquet_head_natural_order(tmp_path):
+        for i in range(12):
+            data.iloc[i * 2: i * 2 + 2].to_parquet(tmp_path / f"part.{i}.parquet")
+        assert parquet_head(str(tmp_path), 20)["id"].tolist() == list(range(20))
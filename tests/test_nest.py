@@ -0,0 +1,45 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.functions import split, unnest_array
+
+op = Optimus("pandas")
+df = op.create.dataframe({"names": ["Ana,Bea,Cy", "Dan", None], "values": [[1, 2, 3], [4], None],
+                          "id": [1, 2, 3]})
+
+
+class TestNest(object):
+    @staticmethod
+    def test_split_keeps_every_column():
+        actual = split(pd.Series(["a", "b"]), ",", 3)
+        assert list(actual.columns) == [0, 1, 2]
+        assert actual[2].isna().all()
+
+    @staticmethod
+    def test_unnest_array():
+        actual = unnest_array(pd.Series([[1, 2, 3], (4,), None, "x"]), 2)
+        assert list(actual.columns) == [0, 1]
+        assert actual[0].tolist()[:2] == [1, 4]
+        assert actual.iloc[2:].isna().all().all()
+
+    @staticmethod
+    def test_unnest_string():
+        actual = df.cols.unnest("names", ",", splits=3)
+        assert actual.cols.names() == ["names", "names_0", "names_1", "names_2", "values", "id"]
+        assert actual.data["names_1"].tolist()[:2] == ["Bea", None]
+
+    @staticmethod
+    def test_unnest_array_index_drop():
+        actual = df.cols.unnest("values", splits=3, index=[0, 2], mode="array", drop=True)
+        assert actual.cols.names() == ["names", "values_0", "values_2", "id"]
+        assert actual.data["values_2"].tolist()[0] == 3
+
+    @staticmethod
+    def test_nest():
+        actual = df.cols.nest(["names", "id"], separator="-", output_col="key")
+        assert actual.cols.names() == ["names", "values", "id", "key"]
+        assert actual.data["key"].tolist() == ["Ana,Bea,Cy-1", "Dan-2", "None-3"]
+
+        actual = df.cols.nest(["id", "id"], shape="array", output_col="pair", drop=True)
+        assert actual.data["pair"].tolist() == [[1, 1], [2, 2], [3, 3]]
+
@@ -0,0 +1,24 @@
+import pandas as pd
+
+from optimus.engines.base.commons.nlp import remove_stopwords, word_tokenize
+
+STOP_WORDS = frozenset(["the", "is", "and", "of", "don't"])
+
+
+class TestNLP(object):
+    @staticmethod
+    def test_remove_stopwords():
+        series = pd.Series(["The cat is  on the mat, and I don't care.", None, "Art of the e-mail", 12,
+                            "The cat is  on the mat, and I don't care."])
+        actual = remove_stopwords(series, STOP_WORDS).tolist()
+        assert actual == ["cat on mat, i care.", None, "art e-mail", "12", "cat on mat, i care."]
+
+    @staticmethod
+    def test_remove_stopwords_keep_case():
+        actual = remove_stopwords(pd.Series(["The Cat is here"]), STOP_WORDS, lower=False).tolist()
+        assert actual == ["The Cat here"]
+
+    @staticmethod
+    def test_word_tokenize():
+        actual = word_tokenize(pd.Series(["I don't like e-mail, really.", None])).tolist()
+        assert actual == [["I", "don't", "like", "e-mail", ",", "really", "."], None]
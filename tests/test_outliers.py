@@ -0,0 +1,42 @@
+import numpy as np
+
+from optimus import Optimus
+
+op = Optimus("pandas")
+df = op.create.dataframe({"height": [-28, 17, 26, 13, None, 300, None]})
+
+
+def counts(outliers):
+    values = df.data["height"]
+    return {"lower_bound_count": int((values < outliers.lower_bound).sum()),
+            "upper_bound_count": int((values > outliers.upper_bound).sum()),
+            "count_non_outliers": int(((values >= outliers.lower_bound) & (values <= outliers.upper_bound)).sum())}
+
+
+class TestOutliers(object):
+    @staticmethod
+    def test_mad_info():
+        actual = df.outliers.mad("height", 0.5).info()
+        assert actual == {"count_outliers": 3, "count_non_outliers": 2, "lower_bound": 12.5, "lower_bound_count": 1,
+                          "upper_bound": 21.5, "upper_bound_count": 2}
+
+    @staticmethod
+    def test_tukey_info():
+        outliers = df.outliers.tukey("height")
+        actual = outliers.info()
+        expected = counts(outliers)
+        assert {key: actual[key] for key in expected} == expected
+        assert actual["count_outliers"] == outliers.count() == 2
+        assert (actual["q1"], actual["median"], actual["q3"], actual["iqr"]) == (13, 17, 26, 13)
+
+    @staticmethod
+    def test_stats_hist():
+        outliers = df.outliers.tukey("height")
+        stats = outliers.stats(buckets=5)
+        hist = stats["hist"]
+        for key, count in [("lower_bound", "lower_bound_count"), ("non_outliers", "count_non_outliers"),
+                           ("upper_bound", "upper_bound_count")]:
+            assert len(hist[key]) == 4
+            assert sum(_bin["count"] for _bin in hist[key]) == stats[count]
+        assert hist["lower_bound"][0]["lower"] == -28
+        assert np.isclose(hist["upper_bound"][-1]["upper"], 300)
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from optimus import Optimus
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(100), "name": ["d", "c", "b", "a"] * 25})
+
+
+def read(path):
+    return pd.read_parquet(path).sort_values("id").reset_index(drop=True)
+
+
+class TestParquet(object):
+    @staticmethod
+    def test_append_to_file():
+        path = os.path.join(tempfile.mkdtemp(), "data.parquet")
+        op.create.dataframe(data.head(50)).save.parquet(path)
+        assert os.path.isfile(path)
+        op.create.dataframe(data.tail(50)).save.parquet(path, mode="append")
+        assert os.path.isdir(path)
+        assert read(path).equals(data)
+
+    @staticmethod
+    def test_append_to_dataset():
+        path = os.path.join(tempfile.mkdtemp(), "data")
+        op.create.dataframe(data.head(50)).save.parquet(path, partition_on="name")
+        assert os.path.exists(os.path.join(path, "_metadata"))
+        op.create.dataframe(data.tail(50)).save.parquet(path, mode="append", partition_on="name")
+        # The summary of the first save does not include the appended files
+        assert not os.path.exists(os.path.join(path, "_metadata"))
+        assert op.load.parquet(path).rows.count() == 100
+
+    @staticmethod
+    def test_partition_on():
+        path = os.path.join(tempfile.mkdtemp(), "data")
+        op.create.dataframe(data).save.parquet(path, partition_on="name")
+        assert sorted(os.listdir(path)) == ["_metadata", "name=a", "name=b", "name=c", "name=d"]
+        assert pq.read_metadata(os.path.join(path, "_metadata")).num_rows == 100
+        assert pd.read_parquet(path, filters=[("name", "=", "a")])["id"].tolist() == list(range(3, 100, 4))
+
+    @staticmethod
+    def test_sort_by():
+        path = os.path.join(tempfile.mkdtemp(), "data.parquet")
+        op.create.dataframe(data).save.parquet(path, sort_by=["name", "id"], row_group_size=25)
+        metadata = pq.read_metadata(path)
+        names = [metadata.row_group(i).column(1).statistics for i in range(metadata.num_row_groups)]
+        assert [(stats.min, stats.max) for stats in names] == [("a", "a"), ("b", "b"), ("c", "c"), ("d", "d")]
@@ -0,0 +1,68 @@
+import dask
+import dask.dataframe as dd
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.dask.partitions import coalesce_groups, partition_stats, partitions_count, row_bytes
+from optimus.engines.base.meta import Meta
+from optimus.engines.dask.dataframe import DaskDataFrame
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(10000), "name": ["abc"] * 10000})
+data["keep"] = data["id"] % 100 == 0
+
+
+class TestPartitions(object):
+    @staticmethod
+    def test_coalesce_groups():
+        assert coalesce_groups([100] * 7, 3) == [(0, 2), (2, 5), (5, 7)]
+        assert coalesce_groups([0, 0, 100, 0], 2) == [(0, 2), (2, 4)]
+        assert coalesce_groups([0] * 5, 1) == [(0, 5)]
+
+    @staticmethod
+    def test_partitions_count():
+        stats = [partition_stats(data.iloc[i:i + 2000], 100) for i in range(0, 10000, 2000)]
+        assert [length for length, _, _ in stats] == [2000] * 5
+        size = row_bytes(stats)
+        assert size == data.head(100).memory_usage(deep=True).sum() / 100
+        assert partitions_count(10000, size, size * 2500) == 4
+        assert partitions_count(0, size, 1024) == 1
+
+    @staticmethod
+    def test_select_is_lazy():
+        df = DaskDataFrame(dd.from_pandas(data, npartitions=7))
+        df.rows.count()
+        df = df.rows.select(df["keep"])
+        assert df.data.npartitions == 7
+        assert Meta.get(df.meta, "rows") is None
+
+    @staticmethod
+    def test_select_coalesces_partitions(monkeypatch):
+        monkeypatch.setattr("optimus.engines.base.rows.COALESCE_FILTERS", True)
+        df = DaskDataFrame(dd.from_pandas(data, npartitions=7))
+        with dask.config.set(scheduler="sync"):
+            # The rows count before the filter is not known
+            assert df.rows.select(df["keep"]).data.npartitions == 7
+
+            df.rows.count()
+            # Most of the rows are kept
+            assert df.rows.select(~df["keep"]).data.npartitions == 7
+
+            df = df.rows.select(df["keep"])
+            assert df.data.npartitions == 1
+            assert Meta.get(df.meta, "rows") == {"count": 100, "partition_lengths": [100]}
+            assert df.data.compute().equals(data[data["keep"]])
+
+    @staticmethod
+    def test_auto_repartition():
+        df = DaskDataFrame(dd.from_pandas(data, npartitions=7))
+        size = data.memory_usage(deep=True).sum()
+        with dask.config.set(scheduler="sync"):
+            assert df.repartition("auto", partition_size=int(size / 2.5)).data.npartitions == 3
+            assert df.repartition("auto", partition_size=int(size / 9.5)).data.npartitions == 10
+            assert df.repartition("auto", partition_size=int(size / 2.5)).data.compute().equals(data)
+
+    @staticmethod
+    def test_pandas_select():
+        df = op.create.dataframe(data)
+        assert df.rows.select(df["keep"]).data.equals(data[data["keep"]])
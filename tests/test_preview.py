@@ -0,0 +1,40 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.meta import Meta
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(50), "name": ["a", "b"] * 25})
+
+
+class TestPreview(object):
+    @staticmethod
+    def test_ascii_limit():
+        df = op.create.dataframe(data)
+        lines = df.ascii(3).splitlines()
+        # Two header lines, the separator and the rows
+        assert len(lines) == 6
+        assert lines[-1].split() == ["2", "a"]
+
+    @staticmethod
+    def test_table_html():
+        df = op.create.dataframe(data)
+        html = df.table_html(limit=4, columns="name")
+        assert "Viewing 4 of 50 rows / 2 columns" in html
+        assert html.count("<tr>") == 5
+
+    @staticmethod
+    def test_preview_is_memoized_per_data():
+        df = op.create.dataframe(data)
+        assert df.ascii(5) is df.ascii(5)
+        assert df.table_html(limit=5) is df.table_html(limit=5)
+
+        df["id"] = df.data["id"] * 2
+        assert df.ascii(5).splitlines()[-1].split() == ["8", "a"]
+
+    @staticmethod
+    def test_count_is_cached():
+        df = op.create.dataframe(data)
+        assert Meta.get(df.meta, "rows.count") is None
+        assert df.rows.count() == 50
+        assert Meta.get(df.meta, "rows.count") == 50
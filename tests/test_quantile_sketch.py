@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.sketch import QuantileSketch
+
+rng = np.random.default_rng(0)
+values = pd.Series(np.r_[rng.normal(size=999), [np.nan] * 5])
+QUANTILES = [0, 0.1, 0.25, 0.5, 0.75, 0.9, 1]
+
+
+class TestQuantileSketch(object):
+    @staticmethod
+    def test_exact_when_the_sketch_keeps_every_value():
+        sketch = QuantileSketch.from_series(values, 10000)
+        expected = values.quantile(QUANTILES).to_dict()
+        assert np.allclose(list(sketch.quantile(QUANTILES).values()), list(expected.values()))
+        mad, median = sketch.mad()
+        assert np.isclose(median, values.median())
+        assert np.isclose(mad, (values - values.median()).abs().median())
+
+    @staticmethod
+    def test_merge_rank_error():
+        data = pd.Series(rng.lognormal(size=200000))
+        relative_error = 0.01
+        sketch = QuantileSketch.merge([QuantileSketch.from_series(data[i:i + 10000], relative_error)
+                                       for i in range(0, len(data), 10000)], relative_error)
+        assert sketch.count == len(data)
+        assert (sketch.min, sketch.max) == (data.min(), data.max())
+
+        quantiles = list(np.linspace(0.01, 0.99, 99))
+        result = np.array(list(sketch.quantile(quantiles).values()))
+        ranks = np.searchsorted(np.sort(data.to_numpy()), result) / len(data)
+        assert np.abs(ranks - quantiles).max() <= relative_error
+
+    @staticmethod
+    def test_empty():
+        sketch = QuantileSketch.merge([QuantileSketch.from_series(pd.Series([None, "a"]), 0.01)], 0.01)
+        assert sketch.count == 0
+        assert np.isnan(sketch.quantile([0.5]))
+
+    @staticmethod
+    def test_cols_percentile_mad():
+        df = Optimus("pandas").create.dataframe({"a": values})
+        assert np.isclose(df.cols.percentile("a", [0.25]), values.quantile(0.25))
+        assert np.isclose(df.cols.median("a"), values.median())
+        assert np.isclose(df.cols.mad("a"), (values - values.median()).abs().median())
+        # The sketch is cached for the same data
+        sketch = df.cols.quantile_sketch("a")["a"]
+        assert df.cols.quantile_sketch("a")["a"] is sketch
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.io.parquet import parquet_count
+from optimus.engines.base.meta import Meta
+
+op = Optimus("pandas")
+data = pd.DataFrame({"id": range(20), "name": ["a", "b"] * 10})
+
+
+class TestRowsCount(object):
+    @staticmethod
+    def test_count_is_kept_by_column_actions():
+        df = op.create.dataframe(data)
+        assert df._partition_lengths() == [20]
+        assert Meta.get(df.meta, "rows") == {"count": 20, "partition_lengths": [20]}
+
+        df = df.cols.upper("name").cols.rename("name", "NAME")
+        assert Meta.get(df.meta, "rows.count") == 20
+
+    @staticmethod
+    def test_count_is_reset_by_rows_actions():
+        df = op.create.dataframe(data)
+        df.rows.count()
+
+        df = df.rows.select(df["id"] < 5)
+        assert Meta.get(df.meta, "rows") is None
+        assert df.rows.count() == 5
+
+        df = df.rows.drop(df["id"] > 2)
+        assert df.rows.count() == 3
+
+    @staticmethod
+    def test_parquet_count(tmp_path):
+        data.to_parquet(tmp_path / "a.parquet")
+        data.head(5).to_parquet(tmp_path / "b.parquet")
+        assert parquet_count(str(tmp_path / "a.parquet")) == 20
+        assert parquet_count(str(tmp_path)) == 25
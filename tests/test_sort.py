@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from optimus import Optimus
+
+rng = np.random.default_rng(0)
+data = pd.DataFrame({"a": rng.integers(0, 5, 200).astype(float), "b": rng.normal(size=200),
+                     "s": rng.choice(["x", "y", "z"], 200)})
+data.loc[::17, "a"] = np.nan
+
+op = Optimus("pandas")
+df = op.create.dataframe(data)
+
+
+class TestSort(object):
+    @staticmethod
+    def test_sort_multiple_columns():
+        actual = df.rows.sort([("a", "desc"), ("s", "asc"), ("b", "desc")]).data
+        expected = data.sort_values(["a", "s", "b"], ascending=[False, True, False])
+        assert actual.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+    @staticmethod
+    def test_sort_list_of_columns():
+        actual = df.rows.sort(["s", "b"]).data
+        expected = data.sort_values(["s", "b"], ascending=False)
+        assert actual.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+    @staticmethod
+    def test_sort_invalid_order():
+        with pytest.raises(ValueError):
+            df.rows.sort([("a", "up")])
+
+    @staticmethod
+    def test_top_k():
+        for spec in [[("a", "desc"), ("s", "asc"), ("b", "desc")], [("s", "asc"), ("b", "asc")], ["b"]]:
+            names = [value[0] if isinstance(value, tuple) else value for value in spec]
+            ascending = [value[1] == "asc" if isinstance(value, tuple) else False for value in spec]
+            actual = df.rows.top_k(spec, 7).data
+            expected = data.sort_values(names, ascending=ascending).head(7)
+            assert actual.reset_index(drop=True).equals(expected.reset_index(drop=True))
+
+    @staticmethod
+    def test_top_k_more_than_rows():
+        assert len(df.rows.top_k("a", 500, "asc").data) == len(data)
@@ -0,0 +1,33 @@
+import json
+import subprocess
+import sys
+
+# Modules that must only be imported when a function that needs them is called
+LAZY_MODULES = ["nltk", "matplotlib", "seaborn", "statsmodels", "sklearn", "dask_ml", "sqlalchemy", "boto3", "magic",
+                "pendulum", "jsonschema", "wordninja", "imgkit", "IPython", "distributed"]
+
+STARTUP_SCRIPT = """
+import json
+import sys
+
+from optimus import Optimus
+op = Optimus("pandas")
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def startup_modules():
+    """
+    Start Optimus in a new interpreter so nothing is already imported
+    :return: the modules imported
+    """
+    output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], check=True,
+                            stdout=subprocess.PIPE, universal_newlines=True).stdout
+    return set(json.loads(output.strip().splitlines()[-1]))
+
+
+class TestStartup(object):
+    @staticmethod
+    def test_startup_lazy_modules():
+        modules = startup_modules()
+        assert [module for module in LAZY_MODULES if module in modules] == []
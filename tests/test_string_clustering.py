@@ -0,0 +1,74 @@
+import random
+
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.stringclustering import soundex, candidate_pairs, levenshtein_distances
+
+op = Optimus("pandas")
+
+
+def edit_distance(a, b):
+    row = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        previous, row[0] = row[:], i
+        for j in range(1, len(b) + 1):
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+    return row[-1]
+
+
+class TestStringClustering(object):
+    @staticmethod
+    def test_fingerprint_cluster():
+        df = op.create.dataframe({"city": ["New York", "new york", "York, New", " NEW YORK", "Bogotá", "bogota",
+                                           "Chicago", None]})
+        assert df.string_clustering("city").to_dict() == {
+            "city": {" NEW YORK": [" NEW YORK", "New York", "York, New", "new york"], "Bogotá": ["Bogotá", "bogota"]}}
+
+    @staticmethod
+    def test_cluster_counts():
+        df = op.create.dataframe({"city": ["bogota", "Bogotá", "Bogotá", "Caracas"]})
+        cluster = df.string_clustering("city").to_dict(verbose=True)["city"]["Bogotá"]
+        assert cluster == {"suggestions": ["Bogotá", "bogota"], "counts": [2, 1], "suggestions_size": 2,
+                           "total_count": 3}
+
+    @staticmethod
+    def test_n_gram_fingerprint_cluster():
+        df = op.create.dataframe({"city": ["Sao Paulo", "SaoPaulo", "sao-paulo", "Caracas"]})
+        assert df.string_clustering("city", "n_gram_fingerprint", 2).to_dict() == {
+            "city": {"Sao Paulo": ["Sao Paulo", "SaoPaulo", "sao-paulo"]}}
+
+    @staticmethod
+    def test_phonetic_fingerprint_cluster():
+        df = op.create.dataframe({"name": ["Jon Smith", "John Smyth", "Smith John", "Jane Doe"]})
+        assert df.string_clustering("name", "phonetic_fingerprint").to_dict() == {
+            "name": {"John Smyth": ["John Smyth", "Jon Smith", "Smith John"]}}
+
+    @staticmethod
+    def test_levenshtein_cluster():
+        df = op.create.dataframe({"company": ["Acme Inc", "ACME inc.", "Acme Incc", "Acme Corp", "Globex", "Globx",
+                                              "Initech", None]})
+        assert df.string_clustering("company", "levenshtein", 1).to_dict() == {
+            "company": {"ACME inc.": ["ACME inc.", "Acme Inc", "Acme Incc"], "Globex": ["Globex", "Globx"]}}
+
+    @staticmethod
+    def test_levenshtein_candidates():
+        # The blocking must not miss any pair within the threshold
+        rand = random.Random(0)
+        values = pd.Series(list(dict.fromkeys("".join(rand.choice("abc") for _ in range(rand.randint(1, 7)))
+                                              for _ in range(200))))
+        threshold = 2
+        pairs = set()
+        for left, right in candidate_pairs(values, threshold):
+            distances = levenshtein_distances(values, left, right, threshold)
+            pairs.update((a, b) for a, b, distance in zip(left, right, distances) if distance <= threshold)
+
+        expected = {(a, b) for a in range(len(values)) for b in range(a + 1, len(values))
+                    if edit_distance(values[a], values[b]) <= threshold}
+        assert pairs == expected
+
+    @staticmethod
+    def test_soundex():
+        words = pd.Series(["ROBERT", "RUPERT", "ASHCRAFT", "TYMCZAK", "PFISTER", "HONEYMAN", "LEE"])
+        assert soundex(words).tolist() == ["R163", "R163", "A261", "T522", "P236", "H555", "L000"]
+
@@ -0,0 +1,50 @@
+import pandas as pd
+
+from optimus import Optimus
+from optimus.engines.base.commons.url import PublicSuffixTrie, split_email, split_url, is_ip
+
+op = Optimus("pandas")
+urls = pd.Series(["https://user@www.bbc.co.uk:8080/news/a?b=1#top", "example.com/path", "http://192.168.0.1/x",
+                  "http://[2001:db8::1]:8080/", None])
+
+
+class TestURL(object):
+    @staticmethod
+    def test_split_url():
+        parts = split_url(urls)
+        assert parts.iloc[0].tolist() == ["https", "www.bbc.co.uk", "8080", "/news/a", "b=1", "top"]
+        assert parts["host"].tolist()[1:4] == ["example.com", "192.168.0.1", "[2001:db8::1]"]
+        assert parts["port"].iloc[3] == "8080"
+        assert parts.iloc[4].isna().all()
+
+    @staticmethod
+    def test_split_email():
+        parts = split_email(pd.Series(["john@mail.com", "bad", None]))
+        assert parts["username"].tolist()[0] == "john"
+        assert parts["domain"].tolist()[0] == "mail.com"
+        assert parts.iloc[1:].isna().all().all()
+
+    @staticmethod
+    def test_public_suffix():
+        trie = PublicSuffixTrie(["com", "uk", "co.uk", "*.ck", "!www.ck"])
+        assert trie.split("www.bbc.co.uk") == ("www", "bbc.co.uk", "co.uk")
+        assert trie.split("a.b.example.ck") == ("a", "b.example.ck", "example.ck")
+        assert trie.split("www.ck") == (None, "www.ck", "ck")
+        assert trie.split("co.uk") == (None, None, "co.uk")
+
+    @staticmethod
+    def test_ip_hosts():
+        trie = PublicSuffixTrie(["com"])
+        assert is_ip("192.168.0.1") and is_ip("[2001:db8::1]") and not is_ip("example.com")
+        assert trie.split("192.168.0.1") == (None, "192.168.0.1", None)
+        assert trie.split("[2001:db8::1]") == (None, "[2001:db8::1]", None)
+
+    @staticmethod
+    def test_url_columns():
+        df = op.create.dataframe(pd.DataFrame({"url": ["http://www.example.com"] + urls.tolist()[1:]}))
+        assert df.cols.domain("url").data["url"].tolist()[:3] == ["example.com", "example.com", "192.168.0.1"]
+        subdomains = df.cols.subdomain("url").data["url"]
+        assert subdomains.iloc[0] == "www"
+        # Missing values are always NaN
+        assert subdomains.iloc[1:].isna().all() and all(isinstance(value, float) for value in subdomains.iloc[1:])
+        assert df.cols.url_params("url").data["url"].equals(df.cols.url_query("url").data["url"])